@@ -0,0 +1,101 @@
+"""
+send_card için yük testi.
+
+Gerçek HTTP kod yolu (bağlantı havuzu, zaman aşımları, devre kesici) yerel
+mock sunucuya karşı çalıştırılır; verim ve kuyruk gecikmeleri raporlanır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.api_load --threads 4 --duration 20 --profile config/mock_server.yaml
+"""
+
+import argparse
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Gerçek HTTP yolunu kullanmak için simülasyon modu kapatılmalı (içe aktarmadan önce)
+os.environ['SIMULATION_MODE'] = 'false'
+
+from utils import api_client
+from utils.mock_api_server import start_mock_server, load_profile
+
+
+def percentile(ordered, p):
+    """Sıralı listede p. yüzdelik değeri döndürür"""
+    if not ordered:
+        return float('nan')
+    index = min(len(ordered) - 1, max(0, math.ceil(p / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+def worker(stop_event, uids, latencies, statuses, lock):
+    """Durdurulana kadar rastgele kartlarla send_card çağırır"""
+    local_latencies = []
+    local_statuses = Counter()
+    while not stop_event.is_set():
+        uid = random.choice(uids)
+        started = time.perf_counter()
+        status, _ = api_client.send_card(uid, random.random() < 0.5)
+        local_latencies.append(time.perf_counter() - started)
+        local_statuses[status] += 1
+
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+def main():
+    parser = argparse.ArgumentParser(description="send_card yük testi")
+    parser.add_argument("--threads", type=int, default=2, help="Eşzamanlı okuyucu sayısı")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test süresi (saniye)")
+    parser.add_argument("--profile", help="Mock sunucu profili (YAML)")
+    parser.add_argument("--no-server", action="store_true", help="Mock sunucuyu başlatma (harici sunucu kullan)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    server = None
+    if not args.no_server:
+        url = urlsplit(api_client.config['api_url'])
+        profile = load_profile(args.profile) if args.profile else None
+        server = start_mock_server(url.hostname, url.port or 80, profile=profile, seed=args.seed)
+        uids = list(server.cards.keys())
+    else:
+        uids = []
+    uids += [f"{random.getrandbits(56):014x}" for _ in range(50)]
+
+    api_client.warm_up_api_client()
+
+    stop_event = threading.Event()
+    latencies, statuses, lock = [], Counter(), threading.Lock()
+    threads = [
+        threading.Thread(target=worker, args=(stop_event, uids, latencies, statuses, lock), daemon=True)
+        for _ in range(args.threads)
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    print(f"Okuyucu thread: {args.threads}, süre: {elapsed:.1f} sn, istek: {len(ordered)}")
+    print(f"Verim: {len(ordered) / elapsed:.1f} karar/sn")
+    print(f"Gecikme p50={percentile(ordered, 50) * 1000:.1f} ms "
+          f"p95={percentile(ordered, 95) * 1000:.1f} ms "
+          f"p99={percentile(ordered, 99) * 1000:.1f} ms "
+          f"max={ordered[-1] * 1000 if ordered else float('nan'):.1f} ms")
+    print(f"Durum kodları: {dict(statuses)}")
+    print(f"Bağlantı havuzu: {api_client.get_api_client().get_stats()}")
+    print(f"API sağlığı: {api_client.get_api_health()}")
+    if server is not None:
+        print(f"Mock sunucu: {server.stats}")
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
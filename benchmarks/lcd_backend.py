@@ -0,0 +1,165 @@
+"""
+PCF8574 LCD sürücülerinin saniyedeki karakter sayısı ölçümü.
+
+Toplu yazan BatchedPCF8574LCD ile hazır CharLCD.write_string yolu simüle bir
+I2C veri yolu üzerinde karşılaştırılır. Veri yolu süresi uyutularak değil
+sanal olarak hesaplanır: her aktarım çağrı maliyeti (--call-us) artı adres ve
+veri baytları için bayt başına 9 saat süresi kadar sürer. Sonuç, ölçülen
+işlemci süresi ile sanal veri yolu süresinin toplamına göre verilir.
+
+RPLCD kuruluysa gerçek CharLCD simüle veri yoluyla kullanılır; değilse
+RPLCD'nin PCF8574 yolundaki yazma dizisi (yarım bayt başına değer, enable
+yüksek, enable düşük ayrı yazmaları) taklit edilir.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.lcd_backend --clock-khz 100 400 --rounds 50
+"""
+
+import argparse
+import time
+
+from controllers import lcd_pcf8574
+from controllers.lcd_pcf8574 import BatchedPCF8574LCD, PIN_BACKLIGHT, PIN_EN, PIN_RS, LCD_SET_DDRAM
+
+
+class SimulatedI2CBus:
+    """Aktarım sürelerini sanal olarak toplayan SMBus"""
+
+    def __init__(self, clock_khz, call_us):
+        self.byte_time = 9.0 / (clock_khz * 1000.0)
+        self.call_time = call_us / 1e6
+        self.elapsed = 0.0
+        self.transfers = 0
+
+    def _transfer(self, count):
+        self.transfers += 1
+        self.elapsed += self.call_time + (1 + count) * self.byte_time
+
+    def write_byte(self, addr, value):
+        self._transfer(1)
+
+    def write_byte_data(self, addr, cmd, value):
+        self._transfer(2)
+
+    def write_i2c_block_data(self, addr, cmd, data):
+        self._transfer(1 + len(data))
+
+
+class SimulatedRdwrBus(SimulatedI2CBus):
+    """i2c_rdwr (tek aktarımda uzun yazma) destekli simüle SMBus"""
+
+    def i2c_rdwr(self, *messages):
+        for message in messages:
+            self._transfer(len(message))
+
+
+class _Message(bytes):
+    """smbus2 yoksa i2c_msg.write yerine kullanılan ileti"""
+
+
+class _I2CMsg:
+    @staticmethod
+    def write(address, data):
+        return _Message(data)
+
+
+class StockPCF8574Model:
+    """RPLCD CharLCD'nin PCF8574 yazma dizisinin taklidi (yarım bayt başına üç yazma)"""
+
+    def __init__(self, bus, address, cols=20, rows=4):
+        self.bus = bus
+        self.address = address
+        self.cols = cols
+        self.row_offsets = (0x00, 0x40, cols, 0x40 + cols)[:rows]
+        self._cursor = (0, 0)
+
+    def _write4bits(self, value):
+        self.bus.write_byte(self.address, value | PIN_BACKLIGHT)
+        self.bus.write_byte(self.address, value | PIN_EN | PIN_BACKLIGHT)
+        self.bus.write_byte(self.address, (value & ~PIN_EN) | PIN_BACKLIGHT)
+
+    def _send(self, value, rs):
+        self._write4bits((value & 0xF0) | rs)
+        self._write4bits(((value << 4) & 0xF0) | rs)
+
+    @property
+    def cursor_pos(self):
+        return self._cursor
+
+    @cursor_pos.setter
+    def cursor_pos(self, value):
+        row, col = value
+        self._send(LCD_SET_DDRAM | (self.row_offsets[row] + col), 0)
+        self._cursor = value
+
+    def write_string(self, text):
+        row, col = self._cursor
+        for char in text.encode("ascii", "replace"):
+            self._send(char, PIN_RS)
+            col += 1
+        self._cursor = (row, col)
+
+
+def create_stock_lcd(bus):
+    """RPLCD kuruluysa simüle veri yolunu kullanan CharLCD, değilse taklidini döndürür"""
+    try:
+        import RPLCD.i2c as rplcd_i2c
+        rplcd_i2c.SMBus = lambda port: bus
+        return rplcd_i2c.CharLCD('PCF8574', 0x27, port=1, cols=20, rows=4), "RPLCD CharLCD"
+    except Exception:
+        return StockPCF8574Model(bus, 0x27), "RPLCD taklidi"
+
+
+def run_case(lcd, bus, frames, rounds):
+    """Ekranları rounds kez yazar; (karakter/sn, aktarım/karakter) döndürür"""
+    chars = 0
+    bus.elapsed = 0.0
+    bus.transfers = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for frame in frames:
+            for row, col, text in frame:
+                lcd.cursor_pos = (row, col)
+                lcd.write_string(text)
+                chars += len(text)
+    cpu = time.perf_counter() - started
+    return chars / (cpu + bus.elapsed), bus.transfers / chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCF8574 LCD sürücüsü karakter/sn ölçümü")
+    parser.add_argument("--clock-khz", type=float, nargs="+", default=[100, 400], help="I2C saat hızları")
+    parser.add_argument("--call-us", type=float, default=60.0,
+                        help="Aktarım başına çağrı maliyeti (ioctl, start/stop; µs)")
+    parser.add_argument("--rounds", type=int, default=50, help="Her ölçümdeki tekrar sayısı")
+    args = parser.parse_args()
+
+    # Tam ekran ve yalnızca saniye hanesi değişen ekran
+    full = [(row, 0, text) for row, text in enumerate(
+        ["[Paz 2026-10-18]".ljust(20), "12:00:00".center(20), "AI LAB".center(20), " Kartinizi okutunuz "])]
+    seconds = [[(1, 12, f"{second:02d}")] for second in range(60)]
+    cases = (("tam ekran", [full]), ("saniye", seconds))
+
+    if lcd_pcf8574.i2c_msg is None:
+        lcd_pcf8574.i2c_msg = _I2CMsg
+
+    print(f"{'sürücü':<26} {'kHz':>5} {'ekran':>10} {'karakter/sn':>12} {'aktarım/kar.':>13}")
+    for clock in args.clock_khz:
+        stock_bus = SimulatedI2CBus(clock, args.call_us)
+        rdwr_bus = SimulatedRdwrBus(clock, args.call_us)
+        block_bus = SimulatedI2CBus(clock, args.call_us)
+        stock, stock_name = create_stock_lcd(stock_bus)
+        drivers = [
+            (stock_name, stock, stock_bus),
+            ("toplu (i2c_rdwr)", BatchedPCF8574LCD(lambda: rdwr_bus, 0x27), rdwr_bus),
+            ("toplu (SMBus blok)", BatchedPCF8574LCD(lambda: block_bus, 0x27), block_bus),
+        ]
+
+        for name, lcd, driver_bus in drivers:
+            for case, frames in cases:
+                rate, per_char = run_case(lcd, driver_bus, frames, args.rounds)
+                print(f"{name:<26} {clock:>5.0f} {case:>10} {rate:>12.0f} {per_char:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+LCD metin hazırlama mikro ölçümü.
+
+Eski karakter karakter birleştirme + unicodedata.normalize dönüşümü ile
+önceden derlenmiş str.translate tablosu ve satır önbelleği karşılaştırılır;
+boş ekran satırlarının her saniye yeniden üretilmesi ile önceden hazırlanmış
+sabit ekranlar ve bunların CGRAM glif hazırlığı (GlyphManager.prepare) da ölçülür.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.lcd_text --number 20000
+"""
+
+import argparse
+import timeit
+import unicodedata
+
+from controllers import lcd_controller
+from controllers.lcd_controller import tr_to_ascii, convert_to_ascii, _ascii_table
+
+
+def legacy_convert_to_ascii(text):
+    """Önceki dönüşüm (karşılaştırma için)"""
+    result = ""
+    for char in text:
+        if char in tr_to_ascii:
+            result += tr_to_ascii[char]
+        else:
+            result += unicodedata.normalize('NFKD', char).encode('ASCII', 'ignore').decode('ASCII')
+    return result
+
+
+def legacy_idle_lines():
+    """Önceki boş ekran satırları (her çağrıda yeniden üretilir)"""
+    from datetime import datetime
+    now = datetime.now()
+    return [
+        f"[{lcd_controller.days_tr[now.weekday()]} {now.strftime('%Y-%m-%d')}]".ljust(20),
+        now.strftime('%H:%M:%S').center(20),
+        "AI LAB".center(20),
+        legacy_convert_to_ascii("Kartinizi okutunuz".center(20))
+    ]
+
+
+class _NullLCD:
+    """Glif yüklemelerini yok sayan LCD"""
+
+    def create_char(self, location, bitmap):
+        pass
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print(f"{label:<34} {seconds / number * 1e6:>9.2f} µs/çağrı")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LCD metin hazırlama mikro ölçümü")
+    parser.add_argument("--number", type=int, default=20000, help="Her ölçümdeki çağrı sayısı")
+    args = parser.parse_args()
+
+    lines = [
+        "Kartinizi okutunuz".center(20),
+        "İçeriden Çıkış".center(20),
+        "Dışarıdan Giriş".center(20),
+        "Sistem başlatılıyor".center(20),
+    ]
+
+    for line in lines:
+        assert legacy_convert_to_ascii(line) == convert_to_ascii(line)
+
+    print("Satır dönüşümü (4 satır):")
+    measure("  eski (birleştirme + normalize)", lambda: [legacy_convert_to_ascii(l) for l in lines], args.number)
+    measure("  str.translate", lambda: [l.translate(_ascii_table) for l in lines], args.number)
+    measure("  str.translate + satır önbelleği", lambda: [convert_to_ascii(l) for l in lines], args.number)
+
+    print("Boş ekran satırları:")
+    measure("  eski", legacy_idle_lines, args.number)
+    lcd_controller.static_screens.clear()
+    measure("  önbellekli, hazırlanmamış", lcd_controller.idle_screen_lines, args.number)
+    lcd_controller.prerender_static_screens()
+    measure("  önceden hazırlanmış", lcd_controller.idle_screen_lines, args.number)
+
+    print("Boş ekran + glif hazırlığı:")
+    lcd = _NullLCD()
+    glyphs = lcd_controller.glyphs
+    measure("  her çizimde tarama ve çeviri",
+            lambda: (glyphs._line_glyphs.clear(), glyphs._prepared.clear(),
+                     glyphs.prepare(lcd, lcd_controller.idle_screen_lines())), args.number)
+    measure("  satır önbellekli", lambda: glyphs.prepare(lcd, lcd_controller.idle_screen_lines()), args.number)
+
+    print(f"Satır önbelleği: {convert_to_ascii.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
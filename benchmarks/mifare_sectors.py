@@ -0,0 +1,119 @@
+"""
+MIFARE Classic sektör bazlı toplu okuma/yazma ile blok blok okuma/yazmanın
+karşılaştırılması.
+
+NFCReader'a her PN532 işlemini (kart seçimi, kimlik doğrulama, blok okuma
+ve yazma) verilen süre kadar bekleten simüle bir okuyucu bağlanır. Blok blok
+yol (read_card_data / write_card_data) her blok için kartı yeniden seçip
+kimlik doğrular; toplu yol (read_sectors / write_sectors) kartı bir kez seçer
+ve sektör başına bir kez kimlik doğrular.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.mifare_sectors --sectors 1 2 3 4 --rounds 20
+"""
+
+import argparse
+import logging
+import time
+
+# Blok başına bilgi logları ölçümü etkilemesin ve çalışan sistemin access_log.txt
+# dosyasına karışmasın: kök logger, readers içe aktarılmadan (utils.logger onu
+# INFO seviyesinde access_log.txt'ye bağlamadan) önce stderr'e WARNING olarak kurulur.
+logging.basicConfig(level=logging.WARNING)
+
+from readers.mifare import BLOCK_SIZE, sector_data_blocks, sectors_data_size
+from readers.nfc_reader import NFCReader
+
+
+class SimulatedCard:
+    """İşlem gecikmelerini taklit eden PN532 + MIFARE Classic 1K kart"""
+
+    def __init__(self, select_ms, auth_ms, read_ms, write_ms):
+        self.select_time = select_ms / 1000.0
+        self.auth_time = auth_ms / 1000.0
+        self.read_time = read_ms / 1000.0
+        self.write_time = write_ms / 1000.0
+        self.uid = bytes([0x04, 0xE6, 0x8F, 0x2A, 0x5C, 0x4D, 0x80])
+        self.memory = bytearray(64 * BLOCK_SIZE)
+        self.commands = 0
+
+    def read_passive_target(self, timeout=1.0):
+        self.commands += 1
+        time.sleep(self.select_time)
+        return self.uid
+
+    def mifare_classic_authenticate_block(self, uid, block_number, key_number, key):
+        self.commands += 1
+        time.sleep(self.auth_time)
+        return True
+
+    def mifare_classic_read_block(self, block_number):
+        self.commands += 1
+        time.sleep(self.read_time)
+        start = block_number * BLOCK_SIZE
+        return bytes(self.memory[start:start + BLOCK_SIZE])
+
+    def mifare_classic_write_block(self, block_number, data):
+        self.commands += 1
+        time.sleep(self.write_time)
+        start = block_number * BLOCK_SIZE
+        self.memory[start:start + BLOCK_SIZE] = data
+        return True
+
+
+def run_case(reader, card, sectors, rounds, mode):
+    """Verilen sektörler için tek bir yolu rounds kez çalıştırır"""
+    blocks = [block for sector in sectors for block in sector_data_blocks(sector)]
+    size = sectors_data_size(sectors)
+    payload = bytes(range(256)) * (size // 256 + 1)
+    payload = payload[:size]
+    buffer = bytearray(size)
+    card.commands = 0
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if mode == "blok okuma":
+            for block in blocks:
+                reader.read_card_data(block)
+        elif mode == "sektör okuma":
+            reader.read_sectors(sectors, buffer=buffer)
+        elif mode == "blok yazma":
+            for index, block in enumerate(blocks):
+                reader.write_card_data(payload[index * BLOCK_SIZE:(index + 1) * BLOCK_SIZE], block)
+        else:
+            reader.write_sectors(sectors, payload)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "bytes_per_sec": size * rounds / elapsed,
+        "ms_per_round": elapsed / rounds * 1000,
+        "commands": card.commands / rounds
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MIFARE sektör bazlı toplu okuma/yazma ölçümü")
+    parser.add_argument("--sectors", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Denenecek ardışık sektör sayıları (1. sektörden başlayarak)")
+    parser.add_argument("--rounds", type=int, default=10, help="Her ölçümdeki tekrar sayısı")
+    parser.add_argument("--select-ms", type=float, default=15.0, help="Kart seçimi süresi (ms)")
+    parser.add_argument("--auth-ms", type=float, default=5.0, help="Kimlik doğrulama süresi (ms)")
+    parser.add_argument("--read-ms", type=float, default=3.0, help="Blok okuma süresi (ms)")
+    parser.add_argument("--write-ms", type=float, default=6.0, help="Blok yazma süresi (ms)")
+    args = parser.parse_args()
+
+    card = SimulatedCard(args.select_ms, args.auth_ms, args.read_ms, args.write_ms)
+    reader = NFCReader(simulation_mode=True)
+    reader.pn532 = card
+
+    print(f"{'yol':<14} {'sektör':>6} {'bayt':>6} {'bayt/sn':>10} {'ms/tur':>8} {'komut/tur':>10}")
+    for count in args.sectors:
+        sectors = list(range(1, 1 + count))
+        for mode in ("blok okuma", "sektör okuma", "blok yazma", "sektör yazma"):
+            result = run_case(reader, card, sectors, args.rounds, mode)
+            print(f"{mode:<14} {count:>6} {sectors_data_size(sectors):>6} {result['bytes_per_sec']:>10.0f} "
+                  f"{result['ms_per_round']:>8.1f} {result['commands']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
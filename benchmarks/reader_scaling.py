@@ -0,0 +1,137 @@
+"""
+Okuyucu sayısı arttıkça okuyucu başına yoklama hızının ölçümü.
+
+N simüle okuyucu (her 8 okuyucuda bir multiplexer) --buses kadar I2C veri
+yoluna sırayla dağıtılır; her veri yolunun kendi hakemi vardır. Her yoklama
+veri yolunu poll_ms kadar meşgul eder, kanal değişimi switch_ms sürer. Sürekli yoklama (read_passive_target) ile InAutoPoll durum
+okuması (veri yolunu kısa süre tutar, aradaki bekleme veri yolu dışında geçer)
+karşılaştırılır.
+
+Kullanım (proje kök dizininden):
+    python -m benchmarks.reader_scaling --readers 1 2 4 8 16 --duration 5
+    python -m benchmarks.reader_scaling --readers 16 --buses 1 2 4
+"""
+
+import argparse
+import math
+import threading
+import time
+
+from readers.i2c_bus import I2CBusArbiter
+from readers.multiplexer import CHANNELS_PER_MUX
+
+
+def percentile(ordered, p):
+    """Sıralı listede p. yüzdelik değeri döndürür"""
+    if not ordered:
+        return float('nan')
+    index = min(len(ordered) - 1, max(0, math.ceil(p / 100.0 * len(ordered)) - 1))
+    return ordered[index]
+
+class SimulatedMux:
+    """Kanal değişimini switch_ms bekleyerek taklit eden multiplexer"""
+
+    def __init__(self, switch_ms):
+        self.switch_time = switch_ms / 1000.0
+        self.route = None
+        self.switches = 0
+
+    def select(self, route):
+        if route != self.route:
+            time.sleep(self.switch_time)
+            self.route = route
+            self.switches += 1
+        return True
+
+    def current(self):
+        return self.route
+
+def reader_loop(arbiter, route, mode, poll_time, status_time, status_interval, stop_event, results):
+    """Durdurulana kadar okuyucunun kanalında yoklama yapar"""
+    polls = 0
+    latencies = []
+    while not stop_event.is_set():
+        started = time.perf_counter()
+        if mode == "passive":
+            # Kart yokken read_passive_target zaman aşımı boyunca veri yolunu tutar
+            arbiter.run(route, lambda: time.sleep(poll_time))
+        else:
+            # InAutoPoll: tek baytlık durum okuması, bekleme veri yolu dışında
+            arbiter.run(route, lambda: time.sleep(status_time))
+        latencies.append(time.perf_counter() - started)
+        polls += 1
+        if mode == "auto":
+            stop_event.wait(status_interval)
+    results.append((polls, latencies))
+
+def run_case(count, bus_count, mode, args):
+    """count okuyucu ve bus_count veri yolu ile tek bir ölçüm yapar"""
+    muxes = [SimulatedMux(args.switch_ms) for _ in range(bus_count)]
+    arbiters = [I2CBusArbiter(mux.select, mux.current, bus_number=i + 1, aging_interval=0.1)
+                for i, mux in enumerate(muxes)]
+    # Okuyucular veri yollarına sırayla dağıtılır; her veri yolunda 8 okuyucuda bir multiplexer
+    routes = []
+    for i in range(count):
+        index = i // bus_count
+        path = ((0x70 + index // CHANNELS_PER_MUX, index % CHANNELS_PER_MUX),)
+        routes.append((arbiters[i % bus_count], path))
+
+    stop_event = threading.Event()
+    results = []
+    threads = [
+        threading.Thread(
+            target=reader_loop,
+            args=(arbiter, path, mode, args.poll_ms / 1000.0, args.status_ms / 1000.0,
+                  args.status_interval, stop_event, results),
+            daemon=True
+        )
+        for arbiter, path in routes
+    ]
+
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for arbiter in arbiters:
+        arbiter.stop()
+
+    rates = [polls / elapsed for polls, _ in results]
+    latencies = sorted(latency for _, values in results for latency in values)
+    return {
+        "per_reader": sum(rates) / len(rates),
+        "min_reader": min(rates),
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "switches": sum(mux.switches for mux in muxes) / elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Okuyucu sayısına göre yoklama hızı ölçümü")
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="Denenecek okuyucu sayıları")
+    parser.add_argument("--duration", type=float, default=5.0, help="Her ölçümün süresi (saniye)")
+    parser.add_argument("--poll-ms", type=float, default=100.0,
+                        help="Sürekli yoklamada veri yolunun tutulduğu süre (ms)")
+    parser.add_argument("--status-ms", type=float, default=0.5, help="InAutoPoll durum okuması süresi (ms)")
+    parser.add_argument("--status-interval", type=float, default=0.1,
+                        help="InAutoPoll durum okumaları arası bekleme (saniye)")
+    parser.add_argument("--switch-ms", type=float, default=1.5, help="Multiplexer kanal değişimi süresi (ms)")
+    parser.add_argument("--buses", type=int, nargs="+", default=[1],
+                        help="Denenecek veri yolu sayıları (her biri ayrı hakem)")
+    parser.add_argument("--modes", nargs="+", default=["passive", "auto"], choices=["passive", "auto"])
+    args = parser.parse_args()
+
+    print(f"{'mod':<8} {'veri yolu':>9} {'okuyucu':>7} {'yoklama/sn':>11} {'en düşük':>9} "
+          f"{'p95 ms':>8} {'değişim/sn':>11}")
+    for mode in args.modes:
+        for bus_count in args.buses:
+            for count in args.readers:
+                result = run_case(count, bus_count, mode, args)
+                print(f"{mode:<8} {bus_count:>9} {count:>7} {result['per_reader']:>11.1f} "
+                      f"{result['min_reader']:>9.1f} {result['p95_ms']:>8.1f} {result['switches']:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
+import threading
 import time
 import yaml
 import os
 from signal import pause
+from readers.registry import get_readers
 
 # Simülasyon modu kontrolü
 SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'true').lower() in ('true', '1', 't', 'yes')
@@ -30,67 +32,73 @@ else:
         pin_factory = None
         print("[BUZZER] Gerçek donanım modu kullanılıyor (standart)")
 
-# README'de belirtilen pinleri kullan
-buzzer_pins = {
-    "inside": 23,  # GPIO23 (Pin 16)
-    "outside": 24  # GPIO24 (Pin 18)
-}
-
 # Buzzer nesneleri ve zamanlayıcılar
+buzzer_pins = {}
 buzzers = {}
+buzzers_initialized = False
+buzzers_lock = threading.Lock()
 beep_timers = []
 
-# Buzzer nesnelerini oluştur
-try:
-    if SIMULATION_MODE:
-        buzzers = {
-            "inside": Buzzer(buzzer_pins["inside"]),
-            "outside": Buzzer(buzzer_pins["outside"])
-        }
-    else:
-        buzzers = {
-            "inside": Buzzer(buzzer_pins["inside"], pin_factory=pin_factory),
-            "outside": Buzzer(buzzer_pins["outside"], pin_factory=pin_factory)
-        }
-    print("[BUZZER] Buzzer sınıfı başarıyla oluşturuldu")
-except Exception as e:
-    print(f"[BUZZER] Buzzer oluşturulurken hata: {e}")
-    print("[BUZZER] DigitalOutputDevice ile devam ediliyor...")
+def init_buzzers():
+    """
+    Buzzer nesnelerini oluşturur (ilk çağrıda; içe aktarma sırasında cihaz oluşturulmaz).
     
-    try:
-        # Buzzer sınıfı çalışmıyorsa genel dijital çıkış cihazı kullan
-        if SIMULATION_MODE:
-            buzzers = {
-                "inside": DigitalOutputDevice(buzzer_pins["inside"], active_high=True),
-                "outside": DigitalOutputDevice(buzzer_pins["outside"], active_high=True)
-            }
-        else:
-            buzzers = {
-                "inside": DigitalOutputDevice(buzzer_pins["inside"], active_high=True, pin_factory=pin_factory),
-                "outside": DigitalOutputDevice(buzzer_pins["outside"], active_high=True, pin_factory=pin_factory)
-            }
-        print("[BUZZER] DigitalOutputDevice başarıyla oluşturuldu")
-    except Exception as e:
-        print(f"[BUZZER] DigitalOutputDevice oluşturulurken de hata: {e}")
-        # Dummy Buzzer nesnesi
-        from utils.dummy_gpio_zero import Buzzer
-        buzzers = {
-            "inside": Buzzer(buzzer_pins["inside"]),
-            "outside": Buzzer(buzzer_pins["outside"])
-        }
-        print("[BUZZER] Hata nedeniyle simülasyon moduna geçildi")
+    Returns:
+        dict: Okuyucu adı -> buzzer nesnesi
+    """
+    global buzzer_pins, buzzers, buzzers_initialized
+    
+    if buzzers_initialized:
+        return buzzers
+    
+    with buzzers_lock:
+        if buzzers_initialized:
+            return buzzers
+        
+        # Buzzer pinleri okuyucu kaydından alınır (varsayılan: README'deki inside GPIO23, outside GPIO24)
+        buzzer_pins = {spec.name: spec.buzzer_pin for spec in get_readers() if spec.buzzer_pin is not None}
+        
+        # Buzzer nesnelerini oluştur
+        try:
+            if SIMULATION_MODE:
+                created = {role: Buzzer(pin) for role, pin in buzzer_pins.items()}
+            else:
+                created = {role: Buzzer(pin, pin_factory=pin_factory) for role, pin in buzzer_pins.items()}
+            print("[BUZZER] Buzzer sınıfı başarıyla oluşturuldu")
+        except Exception as e:
+            print(f"[BUZZER] Buzzer oluşturulurken hata: {e}")
+            print("[BUZZER] DigitalOutputDevice ile devam ediliyor...")
+            
+            try:
+                # Buzzer sınıfı çalışmıyorsa genel dijital çıkış cihazı kullan
+                if SIMULATION_MODE:
+                    created = {role: DigitalOutputDevice(pin, active_high=True) for role, pin in buzzer_pins.items()}
+                else:
+                    created = {role: DigitalOutputDevice(pin, active_high=True, pin_factory=pin_factory)
+                               for role, pin in buzzer_pins.items()}
+                print("[BUZZER] DigitalOutputDevice başarıyla oluşturuldu")
+            except Exception as e:
+                print(f"[BUZZER] DigitalOutputDevice oluşturulurken de hata: {e}")
+                # Dummy Buzzer nesnesi
+                from utils.dummy_gpio_zero import Buzzer as DummyBuzzer
+                created = {role: DummyBuzzer(pin) for role, pin in buzzer_pins.items()}
+                print("[BUZZER] Hata nedeniyle simülasyon moduna geçildi")
+        
+        buzzers = created
+        buzzers_initialized = True
+        return buzzers
 
 def beep(role, duration_or_pattern, repeats=1):
     """
     Buzzer ses çıkarma
     
     Args:
-        role: Hangi buzzer'ın kullanılacağı ("inside" veya "outside")
+        role: Hangi okuyucunun buzzer'ının kullanılacağı (ör. "inside" veya "outside")
         duration_or_pattern: Tek bir bip için süre (saniye) veya bip uzunlukları listesi
         repeats: Tekrar sayısı (yalnızca duration bir sayı olduğunda kullanılır)
     """
     try:
-        buzzer = buzzers.get(role)
+        buzzer = init_buzzers().get(role)
         if not buzzer:
             print(f"[BUZZER] {role} için buzzer bulunamadı")
             return
@@ -0,0 +1,189 @@
+"""
+LCD ekran servisi.
+
+Ekran istekleri (satırlar, öncelik, gösterim süresi) bir öncelik kuyruğuna
+bırakılır ve çağıran hemen döner; çizimi tek bir servis thread'i yapar.
+Gösterilen ekranın süresi dolunca kuyruktaki sıradaki ekrana, kuyruk boşsa
+kendiliğinden boş ekrana (saat) dönülür. Aynı veya daha yüksek öncelikli
+yeni bir istek gösterilen ekranın yerine hemen geçer; daha düşük öncelikli
+istekler sıralarını bekler.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+# Ekran öncelikleri (küçük değer önce gösterilir)
+SCREEN_PRIORITY_SCAN = 0  # Kart okuma sonuçları
+SCREEN_PRIORITY_INFO = 1  # Bilgi mesajları
+
+
+class _Screen:
+    """Kuyruktaki tek bir ekran isteği"""
+
+    __slots__ = ("lines", "priority", "hold", "expires")
+
+    def __init__(self, lines, priority, hold):
+        self.lines = lines
+        self.priority = priority
+        self.hold = hold
+        self.expires = None
+
+
+class DisplayService:
+    """
+    Ekran isteklerini öncelik sırasıyla tek bir thread'de çizen servis.
+    """
+
+    def __init__(self, draw, idle_lines, tick=1.0, error_delay=3.0, max_pending=16, name="lcd"):
+        """
+        Args:
+            draw: Satır listesini ekrana çizen fonksiyon; hata fırlatabilir, ekran
+                kullanılamıyorsa False döndürür (çizilmiş sayılmaz)
+            idle_lines: Boş ekranın o anki satırlarını döndüren fonksiyon
+            tick: Boş ekranın yenilenme aralığı (saniye, saniye başlarına hizalanır)
+            error_delay: Çizim hatasından sonra bekleme (saniye)
+            max_pending: Kuyrukta bekleyebilecek en fazla istek
+            name: Thread ve log adı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.draw = draw
+        self.idle_lines = idle_lines
+        self.tick = tick
+        self.error_delay = error_delay
+        self.max_pending = max(1, int(max_pending))
+        self.name = name
+
+        self._cond = threading.Condition()
+        self._pending = []  # (öncelik, sıra, _Screen) yığını
+        self._sequence = itertools.count()
+        self._current = None
+        self._running = False
+        self._thread = None
+
+        # İstatistikler
+        self.requests = 0
+        self.shown = 0
+        self.preempted = 0
+        self.dropped = 0
+        self.idle_frames = 0
+        self.errors = 0
+
+    def start(self):
+        """Servis thread'ini başlatır (çalışıyorsa bir şey yapmaz)"""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-display", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Servis thread'ini durdurur; kuyruktaki istekler atılır"""
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._current = None
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, lines, priority=SCREEN_PRIORITY_INFO, hold=2.0):
+        """
+        Bir ekranı kuyruğa bırakır ve hemen döner.
+
+        Args:
+            lines: Ekran satırları
+            priority: Ekran önceliği (SCREEN_PRIORITY_*)
+            hold: Ekranın gösterileceği süre (saniye)
+
+        Returns:
+            bool: İstek kuyruğa alındıysa True
+        """
+        screen = _Screen(list(lines), priority, hold)
+        with self._cond:
+            if not self._running:
+                return False
+            self.requests += 1
+            heapq.heappush(self._pending, (priority, next(self._sequence), screen))
+
+            # Kuyruk doluysa en düşük öncelikli en eski istek atılır
+            if len(self._pending) > self.max_pending:
+                worst = max(self._pending, key=lambda item: (item[0], -item[1]))
+                self._pending.remove(worst)
+                heapq.heapify(self._pending)
+                self.dropped += 1
+            self._cond.notify()
+        return True
+
+    def _next_tick(self, now):
+        # Saat saniye değiştiği anda güncellensin
+        return now + self.tick - (time.time() % self.tick)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while True:
+            with self._cond:
+                while True:
+                    if not self._running:
+                        return
+                    now = time.monotonic()
+                    if self._current is not None and now >= self._current.expires:
+                        self._current = None
+
+                    # Aynı veya daha yüksek öncelikli istek gösterilenin yerine geçer
+                    if self._pending and (self._current is None or
+                                          self._pending[0][0] <= self._current.priority):
+                        _, _, screen = heapq.heappop(self._pending)
+                        if self._current is not None:
+                            self.preempted += 1
+                        screen.expires = now + screen.hold
+                        self._current = screen
+                        lines = screen.lines
+                        break
+
+                    if self._current is None and now >= next_tick:
+                        lines = None
+                        break
+
+                    deadline = self._current.expires if self._current is not None else next_tick
+                    self._cond.wait(max(0.0, deadline - now))
+
+            try:
+                if lines is None:
+                    if self.draw(self.idle_lines()) is not False:
+                        self.idle_frames += 1
+                    next_tick = self._next_tick(time.monotonic())
+                else:
+                    if self.draw(lines) is not False:
+                        self.shown += 1
+            except Exception as e:
+                self.errors += 1
+                self.logger.error(f"{self.name} ekran çizim hatası: {str(e)}")
+                next_tick = time.monotonic() + self.error_delay
+
+    def get_stats(self):
+        """
+        Servis istatistiklerini döndürür.
+
+        Returns:
+            dict: İstek, gösterilen, yerine geçilen, atılan ekran, boş ekran
+                yenileme ve çizim hatası sayıları ile kuyruk uzunluğu
+        """
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            "requests": self.requests,
+            "shown": self.shown,
+            "preempted": self.preempted,
+            "dropped": self.dropped,
+            "idle_frames": self.idle_frames,
+            "errors": self.errors,
+            "pending": pending
+        }
@@ -1,11 +1,18 @@
 from datetime import datetime
-from readers.multiplexer import select_channel
+from readers.i2c_bus import get_i2c_bus, PRIORITY_CONTROL, PRIORITY_DISPLAY
+from readers.multiplexer import get_bus, get_settle_time, calibrate_settle_time
+from readers.registry import lcd_route_from_config
+from controllers.lcd_framebuffer import LCDFrameBuffer
+from controllers.lcd_glyphs import GlyphManager
+from controllers.lcd_pcf8574 import BatchedPCF8574LCD
+from controllers.display_service import DisplayService, SCREEN_PRIORITY_SCAN
 import yaml
 import time
 import threading
 import os
 import logging
 import unicodedata
+from functools import lru_cache
 
 # Logger kurulumu
 logger = logging.getLogger(__name__)
@@ -31,27 +38,87 @@ tr_to_ascii = {
     'â': 'a', 'î': 'i', 'û': 'u'
 }
 
-# Özel karakterler için harita
-custom_chars = {}  # boş, özel karakter gerekirse eklenebilir
 
 lcd = None
-idle_thread = None
-idle_thread_running = False
 lcd_lock = threading.Lock()  # LCD'ye erişim için thread kilidi
 lcd_error_count = 0
 max_lcd_errors = 5  # Bu sayıda ardışık hata sonrası LCD devre dışı bırakılır
 lcd_disabled = False
 
-def convert_to_ascii(text):
-    """Türkçe karakterleri ASCII eşdeğerlerine dönüştürür"""
-    result = ""
-    for char in text:
-        if char in tr_to_ascii:
-            result += tr_to_ascii[char]
+# Ekranda gösterilen içeriğin gölgesi; yalnızca değişen hücreler yazılır
+framebuffer = LCDFrameBuffer(cols=20, rows=4)
+
+# Kart okuma sonucunun ekranda kalma süresi (saniye)
+SCAN_RESULT_HOLD = float(config.get('lcd_scan_hold', 2))
+
+# LCD'ye yapılan tüm I2C işlemleri veri yolu hakemi üzerinden, LCD kanalında çalışır
+lcd_bus_number, lcd_route = lcd_route_from_config(config)
+i2c_bus = get_i2c_bus(lcd_bus_number)
+
+class _AsciiTable(dict):
+    """
+    str.translate için karakter kodu -> ASCII karşılığı tablosu.
+    Türkçe karakterler önceden derlenir; diğer karakterler ilk görüldüklerinde
+    bir kez dönüştürülüp tabloya eklenir.
+    """
+    
+    def __missing__(self, code):
+        char = chr(code)
+        if code < 128:
+            value = char
         else:
             # Diğer özel karakterleri yakın ASCII eşdeğerlerine dönüştür
-            result += unicodedata.normalize('NFKD', char).encode('ASCII', 'ignore').decode('ASCII')
-    return result
+            value = unicodedata.normalize('NFKD', char).encode('ASCII', 'ignore').decode('ASCII')
+        self[code] = value
+        return value
+
+_ascii_table = _AsciiTable(str.maketrans(tr_to_ascii))
+
+# Dönüştürülmüş satırların önbelleği (satır sayısı)
+LINE_CACHE_SIZE = int(config.get('lcd_line_cache', 256))
+
+@lru_cache(maxsize=LINE_CACHE_SIZE)
+def convert_to_ascii(text):
+    """Türkçe karakterleri ASCII eşdeğerlerine dönüştürür (sonuçlar satır bazında önbelleklenir)"""
+    return text.translate(_ascii_table)
+
+# Türkçe karakterler CGRAM'e yüklenen gliflerle, diğerleri ASCII karşılıklarıyla gösterilir
+glyphs = GlyphManager(convert_to_ascii, enabled=config.get('lcd_turkish_glyphs', True))
+
+# Önceden hazırlanmış sabit ekran satırları (prerender_static_screens)
+static_screens = {}
+
+# Kart okuma sonucunda gösterilen yönler
+SCAN_DIRECTIONS = ("İçeriden Çıkış", "Dışarıdan Giriş")
+
+def _scan_result_lines(direction, opened):
+    return [
+        "Kart okundu!".center(20),
+        direction.center(20),
+        ("Kapı açıldı" if opened else "Kapı açılmadı").center(20),
+        ""
+    ]
+
+def prerender_static_screens():
+    """
+    Değişmeyen ekran satırlarını (boş ekranın sabit satırları, kart okuma
+    sonuçları) bir kez hazırlar ve glif taramalarını önceden yapar; sonraki
+    çizimlerde yeniden üretilmez. Yuva koduna çevrilmiş halleri ilk çizimde
+    glif yöneticisinde önbelleklenir (CGRAM yuvaları LCD açılmadan bilinmez).
+    
+    Returns:
+        int: Hazırlanan ekran sayısı
+    """
+    static_screens["idle"] = (
+        "AI LAB".center(20),
+        "Kartınızı okutunuz".center(20)
+    )
+    for direction in SCAN_DIRECTIONS:
+        for opened in (True, False):
+            static_screens[("scan", direction, opened)] = _scan_result_lines(direction, opened)
+    for lines in static_screens.values():
+        glyphs.warm(lines)
+    return len(static_screens)
 
 def init_lcd():
     """LCD'yi başlatır"""
@@ -63,6 +130,10 @@ def init_lcd():
         lcd_disabled = False
         lcd_error_count = 0
     
+    # Sabit ekranları bir kez hazırla
+    if config.get('lcd_prerender', True) and not static_screens:
+        prerender_static_screens()
+    
     try:
         if SIMULATION_MODE:
             # Simülasyon modu
@@ -75,43 +146,53 @@ def init_lcd():
             logger.info("LCD gerçek donanım modu kullanılıyor")
             print("[LCD] Gerçek donanım modu kullanılıyor")
         
-        with lcd_lock:
+        def create_lcd():
             if not SIMULATION_MODE:
-                # I2C multiplexer kanalını seç
-                if not select_channel(config['lcd_channel']):
-                    logger.error("LCD için multiplexer kanalı seçilemedi")
-                    print("[HATA] LCD için multiplexer kanalı seçilemedi")
-                    return False
-                
-                # I2C bağlantı testi
-                import smbus2
+                # I2C bağlantı testi (kalıcı tutamaç kullanılır)
+                get_bus(lcd_bus_number).read_byte(config['lcd_address'])
+            
+            # Toplu yazan PCF8574 sürücüsü (varsayılan); başlatılamazsa RPLCD kullanılır
+            if not SIMULATION_MODE and config.get('lcd_backend', 'batched') == 'batched':
                 try:
-                    bus = smbus2.SMBus(1)
-                    bus.read_byte(config['lcd_address'])
-                    bus.close()
+                    return BatchedPCF8574LCD(lambda: get_bus(lcd_bus_number), config['lcd_address'],
+                                             cols=20, rows=4)
                 except Exception as e:
-                    logger.error(f"LCD I2C testi başarısız: {str(e)}")
-                    print(f"[HATA] LCD I2C testi başarısız: {str(e)}")
-                    return False
+                    logger.warning(f"Toplu PCF8574 sürücüsü başlatılamadı: {str(e)}, RPLCD deniyorum...")
             
             # LCD'yi farklı parametre seçenekleriyle dene
             try:
-                lcd = CharLCD('PCF8574', config['lcd_address'], cols=20, rows=4, charmap='A00')
+                created = CharLCD('PCF8574', config['lcd_address'], port=lcd_bus_number, cols=20, rows=4, charmap='A00')
             except Exception as e:
                 logger.warning(f"LCD A00 charmap ile başlatılamadı: {str(e)}, A02 deniyorum...")
                 try:
-                    lcd = CharLCD('PCF8574', config['lcd_address'], cols=20, rows=4, charmap='A02')
+                    created = CharLCD('PCF8574', config['lcd_address'], port=lcd_bus_number, cols=20, rows=4, charmap='A02')
                 except Exception as e2:
                     logger.warning(f"LCD A02 charmap ile başlatılamadı: {str(e2)}, varsayılan deniyorum...")
-                    lcd = CharLCD('PCF8574', config['lcd_address'], cols=20, rows=4)
+                    created = CharLCD('PCF8574', config['lcd_address'], port=lcd_bus_number, cols=20, rows=4)
+            return created
+        
+        def show_starting():
+            # Boş ekran hazır olunca yalnızca değişen hücreleri yazar; ayrıca beklemeye gerek yok
+            framebuffer.clear(lcd)
+            _render(["", "Sistem başlatılıyor".center(20)])
+        
+        with lcd_lock:
+            try:
+                framebuffer.invalidate()
+                glyphs.reset()
+                # LCD'nin veri yolunda okuyucu yoksa multiplexer bekleme süresi burada ölçülür
+                if lcd_route and get_settle_time(lcd_bus_number) is None:
+                    i2c_bus.run(None, lambda: calibrate_settle_time(
+                        (lcd_route[0][1],), lcd_route[0][0], lcd_bus_number), priority=PRIORITY_CONTROL)
+                lcd = i2c_bus.run(lcd_route, create_lcd, priority=PRIORITY_CONTROL)
+            except Exception as e:
+                logger.error(f"LCD I2C bağlantısı kurulamadı: {str(e)}")
+                print(f"[HATA] LCD I2C bağlantısı kurulamadı: {str(e)}")
+                return False
             
-            # LCD'yi temizle
+            # İlk okuyucu hazır olana kadar açılış mesajını göster
             try:
-                lcd.clear()
-                lcd.home()
-                lcd.write_string("LCD hazir...")
-                time.sleep(1)
-                lcd.clear()
+                i2c_bus.run(lcd_route, show_starting, priority=PRIORITY_DISPLAY)
                 lcd_error_count = 0  # Başarılı başlatma, hata sayacını sıfırla
                 print("[LCD] LCD başarıyla başlatıldı")
                 return True
@@ -125,150 +206,168 @@ def init_lcd():
         print(f"[HATA] LCD başlatılamadı: {str(e)}")
         return False
 
-def _safe_lcd_operation(func):
-    """LCD işlemlerini güvenli şekilde gerçekleştiren dekoratör"""
-    global lcd_error_count, lcd_disabled, lcd
+def _record_lcd_error(error):
+    """
+    Başarısız LCD işlemini sayar; ardışık hata sınırında LCD'yi devre dışı
+    bırakır ve 30 sn sonra yeniden başlatmayı planlar. Hatanın kendisi
+    çağıran tarafından loglanır/iletilir.
+    """
+    global lcd_error_count, lcd_disabled
+    
+    lcd_error_count += 1
+    logger.warning(f"LCD hata sayısı: {lcd_error_count}/{max_lcd_errors} ({str(error)})")
     
-    def wrapper(*args, **kwargs):
-        global lcd_disabled
+    # Belirli sayıda hata sonrası LCD'yi devre dışı bırak
+    if lcd_error_count >= max_lcd_errors and not lcd_disabled:
+        lcd_disabled = True
+        logger.error(f"Çok fazla LCD hatası, LCD devre dışı bırakıldı.")
+        print(f"[HATA] Çok fazla LCD hatası, LCD devre dışı bırakıldı.")
         
-        if lcd_disabled:
-            return False
+        # Ekran servisi çalışmaya devam eder; LCD devre dışıyken çizim yapılmaz
         
-        try:
-            return func(*args, **kwargs)
-        except Exception as e:
-            lcd_error_count += 1
-            logger.error(f"LCD işlem hatası ({lcd_error_count}/{max_lcd_errors}): {str(e)}")
-            
-            # Belirli sayıda hata sonrası LCD'yi devre dışı bırak
-            if lcd_error_count >= max_lcd_errors:
-                lcd_disabled = True
-                logger.error(f"Çok fazla LCD hatası, LCD devre dışı bırakıldı.")
-                print(f"[HATA] Çok fazla LCD hatası, LCD devre dışı bırakıldı.")
-                stop_idle_screen()
-                
-                # LCD'yi yeniden başlatmayı dene
-                threading.Timer(30.0, init_lcd).start()
-            
-            return False
-    
-    return wrapper
+        # LCD'yi yeniden başlatmayı dene
+        threading.Timer(30.0, init_lcd).start()
 
 def start_idle_screen():
-    """Boş ekranı gösterecek bir arka plan thread'i başlatır"""
-    global idle_thread, idle_thread_running
-    
+    """Ekran servisini başlatır; istek yokken boş ekran (saat) gösterilir"""
     if lcd_disabled:
         logger.warning("LCD devre dışı, boş ekran başlatılamıyor")
         return False
     
-    if idle_thread is not None and idle_thread.is_alive():
-        return True  # Thread zaten çalışıyor
+    if display_service.is_running():
+        return True  # Servis zaten çalışıyor
     
-    idle_thread_running = True
-    idle_thread = threading.Thread(target=update_idle_screen, daemon=True)
-    idle_thread.start()
-    logger.info("LCD boş ekran thread'i başlatıldı")
+    display_service.start()
+    logger.info("LCD ekran servisi başlatıldı")
     print("[LCD] Boş ekran modu başlatıldı")
     return True
 
 def stop_idle_screen():
-    """Boş ekran thread'ini durdurur"""
-    global idle_thread_running
-    idle_thread_running = False
-    logger.info("LCD boş ekran thread'i durduruldu")
+    """Ekran servisini durdurur"""
+    display_service.stop()
+    logger.info("LCD ekran servisi durduruldu")
     print("[LCD] Boş ekran modu durduruldu")
     return True
 
-@_safe_lcd_operation
-def update_idle_screen():
-    """LCD'de sürekli güncellenen boş ekranı gösterir"""
-    global idle_thread_running
+def get_render_stats():
+    """
+    LCD çizim istatistiklerini döndürür.
+
+    Returns:
+        dict: Yazılan hücre, imleç hareketi ve tasarruf edilen I2C bayt sayıları
+            (son bir dakikadaki tasarruf dahil)
+    """
+    return framebuffer.get_stats()
+
+def _render(lines):
+    """
+    Satırlardaki Türkçe karakterleri gliflere eşleyip yalnızca değişen hücreleri çizer.
+    LCD kanalında, veri yolu hakeminin thread'inde çalışır.
+    """
+    uploads = glyphs.uploads
+    prepared = glyphs.prepare(lcd, lines)
+    if glyphs.uploads != uploads:
+        # CGRAM yazması sonrası imlecin yeri bilinmiyor
+        framebuffer.cursor = None
+    return framebuffer.render(lcd, prepared)
+
+_idle_header = (None, None)  # (tarih, başlık satırı)
+
+def idle_screen_lines():
+    """Boş ekranın (tarih, saat, karşılama) o anki satırlarını döndürür"""
+    global _idle_header
+    now = datetime.now()
     
-    if lcd is None:
-        logger.error("LCD başlatılmadan update_idle_screen çağrıldı")
-        return
+    # Başlık satırı yalnızca gün değişince yeniden üretilir
+    date = now.date()
+    if _idle_header[0] != date:
+        _idle_header = (date, f"[{days_tr[now.weekday()]} {now.strftime('%Y-%m-%d')}]".ljust(20))
     
-    while idle_thread_running and not lcd_disabled:
-        try:
-            now = datetime.now()
-            with lcd_lock:
-                if not SIMULATION_MODE:
-                    if not select_channel(config['lcd_channel']):
-                        time.sleep(1)
-                        continue
-                
-                lcd.cursor_pos = (0, 0)
-                lcd.write_string(f"[{days_tr[now.weekday()]} {now.strftime('%Y-%m-%d')}]".ljust(20))
-                lcd.cursor_pos = (1, 0)
-                lcd.write_string(now.strftime('%H:%M:%S').center(20))
-                lcd.cursor_pos = (2, 0)
-                lcd.write_string("AI LAB".center(20))
-                lcd.cursor_pos = (3, 0)
-                lcd.write_string(convert_to_ascii("Kartinizi okutunuz".center(20)))
-        except Exception as e:
-            logger.error(f"LCD güncellemesi sırasında hata: {str(e)}")
-            print(f"[HATA] LCD güncellemesi sırasında hata: {str(e)}")
-            time.sleep(3)  # Hata durumunda biraz daha uzun bekle
-            continue
-        
-        time.sleep(1)
+    title, prompt = static_screens.get("idle") or (
+        "AI LAB".center(20), "Kartınızı okutunuz".center(20))
+    return [_idle_header[1], now.strftime('%H:%M:%S').center(20), title, prompt]
 
-@_safe_lcd_operation
-def show_scan_result(direction, opened):
-    """Kart tarama sonucunu LCD'de gösterir"""
+def draw_screen(lines):
+    """
+    Satırları LCD'ye çizer (yalnızca değişen hücreler yazılır).
+    Ekran servisinin thread'inde çalışır; çizim hataları sayılıp servise
+    iletilir (servis loglar ve error_delay kadar bekler).
+    
+    Returns:
+        bool: Çizildiyse True, LCD başlatılmamış veya devre dışıysa False
+    """
+    global lcd_error_count
+    
     if lcd is None or lcd_disabled:
-        logger.error("LCD başlatılmadan veya devre dışıyken show_scan_result çağrıldı")
-        return
+        return False
     
     try:
         with lcd_lock:
-            if not SIMULATION_MODE:
-                if not select_channel(config['lcd_channel']):
-                    return
-            
-            lcd.clear()
-            lcd.cursor_pos = (0, 0)
-            lcd.write_string(convert_to_ascii("Kart okundu!".center(20)))
-            lcd.cursor_pos = (1, 0)
-            lcd.write_string(convert_to_ascii(direction.center(20)))
-            lcd.cursor_pos = (2, 0)
-            lcd.write_string(convert_to_ascii(("Kapi acildi" if opened else "Kapi acilmadi").center(20)))
-        
-        # Belirlenen süre kadar bekle
-        time.sleep(2)
-        return True
+            i2c_bus.run(lcd_route, lambda: _render(lines), priority=PRIORITY_DISPLAY)
     except Exception as e:
-        logger.error(f"LCD tarama sonucu gösterimi sırasında hata: {str(e)}")
-        print(f"[HATA] LCD tarama sonucu gösterimi sırasında hata: {str(e)}")
+        _record_lcd_error(e)
+        raise
+    
+    lcd_error_count = 0  # Başarılı çizim, ardışık hata sayacını sıfırla
+    return True
+
+# Tüm ekranlar tek bir servis thread'inden çizilir; çağıranlar LCD'yi beklemez
+display_service = DisplayService(draw_screen, idle_screen_lines)
+
+def show_screen(lines, priority, hold):
+    """
+    Bir ekranı gösterilmek üzere kuyruğa bırakır ve hemen döner.
+    
+    Args:
+        lines: Ekran satırları (ASCII)
+        priority: Ekran önceliği (SCREEN_PRIORITY_*)
+        hold: Gösterim süresi (saniye); süre dolunca boş ekrana dönülür
+        
+    Returns:
+        bool: İstek kuyruğa alındıysa True
+    """
+    if lcd_disabled:
         return False
+    return display_service.submit(lines, priority, hold)
+
+def show_scan_result(direction, opened):
+    """Kart tarama sonucunu LCD'de gösterir (beklemez, süre dolunca boş ekrana dönülür)"""
+    lines = static_screens.get(("scan", direction, opened)) or _scan_result_lines(direction, opened)
+    return show_screen(lines, SCREEN_PRIORITY_SCAN, SCAN_RESULT_HOLD)
 
 def cleanup():
     """
     LCD kaynaklarını temizler ve serbest bırakır.
     Ana program sonlandığında çağrılır.
     """
-    global lcd, idle_thread_running
+    global lcd
     
-    # Boş ekran thread'ini durdur
+    # Ekran servisini durdur
     stop_idle_screen()
+    logger.info(f"LCD ekran servisi istatistikleri: {display_service.get_stats()}")
+    logger.info(f"LCD çizim istatistikleri: {get_render_stats()}")
+    logger.info(f"LCD glif istatistikleri: {glyphs.get_stats()}")
+    if lcd is not None and hasattr(lcd, 'get_stats'):
+        # Toplu PCF8574 sürücüsünün gerçek I2C aktarım ve bayt sayıları
+        logger.info(f"LCD sürücü istatistikleri: {lcd.get_stats()}")
     
     if lcd is not None and not lcd_disabled:
         try:
-            with lcd_lock:
-                if not SIMULATION_MODE:
-                    select_channel(config['lcd_channel'])
-                
-                lcd.clear()
-                lcd.write_string(convert_to_ascii("Sistem kapatiliyor...".center(20)))
-                time.sleep(1)
-                lcd.clear()
+            def draw_shutdown():
+                _render(["Sistem kapatılıyor...".center(20)])
+            
+            def close_lcd():
+                framebuffer.clear(lcd)
                 
                 # LCD'yi kapat (backlight vs.)
                 if hasattr(lcd, 'close'):
                     lcd.close()
             
+            with lcd_lock:
+                i2c_bus.run(lcd_route, draw_shutdown, priority=PRIORITY_CONTROL)
+                time.sleep(1)
+                i2c_bus.run(lcd_route, close_lcd, priority=PRIORITY_CONTROL)
+            
             return True
         except Exception as e:
             logger.error(f"LCD cleanup işlemi sırasında hata: {str(e)}")
@@ -0,0 +1,153 @@
+"""
+Karakter LCD için gölge çerçeve tamponu.
+
+Ekranda son gösterilen içerik bellekte tutulur; yeni ekran bununla
+karşılaştırılır ve yalnızca değişen hücreler yazılır. Aynı satırdaki
+değişiklikler arasındaki boşluk bir imleç komutundan ucuzsa araya giren
+hücreler de yazılarak imleç hareketi azaltılır; imleç zaten doğru yerdeyse
+hiç taşınmaz.
+
+PCF8574 arka kartında (4 bit mod) LCD'ye giden her bayt (karakter veya
+komut) iki yarım bayttır. RPLCD her yarım bayt için üç I2C yazması yapar;
+sürücü kendi maliyetini I2C_BYTES_PER_LCD_BYTE niteliğiyle bildirebilir
+(ör. BatchedPCF8574LCD), bildirmezse RPLCD maliyeti kullanılır.
+"""
+
+import time
+from collections import deque
+
+# LCD'ye giden bir bayt (karakter veya komut) başına I2C yazması (RPLCD, varsayılan)
+I2C_BYTES_PER_LCD_BYTE = 6
+
+# Bu kadar veya daha az değişmemiş hücre, imleci taşımak yerine yeniden yazılır
+MERGE_GAP = 1
+
+# Tasarruf sayacının penceresi (saniye)
+SAVINGS_WINDOW = 60.0
+
+
+class LCDFrameBuffer:
+    """
+    Gölge çerçeve tamponu. Çağıranın LCD kilidini tuttuğu varsayılır.
+    """
+
+    def __init__(self, cols=20, rows=4):
+        """
+        Args:
+            cols: Satır başına karakter
+            rows: Satır sayısı
+        """
+        self.cols = cols
+        self.rows = rows
+        self.shadow = None   # Ekrandaki içerik (bilinmiyorsa None)
+        self.cursor = None   # LCD imlecinin konumu (bilinmiyorsa None)
+        self._window = deque()  # (zaman, tasarruf edilen I2C baytı)
+
+        # İstatistikler
+        self.frames = 0
+        self.cells_written = 0
+        self.cursor_moves = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+    def _fit(self, line):
+        return (line or "")[:self.cols].ljust(self.cols)
+
+    def invalidate(self):
+        """Ekran tampon dışında değiştirildi (clear vb.); sonraki çizim tüm ekranı yazar"""
+        self.shadow = None
+        self.cursor = None
+
+    def clear(self, lcd):
+        """Ekranı temizler ve gölgeyi boş ekrana eşitler"""
+        lcd.clear()
+        self.shadow = [" " * self.cols for _ in range(self.rows)]
+        self.cursor = (0, 0)
+
+    def _runs(self, old, new):
+        """Satırda yazılması gereken (başlangıç, bitiş) aralıklarını döndürür"""
+        if old is None:
+            return [(0, self.cols)]
+        runs = []
+        for col in range(self.cols):
+            if old[col] == new[col]:
+                continue
+            if runs and col - runs[-1][1] <= MERGE_GAP:
+                runs[-1] = (runs[-1][0], col + 1)
+            else:
+                runs.append((col, col + 1))
+        return runs
+
+    def render(self, lcd, lines):
+        """
+        Ekranı verilen satırlara getirir, yalnızca değişen hücreleri yazar.
+
+        Args:
+            lcd: CharLCD nesnesi
+            lines: Satır metinleri (kısa satırlar boşlukla doldurulur, eksik satırlar boş sayılır)
+
+        Returns:
+            int: Gönderilen I2C bayt sayısı (tahmini)
+        """
+        lines = list(lines)[:self.rows]
+        frame = [self._fit(line) for line in lines] + [" " * self.cols] * (self.rows - len(lines))
+
+        writes = []
+        for row in range(self.rows):
+            old = self.shadow[row] if self.shadow is not None else None
+            for start, end in self._runs(old, frame[row]):
+                writes.append((row, start, frame[row][start:end]))
+
+        cells = 0
+        moves = 0
+        try:
+            for row, col, text in writes:
+                if self.cursor != (row, col):
+                    lcd.cursor_pos = (row, col)
+                    moves += 1
+                lcd.write_string(text)
+                cells += len(text)
+                end = col + len(text)
+                self.cursor = (row, end) if end < self.cols else None
+        except Exception:
+            # Ekranın ne kadarının yazıldığı bilinmiyor
+            self.invalidate()
+            raise
+        self.shadow = frame
+
+        per_byte = getattr(lcd, "I2C_BYTES_PER_LCD_BYTE", I2C_BYTES_PER_LCD_BYTE)
+        sent = (cells + moves) * per_byte
+        full = self.rows * (self.cols + 1) * per_byte
+        self.frames += 1
+        self.cells_written += cells
+        self.cursor_moves += moves
+        self.bytes_sent += sent
+        self.bytes_saved += full - sent
+
+        now = time.monotonic()
+        self._window.append((now, full - sent))
+        while self._window and now - self._window[0][0] > SAVINGS_WINDOW:
+            self._window.popleft()
+        return sent
+
+    def saved_per_minute(self):
+        """Son bir dakikada tasarruf edilen I2C bayt sayısını döndürür"""
+        now = time.monotonic()
+        return sum(saved for at, saved in list(self._window) if now - at <= SAVINGS_WINDOW)
+
+    def get_stats(self):
+        """
+        Çizim istatistiklerini döndürür.
+
+        Returns:
+            dict: Çizilen ekran, yazılan hücre, imleç hareketi, gönderilen ve
+                tasarruf edilen I2C bayt sayıları ile son dakikadaki tasarruf
+        """
+        return {
+            "frames": self.frames,
+            "cells_written": self.cells_written,
+            "cursor_moves": self.cursor_moves,
+            "i2c_bytes_sent": self.bytes_sent,
+            "i2c_bytes_saved": self.bytes_saved,
+            "i2c_bytes_saved_per_minute": self.saved_per_minute()
+        }
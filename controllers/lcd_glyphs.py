@@ -0,0 +1,176 @@
+"""
+HD44780 CGRAM üzerinden Türkçe karakter gösterimi.
+
+LCD'nin karakter ROM'unda Türkçe harfler yoktur; kullanıcı tanımlı 8 karakter
+yuvası (CGRAM) vardır. Glif kütüphanesindeki karakterler ekranda
+gerektiğinde yuvalara yüklenir; yuvalar doluysa yeni ekranda kullanılmayan
+ve en uzun süredir kullanılmamış yuva yeniden kullanılır (LRU). Yüklü bir glif
+tekrar gönderilmez; böylece saniyelik çizimlerde CGRAM yazması yapılmaz.
+Yuvaya sığmayan karakterler ASCII karşılıklarıyla gösterilir.
+
+Her satırın içerdiği glifler ve yuva kodlarına çevrilmiş hali önbelleklenir;
+çevrilmiş satırlar yuva tablosu değişene kadar (nesil numarası) geçerlidir.
+Böylece saniyelik çizimlerde sabit satırlar yeniden taranıp çevrilmez.
+"""
+
+from collections import OrderedDict
+
+CGRAM_SLOTS = 8
+
+# Önbelleklenecek en fazla satır (aşılınca önbellek boşaltılır)
+LINE_CACHE_SIZE = 256
+
+# 5x8 Türkçe glifler (her satır 5 bit)
+TURKISH_GLYPHS = {
+    'ç': (0b00000, 0b00000, 0b01110, 0b10000, 0b10000, 0b10001, 0b01110, 0b00100),
+    'Ç': (0b01110, 0b10001, 0b10000, 0b10000, 0b10001, 0b01110, 0b00100, 0b01100),
+    'ğ': (0b10001, 0b01110, 0b01111, 0b10001, 0b01111, 0b00001, 0b01110, 0b00000),
+    'Ğ': (0b01110, 0b00000, 0b01111, 0b10000, 0b10011, 0b10001, 0b01111, 0b00000),
+    'ı': (0b00000, 0b00000, 0b01100, 0b00100, 0b00100, 0b00100, 0b01110, 0b00000),
+    'İ': (0b00100, 0b00000, 0b01110, 0b00100, 0b00100, 0b00100, 0b01110, 0b00000),
+    'ö': (0b01010, 0b00000, 0b01110, 0b10001, 0b10001, 0b10001, 0b01110, 0b00000),
+    'Ö': (0b01010, 0b01110, 0b10001, 0b10001, 0b10001, 0b10001, 0b01110, 0b00000),
+    'ş': (0b00000, 0b01110, 0b10000, 0b01110, 0b00001, 0b11110, 0b00100, 0b01100),
+    'Ş': (0b01111, 0b10000, 0b10000, 0b01110, 0b00001, 0b11110, 0b00100, 0b01100),
+    'ü': (0b01010, 0b00000, 0b10001, 0b10001, 0b10001, 0b10011, 0b01101, 0b00000),
+    'Ü': (0b01010, 0b00000, 0b10001, 0b10001, 0b10001, 0b10001, 0b01110, 0b00000),
+}
+
+
+class GlyphManager:
+    """
+    CGRAM yuvalarını LRU ile yöneten glif yöneticisi.
+    Çağıranın LCD kilidini tuttuğu ve LCD kanalının seçili olduğu varsayılır.
+    """
+
+    def __init__(self, fallback, glyphs=None, slots=CGRAM_SLOTS, enabled=True):
+        """
+        Args:
+            fallback: Yüklenemeyen karakterleri ASCII'ye çeviren fonksiyon (satır alır)
+            glyphs: Karakter -> 5x8 bitmap sözlüğü (varsayılan TURKISH_GLYPHS)
+            slots: CGRAM yuva sayısı
+            enabled: False ise tüm metin ASCII'ye çevrilir
+        """
+        self.fallback = fallback
+        self.glyphs = TURKISH_GLYPHS if glyphs is None else glyphs
+        self.slots = slots
+        self.enabled = enabled
+        self._loaded = OrderedDict()  # karakter -> yuva (en eski kullanılan başta)
+        self._table = {}              # str.translate için karakter kodu -> yuva karakteri
+        self._generation = 0          # Yuva tablosu her değiştiğinde artar
+        self._line_glyphs = {}        # satır -> satırdaki kütüphane karakterleri (sırayla)
+        self._prepared = {}           # satır -> (nesil, LCD'ye yazılacak satır)
+
+        # İstatistikler
+        self.uploads = 0
+        self.hits = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        """LCD yeniden başlatıldı; CGRAM içeriği bilinmiyor"""
+        self._loaded.clear()
+        self._table.clear()
+        self._generation += 1
+        self._prepared.clear()
+
+    def _glyphs_in(self, line):
+        """Satırdaki kütüphane karakterlerini (görünme sırasıyla, tekrarsız) döndürür"""
+        chars = self._line_glyphs.get(line)
+        if chars is None:
+            if len(self._line_glyphs) >= LINE_CACHE_SIZE:
+                self._line_glyphs.clear()
+            chars = tuple(dict.fromkeys(char for char in line if char in self.glyphs))
+            self._line_glyphs[line] = chars
+        return chars
+
+    def _translate(self, line):
+        """Satırı güncel yuva tablosuna göre çevirir (nesil değişene kadar önbellekten)"""
+        cached = self._prepared.get(line)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+        if len(self._prepared) >= LINE_CACHE_SIZE:
+            self._prepared.clear()
+        prepared = self.fallback(line.translate(self._table))
+        self._prepared[line] = (self._generation, prepared)
+        return prepared
+
+    def warm(self, lines):
+        """
+        Sabit satırların glif taramasını önceden yapar (prerender için).
+
+        Args:
+            lines: Ekran satırları
+        """
+        for line in lines:
+            if line and not line.isascii():
+                self._glyphs_in(line)
+
+    def prepare(self, lcd, lines):
+        """
+        Satırlardaki kütüphane karakterlerini CGRAM yuvalarına eşler (gerekirse
+        yükler) ve LCD'ye yazılacak satırları döndürür.
+
+        Args:
+            lcd: CharLCD nesnesi (create_char destekli)
+            lines: Ekran satırları (Türkçe karakter içerebilir)
+
+        Returns:
+            list: Türkçe karakterleri yuva kodlarına, diğerlerini ASCII'ye çevrilmiş satırlar
+        """
+        if not self.enabled:
+            return [self.fallback(line) if line and not line.isascii() else line for line in lines]
+
+        # Ekranda gereken glifler (görünme sırasıyla)
+        needed = []
+        for line in lines:
+            if not line or line.isascii():
+                continue
+            for char in self._glyphs_in(line):
+                if char not in needed:
+                    needed.append(char)
+        if not needed:
+            return list(lines)
+
+        # Yuvaya sığmayanlar ASCII ile gösterilir
+        if len(needed) > self.slots:
+            self.fallbacks += len(needed) - self.slots
+            needed = needed[:self.slots]
+
+        for char in needed:
+            if char in self._loaded:
+                self._loaded.move_to_end(char)
+                self.hits += 1
+                continue
+
+            if len(self._loaded) < self.slots:
+                used = set(self._loaded.values())
+                slot = next(index for index in range(self.slots) if index not in used)
+            else:
+                # Bu ekranda kullanılmayan en eski yuvayı yeniden kullan
+                victim = next(loaded for loaded in self._loaded if loaded not in needed)
+                slot = self._loaded.pop(victim)
+                del self._table[ord(victim)]
+
+            # Yükleme hata verse de (yuva boşaltılmış olabilir) önbelleklenmiş satırlar geçersizdir
+            self._generation += 1
+            lcd.create_char(slot, self.glyphs[char])
+            self._loaded[char] = slot
+            self._table[ord(char)] = chr(slot)
+            self.uploads += 1
+
+        return [self._translate(line) if line and not line.isascii() else line for line in lines]
+
+    def get_stats(self):
+        """
+        Glif istatistiklerini döndürür.
+
+        Returns:
+            dict: Yüklü glifler, CGRAM yüklemesi, yüklü glif kullanımı ve
+                ASCII'ye düşen karakter sayıları
+        """
+        return {
+            "loaded": "".join(self._loaded),
+            "uploads": self.uploads,
+            "hits": self.hits,
+            "fallbacks": self.fallbacks
+        }
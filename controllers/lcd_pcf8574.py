@@ -0,0 +1,211 @@
+"""
+PCF8574 arka kartlı HD44780 LCD için toplu yazan sürücü.
+
+RPLCD her yarım baytı ve enable darbesini ayrı I2C yazmaları olarak gönderir.
+Bu sürücü bir metnin tüm bayt dizisini (veri yarım baytları, enable yüksek ve
+düşük) önceden ayrılmış bir tampona yazar ve tek (uzun metinlerde birkaç) I2C
+aktarımıyla gönderir. PCF8574'ün kaydı olmadığı için aktarımdaki her bayt
+sırayla çıkışlara yansır.
+
+Yarım bayt başına iki bayt gönderilir: enable yüksek ve enable düşük. Veri
+enable'ın düşen kenarında alınır; RS değiştiğinde enable yükselmeden önce
+bir hazırlık baytı eklenir. I2C'de her bayt HD44780'in komut süresinden
+(37 µs) uzun sürdüğü için ek bekleme gerekmez (clear/home hariç).
+"""
+
+import time
+
+try:
+    from smbus2 import i2c_msg
+except ImportError:
+    i2c_msg = None
+
+# PCF8574 çıkışları: P0=RS, P1=RW, P2=EN, P3=arka ışık, P4-P7=D4-D7
+PIN_RS = 0x01
+PIN_EN = 0x04
+PIN_BACKLIGHT = 0x08
+
+# HD44780 komutları
+LCD_CLEAR = 0x01
+LCD_HOME = 0x02
+LCD_ENTRY_MODE = 0x06       # Artan adres, kaydırma yok
+LCD_DISPLAY_ON = 0x0C       # Ekran açık, imleç kapalı
+LCD_FUNCTION_4BIT = 0x28    # 4 bit, 2 satır, 5x8
+LCD_SET_CGRAM = 0x40
+LCD_SET_DDRAM = 0x80
+
+# Tek aktarımda gönderilecek en fazla bayt
+MAX_TRANSFER = 512
+# SMBus blok yazmasında (i2c_rdwr yoksa) komut baytı + 32 veri baytı
+SMBUS_BLOCK = 33
+
+
+class BatchedPCF8574LCD:
+    """
+    RPLCD CharLCD'nin lcd_controller'da kullanılan arayüzünü (cursor_pos,
+    write_string, clear, home, create_char, close) toplu I2C aktarımıyla sunar.
+    Çağıranın LCD kanalını seçtiği ve veri yolunu tuttuğu varsayılır.
+    """
+
+    # LCD baytı başına I2C baytı (iki yarım bayt x enable yüksek/düşük; çerçeve
+    # tamponunun tasarruf hesabında kullanılır, RS hazırlık baytları hariç)
+    I2C_BYTES_PER_LCD_BYTE = 4
+
+    def __init__(self, bus_getter, address, cols=20, rows=4, backlight=True):
+        """
+        LCD'yi 4 bit moda alıp başlatır.
+
+        Args:
+            bus_getter: Güncel SMBus tutamacını döndüren fonksiyon (ör. get_bus)
+            address: PCF8574 I2C adresi
+            cols: Satır başına karakter
+            rows: Satır sayısı
+            backlight: Arka ışık açık mı
+        """
+        self.bus_getter = bus_getter
+        self.address = address
+        self.cols = cols
+        self.rows = rows
+        self.backlight = PIN_BACKLIGHT if backlight else 0
+        self.row_offsets = (0x00, 0x40, cols, 0x40 + cols)[:rows]
+        self._cursor = (0, 0)
+        self._rs = None  # Son gönderilen RS durumu
+
+        # Tam ekran + imleç komutları için yeterli, önceden ayrılmış tampon
+        self._buffer = bytearray(5 * (cols + 1) * rows)
+        self._view = memoryview(self._buffer)
+
+        # İstatistikler
+        self.transfers = 0
+        self.bytes_sent = 0
+
+        self._initialize()
+
+    def _initialize(self):
+        # HD44780 4 bit başlatma dizisi (bilinmeyen durumdan)
+        time.sleep(0.05)
+        for delay in (0.0045, 0.0045, 0.00015):
+            self._send(self._pack_nibble(0, 0x30, 0))
+            time.sleep(delay)
+        self._send(self._pack_nibble(0, 0x20, 0))
+        self._rs = 0
+
+        for command in (LCD_FUNCTION_4BIT, LCD_DISPLAY_ON):
+            self._command(command)
+        self.clear()
+        self._command(LCD_ENTRY_MODE)
+
+    def _pack_nibble(self, offset, value, rs):
+        """Üst 4 biti enable darbesiyle tampona yazar, yeni konumu döndürür"""
+        bits = (value & 0xF0) | self.backlight | rs
+        self._buffer[offset] = bits | PIN_EN
+        self._buffer[offset + 1] = bits
+        return offset + 2
+
+    def _pack_byte(self, offset, value, rs):
+        """Bir komut/veri baytını iki yarım bayt olarak tampona yazar, yeni konumu döndürür"""
+        if rs != self._rs:
+            # RS, enable yükselmeden önce oturmalı
+            self._buffer[offset] = self.backlight | rs
+            offset += 1
+            self._rs = rs
+        offset = self._pack_nibble(offset, value, rs)
+        return self._pack_nibble(offset, value << 4, rs)
+
+    def _ensure_capacity(self, size):
+        if size > len(self._buffer):
+            self._buffer = bytearray(size)
+            self._view = memoryview(self._buffer)
+
+    def _send(self, end):
+        """Tamponun ilk end baytını olabildiğince az aktarımla gönderir"""
+        bus = self.bus_getter()
+        view = self._view
+        offset = 0
+        try:
+            if i2c_msg is not None and hasattr(bus, "i2c_rdwr"):
+                while offset < end:
+                    chunk = view[offset:min(end, offset + MAX_TRANSFER)]
+                    bus.i2c_rdwr(i2c_msg.write(self.address, bytes(chunk)))
+                    offset += len(chunk)
+                    self.transfers += 1
+            else:
+                while offset < end:
+                    chunk = view[offset:min(end, offset + SMBUS_BLOCK)]
+                    if len(chunk) == 1:
+                        bus.write_byte(self.address, chunk[0])
+                    else:
+                        bus.write_i2c_block_data(self.address, chunk[0], list(chunk[1:]))
+                    offset += len(chunk)
+                    self.transfers += 1
+        except Exception:
+            # Çıkışların son durumu bilinmiyor; sonraki yazmada RS yeniden hazırlanır
+            self._rs = None
+            raise
+        self.bytes_sent += end
+
+    def _command(self, command):
+        self._send(self._pack_byte(0, command, 0))
+
+    @property
+    def cursor_pos(self):
+        return self._cursor
+
+    @cursor_pos.setter
+    def cursor_pos(self, value):
+        row, col = value
+        self._command(LCD_SET_DDRAM | (self.row_offsets[row] + col))
+        self._cursor = (row, col)
+
+    def write_string(self, text):
+        """
+        Metni imleç konumundan itibaren tek aktarımla yazar. Satır sonunda
+        alt satıra geçilmez; taşan karakterler atılır.
+        """
+        row, col = self._cursor
+        data = text.encode("ascii", "replace")[:max(0, self.cols - col)]
+        if not data:
+            return
+        self._ensure_capacity(5 * len(data) + 1)
+        offset = 0
+        for value in data:
+            offset = self._pack_byte(offset, value, PIN_RS)
+        self._send(offset)
+        self._cursor = (row, col + len(data))
+
+    def clear(self):
+        self._command(LCD_CLEAR)
+        time.sleep(0.002)  # clear 1.52 ms sürer
+        self._cursor = (0, 0)
+
+    def home(self):
+        self._command(LCD_HOME)
+        time.sleep(0.002)
+        self._cursor = (0, 0)
+
+    def create_char(self, location, bitmap):
+        """
+        Kullanıcı tanımlı karakteri CGRAM yuvasına yükler ve imleci geri koyar
+        (tek aktarım).
+        """
+        if not 0 <= location < 8:
+            raise ValueError(f"Geçersiz CGRAM yuvası: {location}")
+        offset = self._pack_byte(0, LCD_SET_CGRAM | (location << 3), 0)
+        for row in bitmap:
+            offset = self._pack_byte(offset, row & 0x1F, PIN_RS)
+        row, col = self._cursor
+        offset = self._pack_byte(offset, LCD_SET_DDRAM | (self.row_offsets[row] + min(col, self.cols - 1)), 0)
+        self._send(offset)
+
+    def close(self):
+        """Ekranı temizler ve arka ışığı kapatır"""
+        self.clear()
+        self.backlight = 0
+        self.bus_getter().write_byte(self.address, 0)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: I2C aktarım ve gönderilen bayt sayıları
+        """
+        return {"transfers": self.transfers, "bytes_sent": self.bytes_sent}
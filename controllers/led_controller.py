@@ -3,6 +3,7 @@ import time
 import yaml
 import os
 from signal import pause
+from readers.registry import get_readers
 
 # Simülasyon modu kontrolü
 SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'true').lower() in ('true', '1', 't', 'yes')
@@ -31,55 +32,60 @@ else:
         pin_factory = None
         print("[LED] Gerçek donanım modu kullanılıyor (standart)")
 
-# README'de belirtilen pinleri kullan
-led_pins = {
-    "inside": 18,  # GPIO18 (Pin 12)
-    "outside": 12  # GPIO12 (Pin 32)
-}
-
 # LED nesneleri ve efekt durumu
+led_pins = {}
 leds = {}
+leds_initialized = False
+leds_lock = threading.Lock()
 breathing_threads = {}
 breathing_active = {}
 pattern_timers = []
 
-# LED nesnelerini oluştur
-try:
-    if SIMULATION_MODE:
-        leds = {
-            "inside": PWMLED(led_pins["inside"]),
-            "outside": PWMLED(led_pins["outside"])
-        }
-    else:
-        leds = {
-            "inside": PWMLED(led_pins["inside"], pin_factory=pin_factory),
-            "outside": PWMLED(led_pins["outside"], pin_factory=pin_factory)
-        }
-except Exception as e:
-    print(f"[LED] PWMLED oluşturulurken hata: {e}")
-    print("[LED] Normal LED'lerle devam ediliyor...")
-    try:
-        # PWM çalışmıyorsa normal LED kullan
-        if SIMULATION_MODE:
-            leds = {
-                "inside": LED(led_pins["inside"]),
-                "outside": LED(led_pins["outside"])
-            }
-        else:
-            leds = {
-                "inside": LED(led_pins["inside"], pin_factory=pin_factory),
-                "outside": LED(led_pins["outside"], pin_factory=pin_factory)
-            }
-        print("[LED] Normal LED'ler başarıyla oluşturuldu")
-    except Exception as e:
-        print(f"[LED] Normal LED oluşturulurken de hata: {e}")
-        # Dummy PWMLED nesnesi
-        from utils.dummy_gpio_zero import PWMLED
-        leds = {
-            "inside": PWMLED(led_pins["inside"]),
-            "outside": PWMLED(led_pins["outside"])
-        }
-        print("[LED] Hata nedeniyle simülasyon moduna geçildi")
+def init_leds():
+    """
+    LED nesnelerini oluşturur (ilk çağrıda; içe aktarma sırasında cihaz oluşturulmaz).
+    
+    Returns:
+        dict: Okuyucu adı -> LED nesnesi
+    """
+    global led_pins, leds, leds_initialized
+    
+    if leds_initialized:
+        return leds
+    
+    with leds_lock:
+        if leds_initialized:
+            return leds
+        
+        # LED pinleri okuyucu kaydından alınır (varsayılan: README'deki inside GPIO18, outside GPIO12)
+        led_pins = {spec.name: spec.led_pin for spec in get_readers() if spec.led_pin is not None}
+        
+        # LED nesnelerini oluştur
+        try:
+            if SIMULATION_MODE:
+                created = {role: PWMLED(pin) for role, pin in led_pins.items()}
+            else:
+                created = {role: PWMLED(pin, pin_factory=pin_factory) for role, pin in led_pins.items()}
+        except Exception as e:
+            print(f"[LED] PWMLED oluşturulurken hata: {e}")
+            print("[LED] Normal LED'lerle devam ediliyor...")
+            try:
+                # PWM çalışmıyorsa normal LED kullan
+                if SIMULATION_MODE:
+                    created = {role: LED(pin) for role, pin in led_pins.items()}
+                else:
+                    created = {role: LED(pin, pin_factory=pin_factory) for role, pin in led_pins.items()}
+                print("[LED] Normal LED'ler başarıyla oluşturuldu")
+            except Exception as e:
+                print(f"[LED] Normal LED oluşturulurken de hata: {e}")
+                # Dummy PWMLED nesnesi
+                from utils.dummy_gpio_zero import PWMLED as DummyPWMLED
+                created = {role: DummyPWMLED(pin) for role, pin in led_pins.items()}
+                print("[LED] Hata nedeniyle simülasyon moduna geçildi")
+        
+        leds = created
+        leds_initialized = True
+        return leds
 
 def _blink_pattern(led, pattern):
     """Özel blink desenini uygular"""
@@ -118,7 +124,7 @@ def show_pattern(role, pattern, duration=2):
     pattern: açık/kapalı durumlar listesi (Ör: [1, 0, 1, 0] - açık, kapalı, açık, kapalı)
     """
     try:
-        led = leds[role]
+        led = init_leds()[role]
         
         # GPIOZero blink fonksiyonunu kullanmak yerine manuel kontrol ediyoruz
         # çünkü karmaşık desenler için blink yeterli değil
@@ -136,7 +142,7 @@ def show_color(role, color, duration=2):
         # RGB'den parlaklık hesapla (ortalama değer)
         brightness = sum(color) / (3 * 255)
         
-        led = leds[role]
+        led = init_leds()[role]
         
         # PWM kontrolü varsa
         if hasattr(led, 'value'):
@@ -157,6 +163,10 @@ def start_breathing(role):
     """Nefes alıp veren LED efektini başlat"""
     global breathing_threads, breathing_active
     
+    # LED bağlı olmayan okuyucular için yapılacak bir şey yok
+    if role not in init_leds():
+        return
+    
     # Önceki nefes efektini durdur
     if role in breathing_active:
         breathing_active[role] = False
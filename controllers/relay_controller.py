@@ -356,13 +356,14 @@ def list_usb_relays():
         return []
 
 # Röleyi tek bir istek ile tetiklemek için kullanılan fonksiyon
-def trigger_relay(duration=1.0, relay_id=None):
+def trigger_relay(duration=1.0, relay_id=None, relay_type=None):
     """
     Belirtilen röleyi belirli bir süre için tetikler (aktif eder, sonra deaktif eder).
     
     Args:
         duration: Aktivasyon süresi (saniye)
         relay_id: Tetiklenecek röle ID'si (None ise varsayılan röle kullanılır)
+        relay_type: Röle tipi ("usb" veya "gpio", None ise yapılandırmadaki tip kullanılır)
     
     Returns:
         bool: İşlem başarılı ise True
@@ -374,16 +375,18 @@ def trigger_relay(duration=1.0, relay_id=None):
         try:
             with open("config/config.yaml") as f:
                 config = yaml.safe_load(f)
-                relay_type = config.get('relay', {}).get('type', 'usb')
+                default_relay_type = config.get('relay', {}).get('type', 'usb')
                 default_relay_id = config.get('relay', {}).get('id', None)
         except Exception as e:
             logger.warning(f"Röle yapılandırması okunamadı: {str(e)}, varsayılan değerler kullanılıyor")
-            relay_type = 'usb'
+            default_relay_type = 'usb'
             default_relay_id = None
             
         # Parametre olarak relay_id verilmediyse varsayılanı kullan
         if relay_id is None:
             relay_id = default_relay_id
+        if relay_type is None:
+            relay_type = default_relay_type
             
         # Röle kontrolcüsünü oluştur
         relay = RelayController(relay_type=relay_type, pin_or_id=relay_id)
@@ -6,11 +6,18 @@ import sys
 import signal
 import logging
 import atexit
-from readers.nfc_reader import handle_reader
-from readers.multiplexer import reset_multiplexer
+from readers.nfc_reader import handle_reader, stop_scan_workers
+from readers.multiplexer import reset_multiplexer, get_switch_stats, close_buses
+from readers.i2c_bus import stop_i2c_buses
+from readers.registry import get_readers
 from controllers.lcd_controller import init_lcd, start_idle_screen, stop_idle_screen, cleanup as lcd_cleanup
-from controllers.led_controller import cleanup as led_cleanup
-from controllers.buzzer_controller import cleanup as buzzer_cleanup
+from controllers.led_controller import init_leds, cleanup as led_cleanup
+from controllers.buzzer_controller import init_buzzers, cleanup as buzzer_cleanup
+from utils.api_client import warm_up_api_client, get_api_client, get_api_health, stop_async_api_client
+from utils.access_control import (start_allowlist_sync, stop_allowlist_sync, start_revocation_sync,
+                                  stop_revocation_sync, stop_cache_refresher)
+from utils.outbox import start_outbox, stop_outbox
+from utils.startup import StartupOrchestrator
 
 # Logger kurulumu
 logging.basicConfig(
@@ -34,15 +41,64 @@ logger.info(f"Sistem başlatılıyor - Simülasyon modu: {SIMULATION_MODE}, Pin
 nfc_threads = []
 running = True
 
+# Temizlik yalnızca bir kez yapılır (sinyal işleyicisi ve atexit ikisi de çağırır)
+_cleanup_lock = threading.Lock()
+_cleaned_up = False
+
 def cleanup():
     """
-    Program sonlandığında temizlik işlemleri
+    Program sonlandığında temizlik işlemleri (tekrar çağrıldığında bir şey yapmaz)
     """
-    global running
+    global running, _cleaned_up
     running = False
     
+    with _cleanup_lock:
+        if _cleaned_up:
+            return
+        _cleaned_up = True
+    
     logger.info("Sistem kapatılıyor...")
     
+    # Okuyucu işçilerini durdur
+    try:
+        stop_scan_workers()
+    except Exception as e:
+        logger.error(f"Okuyucu işçileri durdurma hatası: {str(e)}")
+    
+    # İzin listesi senkronizasyonunu durdur
+    try:
+        stop_allowlist_sync()
+    except Exception as e:
+        logger.error(f"İzin listesi senkronizasyonu durdurma hatası: {str(e)}")
+    
+    # İptal filtresi senkronizasyonunu durdur
+    try:
+        stop_revocation_sync()
+    except Exception as e:
+        logger.error(f"İptal filtresi senkronizasyonu durdurma hatası: {str(e)}")
+    
+    # Önbellek bildirim thread'ini durdur
+    try:
+        stop_cache_refresher()
+    except Exception as e:
+        logger.error(f"Önbellek bildirimi durdurma hatası: {str(e)}")
+    
+    # Olay giden kutusunu kapat
+    try:
+        stop_outbox()
+    except Exception as e:
+        logger.error(f"Giden kutusu kapatma hatası: {str(e)}")
+    
+    # API bağlantı havuzunu kapat
+    try:
+        client = get_api_client()
+        logger.info(f"API bağlantı istatistikleri: {client.get_stats()}")
+        logger.info(f"API sağlık durumu: {get_api_health()}")
+        client.close()
+        stop_async_api_client()
+    except Exception as e:
+        logger.error(f"API istemcisi kapatma hatası: {str(e)}")
+    
     # LCD ekran döngüsünü durdur
     try:
         stop_idle_screen()
@@ -65,9 +121,17 @@ def cleanup():
     except Exception as e:
         logger.error(f"Buzzer temizleme hatası: {str(e)}")
     
+    # I2C veri yolu hakemini durdur (LCD temizliği hakem üzerinden yapıldı)
+    try:
+        stop_i2c_buses()
+    except Exception as e:
+        logger.error(f"I2C veri yolu hakemi durdurma hatası: {str(e)}")
+    
     # Multiplexer'ı sıfırla
     try:
+        logger.info(f"Multiplexer kanal değişimi istatistikleri: {get_switch_stats()}")
         reset_multiplexer()
+        close_buses()
         logger.info("Multiplexer sıfırlandı")
     except Exception as e:
         logger.error(f"Multiplexer sıfırlama hatası: {str(e)}")
@@ -113,8 +177,61 @@ def main():
         else:
             print("Sistem gerçek donanım modunda çalışıyor.")
         
-        # LCD başlat
-        if init_lcd():
+        # Birbirinden bağımsız cihaz ve servisleri paralel başlat
+        startup_config = config.get('startup', {}) or {}
+        startup = StartupOrchestrator(max_workers=int(startup_config.get('workers', 4)))
+        
+        # Kart okuma olayları için kalıcı giden kutusu okuyuculardan önce açılır
+        # (ucuzdur; hazır olmadan gelen okumalar kaydedilmeden kaybolmasın)
+        startup.begin("giden kutusu")
+        outbox_started = start_outbox()
+        startup.finish("giden kutusu", ok=outbox_started is not False, skipped=outbox_started is None)
+        
+        # API bağlantısını önceden aç (ilk kart okumasında el sıkışma beklenmesin)
+        startup.submit("api", warm_up_api_client)
+        
+        # Çevrimdışı öncelikli modda izin listesi senkronizasyonunu başlat
+        startup.submit("izin listesi", start_allowlist_sync, optional=True)
+        
+        # İptal edilen kartların filtresini güncel tut
+        startup.submit("iptal filtresi", start_revocation_sync, optional=True)
+        
+        # LCD, LED'ler ve buzzer'lar (okuyucular bu sırada kendi kanallarını yoklar)
+        lcd_future = startup.submit("lcd", init_lcd)
+        startup.submit("led", init_leds)
+        startup.submit("buzzer", init_buzzers)
+        
+        # Yapılandırılan her okuyucu için bir thread başlat
+        try:
+            readers = get_readers()
+        except ValueError as e:
+            logger.critical(f"Okuyucu yapılandırması geçersiz: {str(e)}")
+            print(f"Okuyucu yapılandırması geçersiz: {str(e)}")
+            startup.shutdown()
+            return
+        
+        for spec in readers:
+            device = f"okuyucu:{spec.name}"
+            startup.begin(device)
+            reader_thread = threading.Thread(
+                target=handle_reader,
+                args=(spec.name, spec.channel, spec.is_inside, spec.lcd, spec.mux_address),
+                kwargs={"on_ready": lambda device=device: startup.ready(device)},
+                name=f"reader-{spec.name}",
+                daemon=True
+            )
+            reader_thread.start()
+            nfc_threads.append(reader_thread)
+        logger.info(f"{len(readers)} NFC okuyucu thread'i başlatıldı")
+        
+        # İlk kapı kart okumaya hazır olunca hazır ekranına geç (tüm bekleme tek bir süre sınırını paylaşır)
+        ready_timeout = float(startup_config.get('ready_timeout', 30))
+        ready_deadline = time.monotonic() + ready_timeout
+        if not startup.wait_ready(timeout=ready_timeout):
+            logger.warning(f"{ready_timeout:.0f} sn içinde hazır okuyucu yok, devam ediliyor")
+        
+        if (startup.wait(["lcd"], timeout=max(0.0, ready_deadline - time.monotonic()))
+                and lcd_future.result()):
             logger.info("LCD başarıyla başlatıldı")
         else:
             logger.warning("LCD başlatılamadı, devam ediliyor")
@@ -122,22 +239,10 @@ def main():
         # LCD boş ekran thread'ini başlat
         start_idle_screen()
         
-        # NFC okuyucu thread'leri başlat
-        inside_thread = threading.Thread(
-            target=handle_reader, 
-            args=("inside", config['nfc_channels']['inside'], True),
-            daemon=True
-        )
-        inside_thread.start()
-        nfc_threads.append(inside_thread)
-        
-        outside_thread = threading.Thread(
-            target=handle_reader, 
-            args=("outside", config['nfc_channels']['outside'], False, True),
-            daemon=True
-        )
-        outside_thread.start()
-        nfc_threads.append(outside_thread)
+        # Diğer başlatma işlerini (kalan süre kadar) bekleyip süreleri logla
+        startup.wait(timeout=max(0.0, ready_deadline - time.monotonic()))
+        startup.log_summary()
+        startup.shutdown()
         
         # Sonsuz döngü
         print("Sistem başlatıldı. Çıkmak için Ctrl+C tuşlarına basın.")
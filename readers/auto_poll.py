@@ -0,0 +1,280 @@
+"""
+PN532 donanım otomatik yoklaması (InAutoPoll) ile kart algılama.
+
+Sürekli read_passive_target çağırmak yerine PN532'ye bir kez InAutoPoll
+komutu gönderilir; okuyucu RF alanını kendisi tarar ve kart bulduğunda IRQ
+hattını düşürür. IRQ hattı gpiozero ile izlendiğinde, kart alana girene kadar
+I2C veri yoluna hiç erişilmez. IRQ bağlı değilse tek baytlık durum okuması
+ile seyrek aralıklarla hazır olup olmadığına bakılır.
+"""
+
+import time
+import threading
+import logging
+
+from utils.simulation import is_simulation_mode
+
+# gpiozero isteğe bağlıdır; yoksa durum baytı yoklamasına geçilir
+try:
+    from gpiozero import DigitalInputDevice
+except ImportError:
+    DigitalInputDevice = None
+
+# PN532 komutları ve hedef tipleri
+COMMAND_INAUTOPOLL = 0x60
+POLL_INFINITE = 0xFF
+TYPE_GENERIC_106_A = 0x00  # Genel pasif 106 kbps (ISO14443-4A, MIFARE, DEP)
+TYPE_MIFARE = 0x10         # MIFARE kart 106 kbps
+ISO14443A_TYPES = (TYPE_GENERIC_106_A, TYPE_MIFARE)
+
+# InAutoPoll yanıtı: NbTg | Tip | Uzunluk | Tg | SENS_RES (2) | SEL_RES | NFCID uzunluğu | NFCID
+RESPONSE_LENGTH = 32
+
+
+def parse_auto_poll_response(response):
+    """
+    InAutoPoll yanıtından ilk ISO14443A hedefin UID'sini çıkarır.
+
+    Args:
+        response: process_response'un döndürdüğü baytlar
+
+    Returns:
+        bytes: Kart UID'si veya hedef yoksa None
+    """
+    if not response or response[0] == 0:
+        return None
+
+    offset = 1
+    for _ in range(response[0]):
+        if offset + 2 > len(response):
+            break
+        target_type, length = response[offset], response[offset + 1]
+        data = response[offset + 2:offset + 2 + length]
+        if target_type in ISO14443A_TYPES and len(data) >= 5:
+            uid_length = data[4]
+            return bytes(data[5:5 + uid_length])
+        offset += 2 + length
+    return None
+
+
+class GpioIrq:
+    """
+    PN532 IRQ hattını (aktif düşük) gpiozero ile izler.
+    """
+
+    def __init__(self, pin):
+        """
+        Args:
+            pin: IRQ hattının bağlı olduğu GPIO pini (BCM)
+        """
+        if DigitalInputDevice is None:
+            raise ImportError("IRQ ile kart algılama için gpiozero modülü gerekli - 'pip install gpiozero'")
+
+        self._event = threading.Event()
+        self.device = DigitalInputDevice(pin, pull_up=True)
+        self.device.when_activated = self._event.set
+        if self.device.is_active:
+            self._event.set()
+
+    def wait(self, timeout=None):
+        """IRQ düşene kadar bekler; düştüyse True"""
+        return self._event.wait(timeout)
+
+    def clear(self):
+        """Bir sonraki IRQ için olayı sıfırlar"""
+        self._event.clear()
+        if self.device.is_active:
+            self._event.set()
+
+    def close(self):
+        """GPIO pinini serbest bırakır"""
+        self.device.close()
+
+
+class AutoPollDetector:
+    """
+    read_passive_target ile aynı arayüzü sunan, InAutoPoll tabanlı kart algılayıcı.
+    """
+
+    def __init__(self, reader, bus_call=None, irq=None, period=1, card_types=ISO14443A_TYPES,
+                 status_interval=0.1, rearm_delay=0.5, rearm_interval=60.0, name="nfc"):
+        """
+        Algılayıcıyı başlat.
+
+        Args:
+            reader: PN532 nesnesi (send_command / process_response desteklemeli)
+            bus_call: bus_call(fonksiyon) - veri yolu işlemini okuyucunun kanalında çalıştırır
+                (ör. I2C hakemi üzerinden; None ise doğrudan çağrılır)
+            irq: wait/clear metodları olan IRQ nesnesi (None ise durum baytı yoklanır)
+            period: PN532'nin tarama aralığı (150 ms birimi, 1-15)
+            card_types: Taranacak hedef tipleri
+            status_interval: IRQ yokken iki durum okuması arasındaki süre (saniye)
+            rearm_delay: Kart okunduktan sonra yeniden kurmadan önce beklenecek süre (saniye)
+            rearm_interval: Kart gelmese de otomatik yoklamanın yeniden kurulma aralığı
+                (okuyucu kendiliğinden sıfırlanırsa takılı kalmamak için, saniye)
+            name: Log mesajlarında kullanılacak ad
+        """
+        self.logger = logging.getLogger(__name__)
+        self.reader = reader
+        self.bus_call = bus_call
+        self.irq = irq
+        self.period = min(15, max(1, int(period)))
+        self.card_types = list(card_types)
+        self.status_interval = status_interval
+        self.rearm_delay = rearm_delay
+        self.rearm_interval = rearm_interval
+        self.name = name
+
+        self.armed_at = None
+        self.rearm_after = 0.0
+
+        # İstatistikler
+        self.arms = 0
+        self.irq_wakeups = 0
+        self.status_checks = 0
+        self.cards = 0
+
+    def _on_bus(self, func):
+        """Veri yolu işlemini okuyucunun kanalında çalıştırır"""
+        return self.bus_call(func) if self.bus_call is not None else func()
+
+    def arm(self):
+        """PN532'ye InAutoPoll komutunu gönderir"""
+        if self.irq is not None:
+            self.irq.clear()
+
+        params = [POLL_INFINITE, self.period] + self.card_types
+        if not self._on_bus(lambda: self.reader.send_command(COMMAND_INAUTOPOLL, params=params, timeout=1)):
+            raise RuntimeError(f"{self.name} InAutoPoll komutu onaylanmadı")
+
+        self.armed_at = time.monotonic()
+        self.arms += 1
+        self.logger.debug(f"{self.name} otomatik yoklama kuruldu (periyot {self.period * 150} ms)")
+
+    def disarm(self):
+        """Okuyucu yeniden yapılandırıldığında otomatik yoklamanın bir sonraki okumada kurulmasını sağlar"""
+        self.armed_at = None
+        self.rearm_after = 0.0
+
+    def _read_response(self, timeout):
+        """Okuyucu hazırsa yanıtı okur ve UID'yi döndürür"""
+        response = self._on_bus(lambda: self.reader.process_response(
+            COMMAND_INAUTOPOLL, response_length=RESPONSE_LENGTH, timeout=timeout))
+        if response is None:
+            return None
+
+        self.armed_at = None
+        self.rearm_after = time.monotonic() + self.rearm_delay
+        uid = parse_auto_poll_response(response)
+        if uid:
+            self.cards += 1
+        return uid
+
+    def read_passive_target(self, timeout=0.5):
+        """
+        Kart alana girene kadar en fazla timeout kadar bekler.
+
+        Args:
+            timeout: En fazla bekleme süresi (saniye)
+
+        Returns:
+            bytes: Kart UID'si veya kart yoksa None
+        """
+        now = time.monotonic()
+        if self.armed_at is None:
+            if now < self.rearm_after:
+                time.sleep(min(timeout, self.rearm_after - now))
+                return None
+            self.arm()
+        elif now - self.armed_at > self.rearm_interval:
+            self.arm()
+
+        if self.irq is not None:
+            # Kart gelene kadar veri yoluna dokunulmaz
+            if not self.irq.wait(timeout):
+                return None
+            self.irq_wakeups += 1
+            uid = self._read_response(timeout=0.1)
+            if self.armed_at is not None:
+                # Yanıt yoktu (parazit); sonraki IRQ'yu bekle
+                self.irq.clear()
+            return uid
+
+        # IRQ yok - seyrek aralıklarla tek baytlık durum okuması
+        deadline = now + timeout
+        while True:
+            self.status_checks += 1
+            uid = self._read_response(timeout=0.005)
+            if uid is not None or self.armed_at is None:
+                return uid
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.status_interval, remaining))
+
+    def close(self):
+        """IRQ kaynağını serbest bırakır ve istatistikleri loglar"""
+        self.logger.info(f"{self.name} otomatik yoklama istatistikleri: {self.get_stats()}")
+        if self.irq is not None and hasattr(self.irq, "close"):
+            self.irq.close()
+
+    def get_stats(self):
+        """
+        Algılayıcı istatistiklerini döndürür.
+
+        Returns:
+            dict: Kurulum, IRQ uyanma, durum okuması ve algılanan kart sayıları
+        """
+        return {
+            "arms": self.arms,
+            "irq_wakeups": self.irq_wakeups,
+            "status_checks": self.status_checks,
+            "cards": self.cards
+        }
+
+
+def create_auto_poll_detector(reader, role, bus_call=None, settings=None, irq_pin=None):
+    """
+    Yapılandırmaya göre bir okuyucu için otomatik yoklama algılayıcısı oluşturur.
+
+    Args:
+        reader: PN532 veya DummyNFC nesnesi
+        role: Okuyucu rolü (IRQ pini bu anahtarla aranır)
+        bus_call: Veri yolu işlemlerini okuyucunun kanalında çalıştıran fonksiyon
+        settings: 'nfc_auto_poll' yapılandırma bölümü
+        irq_pin: Okuyucunun IRQ pini (None ise settings['irq_pins'][role] aranır)
+
+    Returns:
+        AutoPollDetector: Algılayıcı veya otomatik yoklama kapalı/desteklenmiyorsa None
+    """
+    logger = logging.getLogger(__name__)
+    settings = settings or {}
+    if not settings.get('enabled', False):
+        return None
+
+    if not (hasattr(reader, "send_command") and hasattr(reader, "process_response")):
+        logger.warning(f"{role} okuyucu InAutoPoll desteklemiyor, sürekli yoklama kullanılacak")
+        return None
+
+    irq = None
+    if is_simulation_mode():
+        irq = getattr(reader, "irq", None)
+    else:
+        pin = irq_pin if irq_pin is not None else (settings.get('irq_pins') or {}).get(role)
+        if pin is not None:
+            try:
+                irq = GpioIrq(pin)
+                logger.info(f"{role} okuyucu IRQ hattı GPIO{pin} üzerinden izleniyor")
+            except Exception as e:
+                logger.error(f"{role} IRQ pini kullanılamadı, durum baytı yoklanacak: {str(e)}")
+
+    return AutoPollDetector(
+        reader,
+        bus_call=bus_call,
+        irq=irq,
+        period=int(settings.get('period', 1)),
+        status_interval=float(settings.get('status_interval', 0.1)),
+        rearm_delay=float(settings.get('rearm_delay', 0.5)),
+        rearm_interval=float(settings.get('rearm_interval', 60)),
+        name=role
+    )
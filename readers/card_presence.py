@@ -0,0 +1,214 @@
+"""
+Kart bazında tekrar okuma engelleme (debounce) ve kart varlığı takibi.
+
+Okuyucu başına tek bir "son okuma zamanı" yerine her UID için ayrı durum
+tutulur: bir kart okuyucuya geldiğinde bir kez, kaldırıldığında bir kez
+bildirilir; okuyucu üzerinde bırakılan kart tekrar tekrar işlenmez ve
+ardından gelen başka bir kart beklemeden işlenir.
+
+Alandaki kartlar son görülme zamanına göre sıralı tutulur (OrderedDict);
+süresi dolan kayıtlar her gözlemde listenin başından temizlenir.
+"""
+
+import time
+import logging
+from collections import OrderedDict, deque
+
+# Olay tipleri
+ARRIVED = "arrived"  # Kart alana girdi ve işlenmeli
+REMOVED = "removed"  # İşlenen kart alandan çıktı
+
+
+class _CardState:
+    """Alandaki tek bir kartın durumu"""
+
+    __slots__ = ("last_seen", "last_scan", "handled", "arrived")
+
+    def __init__(self, now, last_scan=None):
+        self.last_seen = now
+        self.last_scan = last_scan  # Bu kartın son işlendiği zaman
+        self.handled = False        # Bu gelişte karar verildi mi (işlendi veya bastırıldı)
+        self.arrived = False        # Bu gelişte ARRIVED bildirildi mi
+
+
+class CardPresenceTracker:
+    """
+    Bir okuyucu için UID bazlı bekleme süreleri ve kart varlığı takibi.
+    Okuyucu thread'ine özeldir (kilit kullanmaz); yalnızca release başka
+    thread'lerden çağrılabilir.
+    """
+
+    def __init__(self, card_cooldown=3.0, reader_cooldown=0.5, removal_timeout=1.5,
+                 max_entries=256, name="nfc"):
+        """
+        Takipçiyi başlat.
+
+        Args:
+            card_cooldown: Aynı kartın kaldırılıp yeniden okutulduğunda tekrar
+                işlenmesi için geçmesi gereken süre (saniye)
+            reader_cooldown: Okuyucuda iki farklı kartın işlenmesi arasındaki en kısa süre (saniye)
+            removal_timeout: Bu süre boyunca görülmeyen kart kaldırılmış sayılır (saniye)
+            max_entries: Bellekte tutulacak en fazla UID kaydı
+            name: Log mesajlarında kullanılacak ad
+        """
+        self.logger = logging.getLogger(__name__)
+        self.card_cooldown = card_cooldown
+        self.reader_cooldown = reader_cooldown
+        self.removal_timeout = removal_timeout
+        self.max_entries = max(1, int(max_entries))
+        self.name = name
+
+        # Alandaki kartlar (son görülmeye göre sıralı) ve kaldırıldıktan sonra
+        # bekleme süresi dolmamış kartların son işlenme zamanları (kaldırılma sırasıyla)
+        self._present = OrderedDict()  # uid -> _CardState
+        self._cooling = OrderedDict()  # uid -> son işlenme zamanı
+        self._last_reader_scan = None
+        self._released = deque()  # İşlenmeden atılan, yeniden işlenecek kartlar (thread-safe)
+
+        # İstatistikler
+        self.arrivals = 0
+        self.removals = 0
+        self.repeat_reads = 0       # Alanda duran kartın bastırılan tekrar okumaları
+        self.cooldown_blocked = 0   # Kart bekleme süresi içinde yeniden okutulan kartlar
+        self.reader_deferred = 0    # Okuyucu bekleme süresi nedeniyle ertelenen okumalar
+        self.evictions = 0
+        self.released = 0
+
+    def release(self, uid):
+        """
+        ARRIVED bildirilen ama işlenmeden atılan kartı yeniden işlenebilir yapar:
+        kart alandaysa sonraki gözlemde tekrar bildirilir, kaldırıldıysa yeniden
+        okutulduğunda bekleme süresi uygulanmaz. Her thread'den çağrılabilir.
+
+        Args:
+            uid: Kartın UID'si (hex)
+        """
+        self._released.append(uid)
+
+    def _apply_released(self):
+        while self._released:
+            uid = self._released.popleft()
+            self._cooling.pop(uid, None)
+            state = self._present.get(uid)
+            if state is not None:
+                state.handled = False
+                state.last_scan = None
+            self.released += 1
+
+    def _expire(self, now, events):
+        """Görülmeyen kartları kaldırılmış sayar ve süresi dolan kayıtları siler"""
+        while self._present:
+            uid, state = next(iter(self._present.items()))
+            if now - state.last_seen <= self.removal_timeout:
+                break
+            del self._present[uid]
+            if state.arrived:
+                self.removals += 1
+                events.append((REMOVED, uid))
+            if state.last_scan is not None and now - state.last_scan < self.card_cooldown:
+                self._cooling[uid] = state.last_scan
+
+        while self._cooling:
+            uid, last_scan = next(iter(self._cooling.items()))
+            if now - last_scan < self.card_cooldown:
+                break
+            del self._cooling[uid]
+
+    def observe(self, uid, now=None):
+        """
+        Bir yoklama sonucunu işler.
+
+        Args:
+            uid: Okunan kartın UID'si (hex) veya kart yoksa None
+            now: Gözlem zamanı (time.monotonic, None ise şimdi)
+
+        Returns:
+            list: (olay tipi, uid) listesi; ARRIVED olayları işlenmelidir
+        """
+        now = time.monotonic() if now is None else now
+        events = []
+        if self._released:
+            self._apply_released()
+        self._expire(now, events)
+        if uid is None:
+            return events
+
+        state = self._present.get(uid)
+        if state is None:
+            # Yeni geliş (kaldırılıp yeniden okutulduysa son işlenme zamanı korunur)
+            state = _CardState(now, self._cooling.pop(uid, None))
+            self._present[uid] = state
+        elif state.handled:
+            self.repeat_reads += 1
+
+        state.last_seen = now
+        self._present.move_to_end(uid)
+
+        if not state.handled:
+            if state.last_scan is not None and now - state.last_scan < self.card_cooldown:
+                # Aynı kart hemen yeniden okutuldu; bu gelişte işlenmez
+                state.handled = True
+                self.cooldown_blocked += 1
+            elif self._last_reader_scan is not None and now - self._last_reader_scan < self.reader_cooldown:
+                # Okuyucu bekleme süresi bitince (kart hâlâ alandaysa) işlenir
+                self.reader_deferred += 1
+            else:
+                state.handled = True
+                state.arrived = True
+                state.last_scan = now
+                self._last_reader_scan = now
+                self.arrivals += 1
+                events.append((ARRIVED, uid))
+
+        # Kapasite aşıldıysa önce bekleme kayıtlarını, sonra en uzun süredir görülmeyen kartları çıkar
+        while len(self._present) + len(self._cooling) > self.max_entries:
+            if self._cooling:
+                self._cooling.popitem(last=False)
+            else:
+                self._present.popitem(last=False)
+            self.evictions += 1
+
+        return events
+
+    def get_stats(self):
+        """
+        Takipçi istatistiklerini döndürür.
+
+        Returns:
+            dict: Alandaki ve beklemedeki kart, geliş, kaldırma, bastırılan, ertelenen ve
+                işlenmeden atılıp serbest bırakılan okuma sayıları
+        """
+        return {
+            "present": len(self._present),
+            "cooling": len(self._cooling),
+            "arrivals": self.arrivals,
+            "removals": self.removals,
+            "repeat_reads": self.repeat_reads,
+            "cooldown_blocked": self.cooldown_blocked,
+            "reader_deferred": self.reader_deferred,
+            "evictions": self.evictions,
+            "released": self.released
+        }
+
+
+def create_presence_tracker(role, settings=None, overrides=None):
+    """
+    Yapılandırmaya göre bir okuyucu için takipçi oluşturur.
+
+    Args:
+        role: Okuyucu rolü
+        settings: 'card_presence' yapılandırma bölümü
+        overrides: Okuyucuya özel ayarlar (readers listesindeki 'card_presence')
+
+    Returns:
+        CardPresenceTracker: Okuyucunun takipçisi
+    """
+    merged = dict(settings or {})
+    merged.update(overrides or {})
+    return CardPresenceTracker(
+        card_cooldown=float(merged.get('card_cooldown', 3.0)),
+        reader_cooldown=float(merged.get('reader_cooldown', 0.5)),
+        removal_timeout=float(merged.get('removal_timeout', 1.5)),
+        max_entries=int(merged.get('max_entries', 256)),
+        name=role
+    )
@@ -0,0 +1,299 @@
+"""
+I2C veri yolunun tek sahibi olan hakem (arbiter) servisi.
+
+Okuyucular, LCD ve diğer I2C kullanıcıları veri yoluna doğrudan erişmek yerine
+işlerini hakeme bırakır. Hakem her işi kendi thread'inde, işin kanalını
+multiplexer'da seçtikten sonra çalıştırır. Böylece bir thread kanal seçtikten
+sonra başka bir thread'in araya girip kanalı değiştirmesi mümkün olmaz.
+
+Her donanım veri yolunun kendi hakemi, thread'i ve kilidi vardır; farklı veri
+yollarındaki okuyucular birbirini beklemeden paralel çalışır.
+
+Zamanlama:
+  * Öncelik: kart okuma işleri LCD güncellemelerinden önce gelir
+  * Yaşlanma: bekleyen işlerin önceliği zamanla yükselir (LCD aç kalmaz)
+  * Gruplama: eşit öncelikte, önceki iş başlarken zaten kuyrukta olan ve seçili
+    kanalda çalışacak işler öne alınır (gereksiz kanal değişimi yapılmaz); yeni
+    gelen işler bekleyenlerin önüne geçemez ve art arda en fazla max_group iş
+    gruplanır
+"""
+
+import time
+import threading
+import logging
+import concurrent.futures
+from collections import deque
+
+from readers.multiplexer import select_path, current_path, format_path
+
+# İş öncelikleri (küçük değer önce çalışır)
+PRIORITY_CARD = 0     # Kart algılama ve okuma
+PRIORITY_CONTROL = 1  # Okuyucu başlatma, sıfırlama
+PRIORITY_DISPLAY = 2  # LCD güncellemeleri
+
+# Kanal istatistiklerinde saklanan son bekleme süresi sayısı
+WAIT_WINDOW = 256
+
+
+class _Job:
+    """Hakem kuyruğundaki tek bir I2C işi"""
+
+    __slots__ = ("seq", "channel", "func", "priority", "enqueued_at", "future")
+
+    def __init__(self, seq, channel, func, priority):
+        self.seq = seq
+        self.channel = channel
+        self.func = func
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.future = concurrent.futures.Future()
+
+
+class _ChannelStats:
+    """Bir kanal için kuyruk bekleme ve çalışma süresi istatistikleri"""
+
+    def __init__(self):
+        self.jobs = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.busy_time = 0.0
+        self.waits = deque(maxlen=WAIT_WINDOW)
+
+    def to_dict(self):
+        waits = sorted(self.waits)
+        p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0
+        return {
+            "jobs": self.jobs,
+            "errors": self.errors,
+            "avg_wait_ms": round(self.total_wait / self.jobs * 1000, 2) if self.jobs else 0.0,
+            "p95_wait_ms": round(p95 * 1000, 2),
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "busy_ms": round(self.busy_time * 1000, 1)
+        }
+
+
+class I2CBusArbiter:
+    """
+    Bir I2C veri yolundaki tüm işlemleri tek thread'de sıralayan hakem.
+    """
+
+    def __init__(self, select_channel, current_channel, bus_number=1,
+                 aging_interval=0.1, max_group=8):
+        """
+        Hakemi oluştur (ilk işte thread otomatik başlar).
+
+        Args:
+            select_channel: select_channel(yol) -> bool; multiplexer kanalını seçer
+                (yol, ör. ((multiplexer adresi, kanal), ...) gibi karşılaştırılabilir bir değerdir)
+            current_channel: Seçili yolu döndüren fonksiyon (None = bilinmiyor)
+            bus_number: Veri yolu numarası (log ve istatistikler için)
+            aging_interval: Bekleyen işin önceliğinin bir kademe yükseldiği süre (saniye)
+            max_group: Aynı kanalda art arda gruplanabilecek en fazla iş
+        """
+        self.logger = logging.getLogger(__name__)
+        self.select_channel = select_channel
+        self.current_channel = current_channel
+        self.bus_number = bus_number
+        self.aging_interval = aging_interval
+        self.max_group = max_group
+
+        self._condition = threading.Condition()
+        self._pending = []
+        self._seq = 0
+        self._group_count = 0
+        self._last_started = 0.0
+        self._running = False
+        self._closed = False
+        self.thread = None
+
+        # İstatistikler
+        self.channel_stats = {}
+        self.switches = 0
+        self.grouped = 0  # Başka kanaldaki daha eski bir iş yerine seçili kanaldaki iş çalıştırıldı
+
+    def start(self):
+        """Hakem thread'ini başlatır"""
+        with self._condition:
+            if self._running or self._closed:
+                return
+            self._running = True
+        self.thread = threading.Thread(target=self._run, name=f"i2c-bus-{self.bus_number}", daemon=True)
+        self.thread.start()
+        self.logger.info(f"I2C-{self.bus_number} veri yolu hakemi başlatıldı")
+
+    def stop(self, timeout=2.0):
+        """Bekleyen işleri iptal eder ve thread'i durdurur"""
+        with self._condition:
+            self._running = False
+            self._closed = True
+            pending, self._pending = self._pending, []
+            self._condition.notify_all()
+        for job in pending:
+            job.future.cancel()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def submit(self, channel, func, priority=PRIORITY_CARD):
+        """
+        İşi kuyruğa ekler ve beklemeden döner.
+
+        Args:
+            channel: İşin çalışacağı yol (None ise kanal değiştirilmez)
+            func: Argümansız çağrılacak fonksiyon
+            priority: İş önceliği (PRIORITY_*)
+
+        Returns:
+            concurrent.futures.Future: İşin sonucunu taşıyan Future
+        """
+        if not self._running:
+            self.start()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError(f"I2C-{self.bus_number} veri yolu hakemi durduruldu")
+            self._seq += 1
+            job = _Job(self._seq, channel, func, priority)
+            self._pending.append(job)
+            self._condition.notify()
+        return job.future
+
+    def run(self, channel, func, priority=PRIORITY_CARD, timeout=None):
+        """
+        İşi kanalında çalıştırır ve sonucunu döndürür (hata varsa aynen fırlatır).
+
+        Hakem thread'inin içinden çağrılırsa (iç içe iş) iş doğrudan çalıştırılır.
+
+        Args:
+            channel: İşin çalışacağı yol
+            func: Argümansız çağrılacak fonksiyon
+            priority: İş önceliği (PRIORITY_*)
+            timeout: Sonuç için en fazla bekleme süresi (saniye)
+
+        Returns:
+            İşin dönüş değeri
+        """
+        if threading.current_thread() is self.thread:
+            if channel is not None and not self.select_channel(channel):
+                raise RuntimeError(f"I2C kanal {format_route(channel)} seçilemedi")
+            return func()
+        return self.submit(channel, func, priority).result(timeout)
+
+    def _pick(self, now):
+        """Sıradaki işi seçer ve bekleyenlerden çıkarır (kilit tutulurken çağrılır)"""
+        current = self.current_channel()
+        allow_group = self._group_count < self.max_group
+
+        def key(job):
+            aged = int((now - job.enqueued_at) / self.aging_interval) if self.aging_interval else 0
+            same_channel = (allow_group and job.channel is not None and job.channel == current
+                            and job.enqueued_at <= self._last_started)
+            return (job.priority - aged, not same_channel, job.seq)
+
+        job = min(self._pending, key=key)
+        self._pending.remove(job)
+
+        if job.channel is not None and job.channel == current:
+            self._group_count += 1
+            if any(other.seq < job.seq and other.channel != current for other in self._pending):
+                self.grouped += 1
+        else:
+            self._group_count = 1
+        return job
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                job = self._pick(time.monotonic())
+                self._last_started = time.monotonic()
+
+            if not job.future.set_running_or_notify_cancel():
+                continue
+
+            started = time.monotonic()
+            waited = started - job.enqueued_at
+            stats = self.channel_stats.setdefault(job.channel, _ChannelStats())
+            stats.jobs += 1
+            stats.total_wait += waited
+            stats.max_wait = max(stats.max_wait, waited)
+            stats.waits.append(waited)
+
+            try:
+                if job.channel is not None:
+                    if self.current_channel() != job.channel:
+                        self.switches += 1
+                    if not self.select_channel(job.channel):
+                        raise RuntimeError(f"I2C kanal {format_route(job.channel)} seçilemedi")
+                job.future.set_result(job.func())
+            except BaseException as e:
+                stats.errors += 1
+                job.future.set_exception(e)
+            finally:
+                stats.busy_time += time.monotonic() - started
+
+    def get_stats(self):
+        """
+        Hakem istatistiklerini döndürür.
+
+        Returns:
+            dict: Kanal değişimi ve gruplama sayıları ile kanal bazında bekleme süreleri
+        """
+        with self._condition:
+            pending = len(self._pending)
+        return {
+            "bus": self.bus_number,
+            "pending": pending,
+            "switches": self.switches,
+            "grouped": self.grouped,
+            "channels": {format_route(channel): stats.to_dict()
+                         for channel, stats in list(self.channel_stats.items())}
+        }
+
+
+def format_route(route):
+    """Yolu log ve istatistikler için okunur hale getirir (ör. '0x70/7>0x71/2')"""
+    if isinstance(route, tuple):
+        return format_path(route)
+    return route
+
+
+# Veri yolu numarası -> hakem
+_arbiters = {}
+_arbiters_lock = threading.Lock()
+
+
+def get_i2c_bus(bus_number=1):
+    """
+    Veri yolunun paylaşılan hakemini döndürür (ilk çağrıda oluşturulur).
+
+    Args:
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        I2CBusArbiter: Veri yolu hakemi
+    """
+    with _arbiters_lock:
+        arbiter = _arbiters.get(bus_number)
+        if arbiter is None:
+            arbiter = I2CBusArbiter(
+                lambda path: select_path(path, bus_number),
+                lambda: current_path(bus_number),
+                bus_number=bus_number
+            )
+            _arbiters[bus_number] = arbiter
+        return arbiter
+
+
+def stop_i2c_buses():
+    """Tüm veri yolu hakemlerini durdurur ve istatistiklerini loglar"""
+    logger = logging.getLogger(__name__)
+    with _arbiters_lock:
+        arbiters = list(_arbiters.values())
+        _arbiters.clear()
+    for arbiter in arbiters:
+        logger.info(f"I2C-{arbiter.bus_number} hakem istatistikleri: {arbiter.get_stats()}")
+        arbiter.stop()
@@ -0,0 +1,59 @@
+"""
+MIFARE Classic bellek düzeni yardımcıları.
+
+1K kartlarda 16 sektör x 4 blok, 4K kartlarda ilk 32 sektör 4'er, son 8
+sektör 16'şar bloktan oluşur. Her sektörün son bloğu anahtarları ve erişim
+bitlerini tutan sektör trailer'ıdır; kartın ilk bloğu üretici bloğudur.
+Toplu okuma/yazma işlemleri yalnızca veri bloklarını kullanır.
+"""
+
+# MIFARE kimlik doğrulama komutları (adafruit_pn532 ile aynı değerler)
+MIFARE_CMD_AUTH_A = 0x60
+MIFARE_CMD_AUTH_B = 0x61
+
+BLOCK_SIZE = 16  # bayt
+SECTOR_COUNT_1K = 16
+SECTOR_COUNT_4K = 40
+
+# 4K kartlarda 32. sektörden itibaren sektörler 16 bloktur
+_SMALL_SECTORS = 32
+_SMALL_SECTOR_BLOCKS = 4
+_LARGE_SECTOR_BLOCKS = 16
+
+DEFAULT_KEY = b"\xFF\xFF\xFF\xFF\xFF\xFF"
+
+
+def sector_first_block(sector):
+    """Sektörün ilk bloğunun numarasını döndürür"""
+    if not 0 <= sector < SECTOR_COUNT_4K:
+        raise ValueError(f"Geçersiz sektör: {sector}")
+    if sector < _SMALL_SECTORS:
+        return sector * _SMALL_SECTOR_BLOCKS
+    return _SMALL_SECTORS * _SMALL_SECTOR_BLOCKS + (sector - _SMALL_SECTORS) * _LARGE_SECTOR_BLOCKS
+
+
+def sector_block_count(sector):
+    """Sektördeki blok sayısını döndürür (trailer dahil)"""
+    if not 0 <= sector < SECTOR_COUNT_4K:
+        raise ValueError(f"Geçersiz sektör: {sector}")
+    return _SMALL_SECTOR_BLOCKS if sector < _SMALL_SECTORS else _LARGE_SECTOR_BLOCKS
+
+
+def sector_data_blocks(sector):
+    """
+    Sektörün veri bloklarını döndürür (trailer ve üretici bloğu hariç).
+
+    Args:
+        sector: Sektör numarası
+
+    Returns:
+        tuple: Blok numaraları
+    """
+    first = sector_first_block(sector)
+    blocks = range(first, first + sector_block_count(sector) - 1)
+    return tuple(block for block in blocks if block != 0)
+
+
+def sectors_data_size(sectors):
+    """Verilen sektörlerin toplam veri kapasitesini (bayt) döndürür"""
+    return sum(len(sector_data_blocks(sector)) for sector in sectors) * BLOCK_SIZE
@@ -17,11 +17,44 @@ try:
     MUX_ADDRESS = config['multiplexer_address']
 except Exception as e:
     logger.error(f"Config dosyası yüklenemedi: {str(e)}")
+    config = {}
     MUX_ADDRESS = 0x70  # Varsayılan adres
 
-# I2C bus kilit mekanizması - thread güvenliği için
-i2c_lock = threading.Lock()
-current_channel = None
+# Kanal değişimi sonrası bekleme süresi: sabit verilmezse her veri yolu için
+# başlangıçta (check_i2c) ölçülür
+mux_config = config.get('multiplexer', {}) or {}
+SETTLE_TIME = mux_config.get('settle_time')  # Saniye (None = ölç)
+SETTLE_MARGIN = float(mux_config.get('settle_margin', 2.0))  # Ölçülen sürenin çarpanı
+MIN_SETTLE_TIME = float(mux_config.get('min_settle_time', 0.0005))  # Saniye
+CALIBRATION_ROUNDS = 8
+
+# Önceki uygulamanın kanal değişimi başına sabit beklemesi (0 yaz + 20 ms + maske yaz + 50 ms)
+LEGACY_SWITCH_DELAY = 0.07  # Saniye
+
+# Tek bir TCA9548A'daki kanal sayısı
+CHANNELS_PER_MUX = 8
+
+
+class _BusState:
+    """Bir I2C veri yolunun kilidi ve multiplexer durumu"""
+
+    def __init__(self):
+        self.lock = threading.RLock()  # Veri yoluna erişim kilidi (her veri yolu için ayrı)
+        self.path = None               # Açık yol: ((mux, kanal), ...) kökten yaprağa; None = bilinmiyor
+        self.muxes = {}                # Bilinen multiplexer adresi -> önündeki yol (kademeli bağlantı)
+        self.settle_time = None        # Bu veri yolunda kanal değişimi sonrası bekleme (None = ölçülmedi)
+
+
+# Veri yolu numarası -> durum; farklı veri yolları birbirini beklemez
+_bus_states = {}
+_states_lock = threading.Lock()
+
+# Süreç boyunca açık tutulan SMBus tutamaçları (veri yolu numarası -> SMBus)
+_buses = {}
+
+# Kanal değişimi istatistikleri (tüm veri yolları)
+switch_stats = {"switches": 0, "writes": 0, "total_time": 0.0, "max_time": 0.0, "bus_reopens": 0}
+_stats_lock = threading.Lock()
 
 if SIMULATION_MODE:
     # Simülasyon modu
@@ -46,116 +79,398 @@ else:
             logger.error("Hem smbus2 hem de smbus yüklenemedi")
             raise ImportError("I2C erişimi için smbus2 veya smbus modülü gerekli")
 
-def select_channel(channel: int):
+def _bus_state(bus_number):
+    """Veri yolunun durum nesnesini döndürür (ilk çağrıda oluşturulur)"""
+    with _states_lock:
+        state = _bus_states.get(bus_number)
+        if state is None:
+            state = _BusState()
+            _bus_states[bus_number] = state
+        return state
+
+def bus_lock(bus_number=1):
     """
-    I2C multiplexer kanalı seçme
-    
+    Veri yolunun erişim kilidini döndürür.
+
     Args:
-        channel (int): Seçilecek kanal (0-7)
-    
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        threading.RLock: Yalnızca bu veri yolunu koruyan kilit
+    """
+    return _bus_state(bus_number).lock
+
+def get_bus(bus_number=1):
+    """
+    Veri yolunun kalıcı SMBus tutamacını döndürür (ilk çağrıda açılır).
+
+    Args:
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        SMBus: Açık veri yolu tutamacı
+    """
+    with _states_lock:
+        bus = _buses.get(bus_number)
+        if bus is None:
+            bus = SMBus(bus_number)
+            _buses[bus_number] = bus
+        return bus
+
+def drop_bus(bus_number=1):
+    """Hata sonrası tutamacı kapatır; bir sonraki erişimde yeniden açılır"""
+    with _states_lock:
+        bus = _buses.pop(bus_number, None)
+    if bus is None:
+        return
+    with _stats_lock:
+        switch_stats["bus_reopens"] += 1
+    try:
+        bus.close()
+    except Exception:
+        pass
+
+def close_buses():
+    """Tüm kalıcı SMBus tutamaçlarını kapatır"""
+    with _states_lock:
+        buses = list(_buses.items())
+        _buses.clear()
+    for bus_number, bus in buses:
+        try:
+            bus.close()
+        except Exception as e:
+            logger.warning(f"SMBus {bus_number} kapatılamadı: {str(e)}")
+
+def format_path(path):
+    """Yolu log mesajları için okunur hale getirir (ör. '0x70/7>0x71/2')"""
+    return ">".join(f"0x{mux:02x}/{channel}" for mux, channel in path)
+
+def register_path(path, bus_number=1):
+    """
+    Bir cihaza giden yoldaki multiplexer'ları kaydeder (sıfırlamada hepsi kapatılsın diye).
+
+    Args:
+        path: ((multiplexer adresi, kanal), ...) kökten cihaza
+        bus_number: I2C veri yolu numarası
+
+    Raises:
+        ValueError: Aynı adresli multiplexer farklı yollar üzerinde tanımlıysa
+    """
+    state = _bus_state(bus_number)
+    with state.lock:
+        path = tuple(path)
+        for depth, (mux, _) in enumerate(path):
+            upstream = path[:depth]
+            known = state.muxes.setdefault(mux, upstream)
+            if known != upstream:
+                raise ValueError(f"I2C-{bus_number}: 0x{mux:02x} multiplexer'ı hem "
+                                 f"'{format_path(known) or 'kök'}' hem '{format_path(upstream) or 'kök'}' "
+                                 f"arkasında tanımlı")
+
+def get_settle_time(bus_number=1):
+    """
+    Veri yolunun kanal değişimi sonrası bekleme süresini döndürür.
+
+    Args:
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        float: Bekleme süresi (saniye) veya henüz ölçülmediyse None
+    """
+    return _bus_state(bus_number).settle_time
+
+def calibrate_settle_time(channels=(0,), mux_address=None, bus_number=1):
+    """
+    Kanal maskesi yazıldıktan sonra multiplexer'ın yeni maskeyi geri okuyana
+    kadar geçen süreyi ölçer ve veri yolunun bekleme süresini buna göre ayarlar.
+    Açılışta her veri yolu için check_i2c'den çağrılır.
+
+    Ölçülen süre kök multiplexer ile yapılan yazma + geri okuma gidiş-dönüş
+    süresidir; alt kanaldaki cihazın yanıt vermeye hazır olma süresi değildir.
+    Kanal anahtarı, kontrol yazmacını geri okuyana kadar kapanmış olduğundan
+    bu süre üst sınır olarak kullanılır. Ölçüm yalnızca kök multiplexer'ın
+    maskesini değiştirdiği için kademeli yolların gerçek durumu bilinemez;
+    ölçümden sonra önbellekteki yol sıfırlanır ve sonraki seçim tüm yolu yeniden yazar.
+
+    Args:
+        channels: Ölçümde kullanılacak kanallar
+        mux_address: Ölçümde kullanılacak kök multiplexer (None ise multiplexer_address)
+        bus_number: Ölçümün yapılacağı veri yolu
+
+    Returns:
+        float: Bu veri yolunda kullanılacak bekleme süresi (saniye)
+    """
+    mux_address = MUX_ADDRESS if mux_address is None else mux_address
+    state = _bus_state(bus_number)
+
+    if SETTLE_TIME is not None:
+        state.settle_time = float(SETTLE_TIME)
+        return state.settle_time
+
+    if SIMULATION_MODE:
+        state.settle_time = 0.0
+        return state.settle_time
+
+    with state.lock:
+        worst = 0.0
+        try:
+            bus = get_bus(bus_number)
+            for i in range(CALIBRATION_ROUNDS):
+                channel = channels[i % len(channels)]
+                mask = 1 << channel
+                started = time.perf_counter()
+                bus.write_byte(mux_address, mask)
+                # Kontrol yazmacı yeni maskeyi gösterene kadar bekle (en fazla 70 ms)
+                while bus.read_byte(mux_address) != mask:
+                    if time.perf_counter() - started > LEGACY_SWITCH_DELAY:
+                        raise RuntimeError("Multiplexer maskesi doğrulanamadı")
+                worst = max(worst, time.perf_counter() - started)
+            state.settle_time = min(LEGACY_SWITCH_DELAY, max(MIN_SETTLE_TIME, worst * SETTLE_MARGIN))
+            logger.info(f"I2C-{bus_number} multiplexer bekleme süresi ölçüldü: {state.settle_time * 1000:.2f} ms "
+                        f"(en kötü ölçüm {worst * 1000:.2f} ms, önceki sabit bekleme "
+                        f"{LEGACY_SWITCH_DELAY * 1000:.0f} ms)")
+        except Exception as e:
+            drop_bus(bus_number)
+            state.settle_time = LEGACY_SWITCH_DELAY
+            logger.warning(f"I2C-{bus_number} multiplexer kalibrasyonu başarısız, eski bekleme süresi "
+                           f"kullanılacak: {str(e)}")
+        finally:
+            # Ölçüm kök maskesini değiştirdi; kademeli yolların durumu artık bilinmiyor
+            state.path = None
+        return state.settle_time
+
+def _record_switch(elapsed, writes):
+    with _stats_lock:
+        switch_stats["switches"] += 1
+        switch_stats["writes"] += writes
+        switch_stats["total_time"] += elapsed
+        switch_stats["max_time"] = max(switch_stats["max_time"], elapsed)
+
+def get_switch_stats():
+    """
+    Kanal değişimi istatistiklerini ve eski uygulamaya göre kazanılan süreyi döndürür.
+
+    Returns:
+        dict: Değişim ve yazma sayısı, ortalama/en uzun süre, kazanılan toplam süre
+    """
+    with _stats_lock:
+        switches = switch_stats["switches"]
+        writes = switch_stats["writes"]
+        total = switch_stats["total_time"]
+        return {
+            "switches": switches,
+            "mux_writes": writes,
+            "settle_ms": {number: round((state.settle_time or 0.0) * 1000, 3)
+                          for number, state in sorted(list(_bus_states.items()))},
+            "avg_switch_ms": round(total / switches * 1000, 3) if switches else 0.0,
+            "max_switch_ms": round(switch_stats["max_time"] * 1000, 3),
+            "legacy_switch_ms": LEGACY_SWITCH_DELAY * 1000,
+            "saved_ms": round((writes * LEGACY_SWITCH_DELAY - total) * 1000, 1),
+            "bus_reopens": switch_stats["bus_reopens"]
+        }
+
+def current_path(bus_number=1):
+    """
+    Veri yolunda açık olan yolu döndürür.
+
+    Args:
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        tuple: ((multiplexer adresi, kanal), ...) veya durum bilinmiyorsa None
+    """
+    return _bus_state(bus_number).path
+
+def _path_writes(current, path):
+    """
+    Açık yoldan hedef yola geçmek için gereken (adres, maske) yazmalarını döndürür.
+
+    Ortak önek korunur; ayrılan daldaki multiplexer'lar en derindekinden başlanarak
+    kapatılır (üst kanalları hâlâ açıkken erişilebilir oldukları için), sonra hedef
+    yolun kalan kademeleri kökten yaprağa doğru açılır.
+    """
+    if current is None:
+        return [(mux, 1 << channel) for mux, channel in path]
+
+    common = 0
+    while common < min(len(current), len(path)) and current[common] == path[common]:
+        common += 1
+
+    writes = []
+    for depth in range(len(current) - 1, common - 1, -1):
+        mux = current[depth][0]
+        # Aynı multiplexer'ın yalnızca kanalı değişiyorsa maske tek yazmada değişir
+        if depth == common and depth < len(path) and path[depth][0] == mux:
+            continue
+        writes.append((mux, 0))
+    writes.extend((mux, 1 << channel) for mux, channel in path[common:])
+    return writes
+
+def select_path(path, bus_number=1):
+    """
+    Kademeli multiplexer'lar üzerinden cihaza giden yolu seçer.
+
+    Yalnızca bu veri yolunun kilidi tutulur; diğer veri yollarındaki işlemler beklemez.
+
+    Args:
+        path: ((multiplexer adresi, kanal), ...) kökten cihaza
+        bus_number: I2C veri yolu numarası
+
     Returns:
         bool: Başarılı ise True, hata durumunda False
     """
-    global current_channel
-    
-    if not 0 <= channel <= 7:
-        logger.error(f"Geçersiz multiplexer kanalı: {channel}. 0-7 arasında olmalı.")
-        return False
-    
-    # Aynı kanal tekrar seçilmek isteniyorsa işlem yapmaya gerek yok
-    if current_channel == channel:
+    path = tuple(tuple(hop) for hop in path)
+    for mux, channel in path:
+        if not 0 <= channel < CHANNELS_PER_MUX:
+            logger.error(f"Geçersiz multiplexer kanalı: {channel}. 0-7 arasında olmalı.")
+            return False
+
+    state = _bus_state(bus_number)
+
+    # Aynı yol tekrar seçilmek isteniyorsa işlem yapmaya gerek yok
+    if state.path == path:
         return True
-    
+
     if SIMULATION_MODE:
         # Simülasyon modunda gerçek I2C işlemi yapılmaz
-        current_channel = channel
-        logger.debug(f"Simülasyon: Multiplexer kanal {channel} seçildi")
+        with state.lock:
+            register_path(path, bus_number)
+            state.path = path
+        logger.debug(f"Simülasyon: I2C-{bus_number} {format_path(path)} seçildi")
         return True
-        
-    # I2C bus'a erişim için lock kullan
-    with i2c_lock:
+
+    # Yalnızca bu veri yolunun kilidi
+    with state.lock:
+        register_path(path, bus_number)
+
+        # Veri yolu açılışta (check_i2c / init_lcd) ölçülmediyse şimdi ölç
+        if state.settle_time is None and path:
+            calibrate_settle_time((path[0][1],), path[0][0], bus_number)
+        if state.path == path:
+            return True
+
         # Birkaç kez deneme yap
         max_retries = 3
         retry_count = 0
-        
+
         while retry_count < max_retries:
             try:
-                bus = SMBus(1)  # Raspberry Pi'de genellikle bus 1 kullanılır
-                
-                # Önce tüm kanalları kapat
-                bus.write_byte(MUX_ADDRESS, 0)
-                time.sleep(0.02)  # Biraz daha uzun bekle
-                
-                # Belirtilen kanalı seç (1 << channel ile bit maskeleme)
-                bus.write_byte(MUX_ADDRESS, 1 << channel)
-                
-                # Biraz bekle - cihazlar arası iletişim için
-                time.sleep(0.05)  # Daha uzun bekleme süresi
-                
-                # İşlem tamamlandığında bus'ı kapat
-                bus.close()
-                
-                # Güncel kanalı güncelle
-                current_channel = channel
-                
-                logger.debug(f"Multiplexer kanal {channel} başarıyla seçildi")
+                started = time.perf_counter()
+                bus = get_bus(bus_number)
+                writes = _path_writes(state.path, path)
+
+                for mux, mask in writes:
+                    # TCA9548A maskeyi tek yazmada değiştirir
+                    bus.write_byte(mux, mask)
+                    # Ölçülen süre kadar bekle - cihazlar arası iletişim için
+                    if state.settle_time:
+                        time.sleep(state.settle_time)
+
+                # Güncel yolu güncelle
+                state.path = path
+                _record_switch(time.perf_counter() - started, len(writes))
+
+                logger.debug(f"I2C-{bus_number} {format_path(path)} başarıyla seçildi ({len(writes)} yazma)")
                 return True
-                
+
             except Exception as e:
                 retry_count += 1
-                logger.warning(f"Multiplexer kanal {channel} seçimi denemesi {retry_count}/{max_retries} başarısız: {str(e)}")
+                logger.warning(f"I2C-{bus_number} {format_path(path)} seçimi denemesi "
+                               f"{retry_count}/{max_retries} başarısız: {str(e)}")
+
+                # Tutamacı kapat, sonraki denemede yeniden açılır; yol durumu artık bilinmiyor
+                drop_bus(bus_number)
+                state.path = None
                 time.sleep(0.1 * retry_count)  # Her denemede biraz daha uzun bekle
-                
-                try:
-                    bus.close()
-                except:
-                    pass
-        
-        logger.error(f"Multiplexer kanal {channel} seçimi tüm denemelerde başarısız oldu")
+
+        logger.error(f"I2C-{bus_number} {format_path(path)} seçimi tüm denemelerde başarısız oldu")
         return False
 
-def reset_multiplexer():
+def select_channel(channel: int, mux_address=None, bus_number=1):
     """
-    Multiplexer'ı sıfırla - tüm kanalları kapat
+    I2C multiplexer kanalı seçme (kademesiz, tek multiplexer'lı yol)
+    
+    Args:
+        channel (int): Seçilecek kanal (0-7)
+        mux_address: Multiplexer adresi (None ise multiplexer_address)
+        bus_number: I2C veri yolu numarası
     
     Returns:
         bool: Başarılı ise True, hata durumunda False
     """
-    global current_channel
-    
-    if SIMULATION_MODE:
-        current_channel = None
-        logger.debug("Simülasyon: Multiplexer sıfırlandı")
-        return True
-        
-    with i2c_lock:
+    mux_address = MUX_ADDRESS if mux_address is None else mux_address
+    return select_path(((mux_address, channel),), bus_number)
+
+def _reset_bus(bus_number, mux_addresses):
+    """Bir veri yolundaki multiplexer'ların tüm kanallarını kapatır"""
+    state = _bus_state(bus_number)
+    with state.lock:
+        if SIMULATION_MODE:
+            state.path = None
+            logger.debug(f"Simülasyon: I2C-{bus_number} multiplexer'ları sıfırlandı")
+            return True
+
+        muxes = dict(state.muxes)
+        for mux in mux_addresses or ():
+            muxes.setdefault(mux, ())
+        if not muxes:
+            return True
+
+        # Kademeli multiplexer'lar önce kapatılır; her birine üst yolu açılarak ulaşılır
+        ordered = sorted(muxes.items(), key=lambda item: len(item[1]), reverse=True)
+
         max_retries = 3
         retry_count = 0
-        
+
         while retry_count < max_retries:
             try:
-                bus = SMBus(1)
-                
-                # 0 değeri yazarak tüm kanalları kapat
-                bus.write_byte(MUX_ADDRESS, 0)
-                
-                time.sleep(0.05)  # Daha uzun bekleme
-                bus.close()
-                
-                current_channel = None
-                
-                logger.debug("Multiplexer başarıyla sıfırlandı")
+                bus = get_bus(bus_number)
+                for mux, upstream in ordered:
+                    for upstream_mux, channel in upstream:
+                        bus.write_byte(upstream_mux, 1 << channel)
+                    # 0 değeri yazarak tüm kanalları kapat
+                    bus.write_byte(mux, 0)
+
+                if state.settle_time:
+                    time.sleep(state.settle_time)
+
+                state.path = ()
+                logger.debug(f"I2C-{bus_number} multiplexer'ları başarıyla sıfırlandı")
                 return True
-                
+
             except Exception as e:
                 retry_count += 1
-                logger.warning(f"Multiplexer sıfırlama denemesi {retry_count}/{max_retries} başarısız: {str(e)}")
+                logger.warning(f"I2C-{bus_number} multiplexer sıfırlama denemesi "
+                               f"{retry_count}/{max_retries} başarısız: {str(e)}")
+                drop_bus(bus_number)
+                state.path = None
                 time.sleep(0.1 * retry_count)
-                
-                try:
-                    bus.close()
-                except:
-                    pass
-        
-        logger.error("Multiplexer sıfırlama tüm denemelerde başarısız oldu")
-        return False 
\ No newline at end of file
+
+        logger.error(f"I2C-{bus_number} multiplexer sıfırlama tüm denemelerde başarısız oldu")
+        return False
+
+def reset_multiplexer(mux_addresses=None, bus_number=None):
+    """
+    Multiplexer'ı sıfırla - tüm kanalları kapat
+    
+    Args:
+        mux_addresses: Ayrıca sıfırlanacak kök multiplexer adresleri
+        bus_number: Sıfırlanacak veri yolu (None ise kullanılan tüm veri yolları)
+    
+    Returns:
+        bool: Başarılı ise True, hata durumunda False
+    """
+    if bus_number is not None:
+        return _reset_bus(bus_number, mux_addresses)
+
+    with _states_lock:
+        bus_numbers = set(_bus_states) | {1}
+
+    success = True
+    for number in sorted(bus_numbers):
+        # Ana multiplexer_address her zaman 1. veri yolunda kabul edilir
+        extra = set(mux_addresses or ())
+        if number == 1:
+            extra.add(MUX_ADDRESS)
+        success = _reset_bus(number, extra) and success
+    return success
@@ -1,17 +1,27 @@
 import threading
 import time
-from readers.multiplexer import select_channel, reset_multiplexer
+from readers.multiplexer import (select_path, reset_multiplexer, get_bus, drop_bus, format_path,
+                                 get_settle_time, calibrate_settle_time)
 import board
 import busio
-from utils.api_client import send_card
+from utils.access_control import get_door_decision
+from utils.outbox import record_event
+from readers.scan_queue import ScanQueue, ScanWorker, DROP_OLDEST, DROP_REASON_SHUTDOWN
+from readers.auto_poll import create_auto_poll_detector
+from readers.card_presence import create_presence_tracker, ARRIVED
+from readers.recovery import create_recovery_ladder, STAGE_SAM, STAGE_CHANNEL, STAGE_FULL
+from readers.i2c_bus import get_i2c_bus, PRIORITY_CONTROL
+from readers.registry import get_reader
+from readers.mifare import BLOCK_SIZE, DEFAULT_KEY, sector_data_blocks, sectors_data_size
 from utils.logger import log
 from controllers.relay_controller import trigger_relay
 from controllers.led_controller import show_color
 from controllers.buzzer_controller import beep
-from controllers.lcd_controller import show_scan_result, start_idle_screen, stop_idle_screen, convert_to_ascii
+from controllers.lcd_controller import show_scan_result, convert_to_ascii
 import os
 import yaml
 import logging
+import uuid
 from datetime import datetime
 from threading import Thread, Event
 
@@ -38,6 +48,7 @@ if not is_simulation_mode():
 else:
     # Simülasyon modunda dummy SMBus kullan
     from utils.dummy_smbus import SMBus
+    from readers.mifare import MIFARE_CMD_AUTH_A
 
 # Logger kurulumu
 logger = logging.getLogger(__name__)
@@ -46,12 +57,13 @@ logger = logging.getLogger(__name__)
 SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'true').lower() in ('true', '1', 't', 'yes')
 
 # NFC okuyucu durağan zamanı (son başarılı okumadan sonra)
-SCAN_COOLDOWN_TIME = 3  # saniye
+SCAN_COOLDOWN_TIME = 3  # saniye (aynı kartın yeniden işlenmesi için varsayılan bekleme)
 
 # NFC okuyucu yeniden deneme parametreleri
 MAX_RETRIES = 5  # Başarısız okuma denemesi sayısı
 RETRY_DELAY = 5  # Saniye
 HARDWARE_RESET_DELAY = 60  # Saniye (1 dakika)
+PN532_WAKE_DELAY = 0.1  # Okuyucu oluşturulduktan sonra ve firmware denemeleri arası bekleme (saniye)
 
 try:
     with open("config/config.yaml") as f:
@@ -63,6 +75,33 @@ except Exception as e:
         "multiplexer_address": 0x70
     }
 
+# Okuyucu -> işçi kuyruğu ayarları
+scan_queue_config = config.get('scan_queue', {}) or {}
+scan_workers = {}  # rol -> ScanWorker
+
+# Tüm I2C işlemleri okuyucunun veri yolunun hakemi üzerinden yapılır (get_i2c_bus)
+
+# PN532 InAutoPoll ayarları
+auto_poll_config = config.get('nfc_auto_poll', {}) or {}
+
+# Kart bazında bekleme süreleri ve varlık takibi ayarları
+card_presence_config = dict(config.get('card_presence', {}) or {})
+card_presence_config.setdefault('card_cooldown', SCAN_COOLDOWN_TIME)
+presence_trackers = {}  # rol -> CardPresenceTracker
+
+# Okuma hatalarında kademeli kurtarma ayarları
+recovery_config = config.get('nfc_recovery', {}) or {}
+recovery_ladders = {}  # rol -> RecoveryLadder
+
+# 1. veri yolu dışındaki donanım veri yolları için (isteğe bağlı)
+try:
+    from adafruit_extended_bus import ExtendedI2C
+except ImportError:
+    ExtendedI2C = None
+
+# Veri yolu numarası -> PN532 sürücüsünün kullandığı I2C nesnesi
+_i2c_ports = {}
+
 # I2C yapılandırma
 if SIMULATION_MODE:
     # Simülasyon modu - NFC okuyucu taklit sınıfı kullanılır
@@ -89,37 +128,150 @@ else:
         logger.error(f"Adafruit PN532 modülü yüklenemedi: {str(e)}")
         raise ImportError("NFC okuyucu için gerekli adafruit-circuitpython-pn532 modülü yüklenemedi")
 
+def get_i2c_port(bus_number=1):
+    """
+    PN532 sürücüsü için veri yolunun I2C nesnesini döndürür (ilk çağrıda oluşturulur).
+
+    Args:
+        bus_number: I2C veri yolu numarası
+
+    Returns:
+        I2C nesnesi (simülasyonda None)
+    """
+    if SIMULATION_MODE or bus_number == 1:
+        return i2c
+    port = _i2c_ports.get(bus_number)
+    if port is None:
+        if ExtendedI2C is None:
+            raise ImportError(f"I2C-{bus_number} için adafruit-extended-bus modülü gerekli - "
+                              f"'pip install adafruit-extended-bus'")
+        port = ExtendedI2C(bus_number)
+        _i2c_ports[bus_number] = port
+    return port
+
 # I2C durumunu kontrol et
-def check_i2c():
-    """I2C bağlantısını kontrol eder"""
+def check_i2c(bus_number=1, mux_address=None):
+    """
+    I2C bağlantısını kontrol eder; veri yolunun multiplexer bekleme süresi
+    henüz ölçülmediyse burada (okuyucunun ilk kart işinden önce) ölçülür.
+    
+    Args:
+        bus_number: Kontrol edilecek veri yolu
+        mux_address: Varlığı kontrol edilecek kök multiplexer (None ise multiplexer_address)
+    """
     if SIMULATION_MODE:
         return True
+    
+    if mux_address is None:
+        mux_address = config.get('multiplexer_address', 0x70)
         
     try:
-        # I2C veri yolu kontrolü
-        import smbus2
-        bus = smbus2.SMBus(1)
+        # I2C veri yolu kontrolü (kalıcı tutamaç kullanılır)
+        bus = get_bus(bus_number)
         
         # Multiplexer varlığını kontrol et
         try:
-            bus.read_byte(config.get('multiplexer_address', 0x70))
-            logger.info("I2C multiplexer bağlantısı başarılı")
+            bus.read_byte(mux_address)
+            logger.info(f"I2C-{bus_number} multiplexer 0x{mux_address:02x} bağlantısı başarılı")
         except Exception as e:
-            logger.error(f"I2C multiplexer kontrolü başarısız: {str(e)}")
+            logger.error(f"I2C-{bus_number} multiplexer 0x{mux_address:02x} kontrolü başarısız: {str(e)}")
+            drop_bus(bus_number)
             return False
         
-        # I2C veri yolunu kapat
-        bus.close()
+        if get_settle_time(bus_number) is None:
+            calibrate_settle_time(mux_address=mux_address, bus_number=bus_number)
+        
         return True
     except Exception as e:
         logger.error(f"I2C veri yolu kontrolü başarısız: {str(e)}")
         return False
 
+def _open_reader(role, path, bus_number=1):
+    """
+    PN532 okuyucuyu başlatır.
+    
+    Her adım ayrı bir veri yolu hakemi işidir; adımlar arasındaki beklemeler
+    veri yolu dışında yapılır, böylece aynı veri yolundaki diğer okuyucular ve
+    LCD bu sırada başlatılabilir. Kanal değişimlerinden sonraki bekleme
+    multiplexer'ın ölçülen oturma süresiyle yapılır.
+    
+    Args:
+        role: Okuyucu rolü
+        path: Okuyucunun yolu ((multiplexer adresi, kanal), ...)
+        bus_number: Okuyucunun veri yolu
+
+    Returns:
+        PN532_I2C: Başlatılan okuyucu
+
+    Raises:
+        RuntimeError: Kanal seçilemez veya okuyucu yanıt vermezse
+    """
+    i2c_bus = get_i2c_bus(bus_number)
+    
+    # Multiplexer'ları sıfırla ve okuyucunun yolunu seç
+    i2c_bus.run(None, lambda: _reselect_path(path, bus_number), priority=PRIORITY_CONTROL)
+    
+    # PN532 NFC okuyucuyu başlat
+    try:
+        reader = i2c_bus.run(path, lambda: PN532_I2C(get_i2c_port(bus_number), debug=False),
+                             priority=PRIORITY_CONTROL)
+        
+        # Okuyucuya biraz zaman tanı (veri yolu dışında)
+        time.sleep(PN532_WAKE_DELAY)
+        
+        # SAM konfigürasyonu
+        i2c_bus.run(path, reader.SAM_configuration, priority=PRIORITY_CONTROL)
+        
+        # Firmware sürümünü kontrol et (bağlantı testi)
+        retries_fw = 0
+        while retries_fw < 3:  # Firmware okumaya 3 deneme hakkı ver
+            try:
+                version = i2c_bus.run(path, lambda: reader.firmware_version, priority=PRIORITY_CONTROL)
+                if not version or version == (0, 0, 0, 0):
+                    raise RuntimeError("Geçersiz firmware sürümü, bağlantı hatası")
+                break
+            except Exception as fw_error:
+                retries_fw += 1
+                if retries_fw >= 3:
+                    raise fw_error
+                logger.warning(f"Firmware sürümü okunamadı, yeniden deneniyor {retries_fw}/3")
+                time.sleep(PN532_WAKE_DELAY)
+        
+        logger.info(f"{role} NFC okuyucu başarıyla başlatıldı (Firmware: {version})")
+        print(f"[NFC] {role} okuyucu başlatıldı (Firmware: v{version[0]}.{version[1]})")
+        
+        # Başarılı başlatma
+        return reader
+    except Exception as pn532_error:
+        logger.error(f"PN532 başlatma hatası: {str(pn532_error)}")
+        raise pn532_error
+
+def _reselect_path(path, bus_number=1):
+    """
+    Okuyucunun veri yolundaki multiplexer'ları sıfırlayıp yolunu yeniden seçer.
+    Veri yolu hakeminin thread'inde çalışır.
+    
+    Raises:
+        RuntimeError: Yol seçilemezse
+    """
+    reset_multiplexer(bus_number=bus_number)
+    if not select_path(path, bus_number):
+        raise RuntimeError(f"I2C-{bus_number} {format_path(path)} yeniden seçilemedi")
+
 # NFC okuyucu başlatma fonksiyonu
-def init_nfc_reader(role, channel):
-    """NFC okuyucuyu başlatır"""
+def init_nfc_reader(role, path, bus_number=1):
+    """
+    NFC okuyucuyu başlatır
+    
+    Args:
+        role: Okuyucu rolü
+        path: Okuyucunun yolu ((multiplexer adresi, kanal), ...)
+        bus_number: Okuyucunun veri yolu
+    """
     global i2c
     
+    i2c_bus = get_i2c_bus(bus_number)
+    
     if SIMULATION_MODE:
         logger.info(f"{role} NFC okuyucu simülasyon modunda başlatılıyor")
         return PN532_I2C(i2c, debug=False)
@@ -130,66 +282,24 @@ def init_nfc_reader(role, channel):
     while retries < MAX_RETRIES:
         try:
             # I2C bağlantısını kontrol et
-            if not check_i2c():
+            if not i2c_bus.run(None, lambda: check_i2c(bus_number, path[0][0]), priority=PRIORITY_CONTROL):
                 logger.error("I2C bağlantısı kurulamadı, yeniden deneniyor...")
                 time.sleep(RETRY_DELAY)
                 retries += 1
                 continue
             
-            # Önce multiplexer'ı sıfırla ve biraz bekle
-            reset_multiplexer()
-            time.sleep(0.1)
-            
-            # Multiplexer kanalını seç
-            if not select_channel(channel):
-                logger.error(f"{role} NFC okuyucu için kanal seçilemedi, yeniden deneniyor...")
-                time.sleep(RETRY_DELAY)
-                retries += 1
-                continue
-            
-            # Kanal seçildikten sonra biraz bekle
-            time.sleep(0.2)
-            
-            # PN532 NFC okuyucuyu başlat
-            try:
-                reader = PN532_I2C(i2c, debug=False)
-                
-                # Okuyucuya biraz zaman tanı
-                time.sleep(0.1)
-                
-                # SAM konfigürasyonu
-                reader.SAM_configuration()
-                
-                # Firmware sürümünü kontrol et (bağlantı testi)
-                retries_fw = 0
-                while retries_fw < 3:  # Firmware okumaya 3 deneme hakkı ver
-                    try:
-                        version = reader.firmware_version
-                        if not version or version == (0, 0, 0, 0):
-                            raise RuntimeError("Geçersiz firmware sürümü, bağlantı hatası")
-                        break
-                    except Exception as fw_error:
-                        retries_fw += 1
-                        if retries_fw >= 3:
-                            raise fw_error
-                        logger.warning(f"Firmware sürümü okunamadı, yeniden deneniyor {retries_fw}/3")
-                        time.sleep(0.2)
-                
-                logger.info(f"{role} NFC okuyucu başarıyla başlatıldı (Firmware: {version})")
-                print(f"[NFC] {role} okuyucu başlatıldı (Firmware: v{version[0]}.{version[1]})")
-                
-                # Başarılı başlatma
-                return reader
-            except Exception as pn532_error:
-                logger.error(f"PN532 başlatma hatası: {str(pn532_error)}")
-                raise pn532_error
+            # Okuyucuyu başlat (her adım ayrı hakem işi, beklemeler veri yolu dışında)
+            return _open_reader(role, path, bus_number)
             
         except Exception as e:
             logger.error(f"{role} NFC okuyucu başlatma hatası ({retries+1}/{MAX_RETRIES}): {str(e)}")
             print(f"[HATA] {role} NFC okuyucu başlatılamadı: {str(e)}")
             
             # Hata durumunda multiplexer'ı sıfırla
-            reset_multiplexer()
+            try:
+                i2c_bus.run(None, lambda: reset_multiplexer(bus_number=bus_number), priority=PRIORITY_CONTROL)
+            except Exception as reset_error:
+                logger.error(f"Multiplexer sıfırlama hatası: {str(reset_error)}")
             
             retries += 1
             
@@ -207,17 +317,250 @@ class CardScanEvent:
         self.role = role
         self.is_inside = is_inside
         self.timestamp = datetime.now()
+        self.event_id = uuid.uuid4().hex  # Tekrar denemelerde çift kaydı önleyen kimlik
         self.processed = False
         self.success = False
         self.door_opened = False
+        self.drop_reason = None  # İşlenmeden atıldıysa nedeni (DROP_REASON_*)
+        self.source = None       # Kararı veren katman (api, allowlist, revocation, ...)
+
+    def to_dict(self):
+        """Olayı giden kutusuna yazılacak sözlüğe çevirir"""
+        event = {
+            "eventId": self.event_id,
+            "cardUID": self.uid,
+            "role": self.role,
+            "isInside": self.is_inside,
+            "timestamp": self.timestamp.isoformat(),
+            "processed": self.processed,
+            "success": self.success,
+            "doorOpened": self.door_opened
+        }
+        if self.source is not None:
+            event["source"] = self.source
+        if self.drop_reason is not None:
+            event["dropReason"] = self.drop_reason
+        return event
+
+def process_scan_event(scan_event, lcd_enabled=False):
+    """
+    Kart okuma olayı için kapı kararını alır ve geri bildirimleri yürütür.
+    Okuyucunun işçi thread'inde çalışır; okuyucu thread'i bu sırada yoklamaya devam eder.
 
-def handle_reader(role, channel, is_inside, lcd_enabled=False):
-    """NFC okuyucu yönetimi"""
+    Args:
+        scan_event: İşlenecek CardScanEvent
+        lcd_enabled: Sonucu LCD'de göster
+    """
+    from controllers.led_controller import start_breathing
+    
+    role = scan_event.role
+    uid_hex = scan_event.uid
+    is_inside = scan_event.is_inside
+    
+    # Kapı kararını al (önbellek veya API)
+    try:
+        status, response = get_door_decision(uid_hex, is_inside)
+        scan_event.processed = True
+        if response:
+            # Yerel kararlar API'ye ayrıca bildirilmez; kararın kaynağı olayla kaydedilir
+            scan_event.source = response.get('source', 'api')
+        opened = False
+        
+        # Başarı durumuna göre renk ve uyarı
+        if status:
+            # API yanıtından kapı durumunu al
+            if 'doorOpened' in response and response['doorOpened']:
+                opened = True
+                scan_event.door_opened = True
+                scan_event.success = True
+                
+                # Yeşil renk göster ve bip sesi çal
+                show_color(role, (0, 255, 0))
+                beep(role, 0.1, 1)  # Kısa tek bip
+                
+                # Okuyucunun kapısına bağlı röleyi tetikle (kapıyı aç)
+                try:
+                    spec = get_reader(role)
+                    if spec is not None:
+                        trigger_relay(relay_id=spec.relay_id, relay_type=spec.relay_type)
+                    else:
+                        trigger_relay()
+                    logger.info(f"{role.upper()} - Kapı açıldı")
+                except Exception as e:
+                    logger.error(f"Röle tetikleme hatası: {str(e)}")
+            else:
+                # Yetkisiz giriş - kırmızı göster ve uzun bip
+                scan_event.success = False
+                show_color(role, (255, 0, 0))
+                beep(role, 0.5, 2)  # Uzun çift bip
+                logger.warning(f"{role.upper()} - Yetkisiz kart: {uid_hex}")
+        else:
+            # API hatası - sarı göster
+            scan_event.success = False
+            show_color(role, (255, 255, 0))
+            beep(role, 0.2, 3)  # Üç kısa bip
+            logger.error(f"{role.upper()} - API hatası: {response}")
+        
+        # LCD'de göster (ekran servisine bırakılır, beklenmez; süre dolunca boş ekrana dönülür)
+        if lcd_enabled:
+            try:
+                direction = "İçeriden Çıkış" if is_inside else "Dışarıdan Giriş"
+                show_scan_result(direction, opened)
+            except Exception as lcd_error:
+                logger.error(f"LCD gösterme hatası: {str(lcd_error)}")
+        
+        # Okuyucuyu bekleme durumuna getir (nefes efekti)
+        start_breathing(role)
+        
+    except Exception as e:
+        logger.error(f"Kart işleme hatası: {str(e)}")
+        scan_event.processed = False
+        
+        # Hata durumunda sarı göster
+        show_color(role, (255, 255, 0))
+        beep(role, 0.1, 3)  # Üç kısa bip
+    
+    # Olayı kalıcı giden kutusuna kaydet (ağ beklemesi yok)
+    record_event(scan_event.to_dict())
+
+def drop_scan_event(scan_event, reason):
+    """
+    İşlenmeden atılan olayı denetim kaydı için giden kutusuna yazar ve kartı
+    varlık takipçisinde serbest bırakır (alanda duruyorsa yeniden işlenir).
+
+    Args:
+        scan_event: Atılan CardScanEvent
+        reason: Atılma nedeni (DROP_REASON_*)
+    """
+    scan_event.processed = False
+    scan_event.drop_reason = reason
+    record_event(scan_event.to_dict())
+
+    presence = presence_trackers.get(scan_event.role)
+    if presence is not None and reason != DROP_REASON_SHUTDOWN:
+        presence.release(scan_event.uid)
+
+def start_scan_worker(role, lcd_enabled=False):
+    """
+    Okuyucu için sınırlı kuyruk ve işçi thread'i oluşturur (zaten varsa onu döndürür).
+
+    Args:
+        role: Okuyucu rolü
+        lcd_enabled: İşçi sonuçları LCD'de göstersin mi
+
+    Returns:
+        ScanWorker: Okuyucunun işçisi
+    """
+    worker = scan_workers.get(role)
+    if worker is not None:
+        return worker
+    
+    queue = ScanQueue(
+        max_size=int(scan_queue_config.get('max_size', 4)),
+        drop_policy=scan_queue_config.get('drop_policy', DROP_OLDEST),
+        block_timeout=float(scan_queue_config.get('block_timeout', 0.05)),
+        name=role,
+        on_drop=drop_scan_event
+    )
+    worker = ScanWorker(
+        queue,
+        lambda event: process_scan_event(event, lcd_enabled),
+        max_event_age=float(scan_queue_config.get('max_event_age', 5.0)),
+        name=f"{role}-worker"
+    )
+    worker.start()
+    scan_workers[role] = worker
+    return worker
+
+def stop_scan_workers():
+    """Tüm okuyucu işçilerini durdurur ve istatistiklerini loglar"""
+    for role, worker in list(scan_workers.items()):
+        worker.stop()
+        logger.info(f"{role} işçi istatistikleri: {worker.get_stats()}")
+    scan_workers.clear()
+    for role, presence in list(presence_trackers.items()):
+        logger.info(f"{role} kart varlığı istatistikleri: {presence.get_stats()}")
+    for role, ladder in list(recovery_ladders.items()):
+        logger.info(f"{role} kurtarma istatistikleri: {ladder.get_stats()}")
+
+def handle_reader(role, channel, is_inside, lcd_enabled=False, mux_address=None, on_ready=None):
+    """
+    NFC okuyucu yönetimi
+    
+    Args:
+        role: Okuyucu rolü
+        channel: Multiplexer kanalı (kayıtta yoksa kullanılır)
+        is_inside: Okuyucu içeride mi (çıkış kapısı)
+        lcd_enabled: Sonuçlar LCD'de gösterilsin mi
+        mux_address: Multiplexer adresi (kayıtta yoksa kullanılır)
+        on_ready: Okuyucu ilk kez kart okumaya hazır olduğunda çağrılır
+    """
     global i2c
     
+    # Okuyucunun yönlendirme tablosundaki yeri (kayıtta yoksa 1. veri yolunda tek kademe)
+    spec = get_reader(role)
+    if spec is not None:
+        bus_number, path = spec.route
+    else:
+        bus_number = 1
+        path = ((mux_address if mux_address is not None else config.get('multiplexer_address', 0x70), channel),)
+    
+    # Okuyucunun veri yolu hakemi; diğer veri yollarındaki okuyucuları beklemez
+    i2c_bus = get_i2c_bus(bus_number)
+    
+    # Kart bazında bekleme ve varlık takibi (okuyucu yeniden başlatılsa da korunur)
+    presence = presence_trackers.get(role)
+    if presence is None:
+        presence = create_presence_tracker(
+            role, card_presence_config, spec.card_presence if spec is not None else None)
+        presence_trackers[role] = presence
+    
     # LED'i hazırla (başlangıçta sarı)
     from controllers.led_controller import show_color, start_breathing
     
+    # Karar ve geri bildirimleri yürüten işçi (okuyucu yeniden başlatılsa da aynı kalır)
+    scan_worker = start_scan_worker(role, lcd_enabled)
+    
+    reader = None
+    detector = None
+    
+    def make_detector():
+        # Destekleniyorsa donanım otomatik yoklamasını kullan (kart gelene kadar I2C boşta kalır)
+        return create_auto_poll_detector(
+            reader, role,
+            bus_call=lambda func: i2c_bus.run(path, func),
+            settings=auto_poll_config,
+            irq_pin=spec.irq_pin if spec is not None else None
+        )
+    
+    def recover_sam():
+        # Yalnızca SAM yapılandırmasını yeniden gönder
+        i2c_bus.run(path, reader.SAM_configuration, priority=PRIORITY_CONTROL)
+        if detector is not None:
+            detector.disarm()
+    
+    def recover_channel():
+        # Multiplexer kanalını sıfırlayıp yeniden seç, ardından SAM yapılandırması
+        i2c_bus.run(None, lambda: _reselect_path(path, bus_number), priority=PRIORITY_CONTROL)
+        recover_sam()
+    
+    def recover_full():
+        # Okuyucuyu tek seferde yeniden başlat (init_nfc_reader'ın uzun beklemeleri olmadan)
+        nonlocal reader, detector
+        new_reader = _open_reader(role, path, bus_number)
+        if detector is not None:
+            detector.close()
+        reader = new_reader
+        detector = make_detector()
+    
+    # Kademeli kurtarma merdiveni (istatistikler yeniden başlatmalarda korunur)
+    ladder = create_recovery_ladder(
+        role,
+        {STAGE_SAM: recover_sam, STAGE_CHANNEL: recover_channel, STAGE_FULL: recover_full},
+        recovery_config
+    )
+    recovery_ladders[role] = ladder
+    
     # Kalan yeniden başlatma denemesi
     restart_attempts = 5  # Daha fazla deneme hakkı
     
@@ -225,7 +568,7 @@ def handle_reader(role, channel, is_inside, lcd_enabled=False):
         try:
             # NFC okuyucuyu başlatma
             show_color(role, (255, 255, 0))  # Sarı - başlatılıyor
-            reader = init_nfc_reader(role, channel)
+            reader = init_nfc_reader(role, path, bus_number)
             
             # Okuyucu başlatılamadıysa
             if reader is None:
@@ -242,8 +585,17 @@ def handle_reader(role, channel, is_inside, lcd_enabled=False):
             # Başarılı başlatma - nefes efekti başlat
             start_breathing(role)
             
-            # Son kart okuma zamanı
-            last_scan_time = 0
+            detector = make_detector()
+            if detector is not None:
+                logger.info(f"{role} okuyucu InAutoPoll ile kart algılıyor")
+            
+            # İlk başarılı başlatmayı bildir (açılış düzenleyicisi sistemi hazır duruma geçirir)
+            if on_ready is not None:
+                try:
+                    on_ready()
+                except Exception as e:
+                    logger.error(f"{role} hazır bildirimi hatası: {str(e)}")
+                on_ready = None
             
             # Okuma döngüsü - main thread'i aktif tut
             reader_active = True
@@ -251,107 +603,34 @@ def handle_reader(role, channel, is_inside, lcd_enabled=False):
             
             while reader_active:
                 try:
-                    # Multiplexer kanalı seç - birkaç deneme yap
-                    channel_retry = 0
-                    channel_selected = False
-                    
-                    while channel_retry < 3 and not channel_selected:
-                        channel_selected = select_channel(channel)
-                        if not channel_selected:
-                            channel_retry += 1
-                            logger.warning(f"{role} kanalı seçilemedi, tekrar deneniyor ({channel_retry}/3)...")
-                            time.sleep(0.5)
-                    
-                    if not channel_selected:
-                        logger.error(f"{role} multiplexer kanalı seçimi başarısız, 5 saniye bekledikten sonra yeniden deniyorum")
-                        time.sleep(5)
-                        continue
-                    
                     # Kart okuma - hataları daha iyi yönet
                     try:
-                        uid = reader.read_passive_target(timeout=0.1)
+                        # Kanal seçimi ve okuma tek bir hakem işi olarak yapılır
+                        if detector is not None:
+                            uid = detector.read_passive_target(timeout=0.5)
+                        else:
+                            uid = i2c_bus.run(path, lambda: reader.read_passive_target(timeout=0.1))
                         consecutive_errors = 0  # Hatasız okuma, sayacı sıfırla
+                        ladder.success()
                     
-                        # Kart tespit edildi ve soğuma süresi geçti mi?
-                        current_time = time.time()
-                        if uid and (current_time - last_scan_time) > SCAN_COOLDOWN_TIME:
-                            uid_hex = uid.hex()
-                            last_scan_time = current_time
-                            
-                            # Kart okuma olayını oluştur
-                            scan_event = CardScanEvent(uid_hex, role, is_inside)
-                            logger.info(f"{role.upper()} - UID: {uid_hex}")
-                            
-                            # API'ya kart bilgisini gönder
-                            try:
-                                status, response = send_card(uid_hex, is_inside)
-                                scan_event.processed = True
-                                opened = False
-                                
-                                # Başarı durumuna göre renk ve uyarı
-                                if status:
-                                    # API yanıtından kapı durumunu al
-                                    if 'doorOpened' in response and response['doorOpened']:
-                                        opened = True
-                                        scan_event.door_opened = True
-                                        scan_event.success = True
-                                        
-                                        # Yeşil renk göster ve bip sesi çal
-                                        show_color(role, (0, 255, 0))
-                                        beep(role, 0.1, 1)  # Kısa tek bip
-                                        
-                                        # Röleyi tetikle (kapıyı aç)
-                                        try:
-                                            trigger_relay()
-                                            logger.info(f"{role.upper()} - Kapı açıldı")
-                                        except Exception as e:
-                                            logger.error(f"Röle tetikleme hatası: {str(e)}")
-                                    else:
-                                        # Yetkisiz giriş - kırmızı göster ve uzun bip
-                                        scan_event.success = False
-                                        show_color(role, (255, 0, 0))
-                                        beep(role, 0.5, 2)  # Uzun çift bip
-                                        logger.warning(f"{role.upper()} - Yetkisiz kart: {uid_hex}")
-                                else:
-                                    # API hatası - sarı göster
-                                    scan_event.success = False
-                                    show_color(role, (255, 255, 0))
-                                    beep(role, 0.2, 3)  # Üç kısa bip
-                                    logger.error(f"{role.upper()} - API hatası: {response}")
-                                
-                                # LCD'de göster
-                                if lcd_enabled:
-                                    try:
-                                        stop_idle_screen()
-                                        direction = "İçeriden Çıkış" if is_inside else "Dışarıdan Giriş"
-                                        show_scan_result(direction, opened)
-                                        start_idle_screen()
-                                    except Exception as lcd_error:
-                                        logger.error(f"LCD gösterme hatası: {str(lcd_error)}")
-                                
-                                # Okuyucuyu bekleme durumuna getir (nefes efekti)
-                                start_breathing(role)
-                                
-                            except Exception as e:
-                                logger.error(f"Kart işleme hatası: {str(e)}")
-                                scan_event.processed = False
-                                
-                                # Hata durumunda sarı göster
-                                show_color(role, (255, 255, 0))
-                                beep(role, 0.1, 3)  # Üç kısa bip
+                        # Kart geldiyse bir kez işle, alanda kaldıkça tekrar işleme
+                        for event_type, uid_hex in presence.observe(uid.hex() if uid else None):
+                            if event_type == ARRIVED:
+                                # Olayı işçiye bırak ve hemen yoklamaya dön
+                                logger.info(f"{role.upper()} - UID: {uid_hex}")
+                                scan_worker.queue.put(CardScanEvent(uid_hex, role, is_inside))
+                            else:
+                                logger.info(f"{role.upper()} - Kart kaldırıldı: {uid_hex}")
                     
                     except Exception as read_error:
                         consecutive_errors += 1
-                        logger.warning(f"{role} kart okuma hatası: {str(read_error)} ({consecutive_errors} ardışık hata)")
                         
-                        # Çok fazla ardışık hata varsa okuyucuyu yeniden başlat
-                        if consecutive_errors >= 10:
-                            logger.error(f"{role} okuyucu çok fazla hata verdi, yeniden başlatılıyor")
+                        # Sıradaki kurtarma kademesini uygula (kısa, sınırlı bekleme ile)
+                        if not ladder.failure(read_error):
+                            logger.error(f"{role} okuyucu kurtarılamadı ({consecutive_errors} ardışık hata), "
+                                         f"yeniden başlatılıyor")
                             reader_active = False
                             show_color(role, (255, 0, 0))  # Kırmızı - hata
-                        
-                        # Her hatadan sonra biraz bekle
-                        time.sleep(1)
                     
                 except Exception as e:
                     consecutive_errors += 1
@@ -364,6 +643,8 @@ def handle_reader(role, channel, is_inside, lcd_enabled=False):
                     time.sleep(1)
             
             # Okuyucu döngüsünden çıkıldı, yeniden başlatma
+            if detector is not None:
+                detector.close()
             logger.warning(f"{role} okuyucu döngüsü sonlandı, yeniden başlatılıyor")
             
         except Exception as e:
@@ -691,7 +972,7 @@ class NFCReader:
         Returns:
             bytes: Okunan veri veya None (hata durumunda)
         """
-        if self.simulation_mode:
+        if self.simulation_mode and self.pn532 is None:
             # Simülasyon modunda test verisi döndür
             self.logger.info(f"Simülasyon modunda blok {block_number} okunuyor")
             time.sleep(0.2)
@@ -737,7 +1018,7 @@ class NFCReader:
         Returns:
             bool: Başarı durumu
         """
-        if self.simulation_mode:
+        if self.simulation_mode and self.pn532 is None:
             # Simülasyon modunda başarılı olarak işaretle
             self.logger.info(f"Simülasyon modunda blok {block_number}'a veri yazılıyor: {data}")
             time.sleep(0.3)
@@ -779,6 +1060,169 @@ class NFCReader:
             self.logger.error(f"Kart veri yazma hatası: {e}")
             return False
 
+    def read_sectors(self, sectors, key=DEFAULT_KEY, key_type=None, buffer=None):
+        """
+        Birden fazla sektörün veri bloklarını tek bir kart seçimiyle okur.
+        
+        Kart bir kez seçilir, her sektör için bir kez kimlik doğrulanır ve
+        sektörün blokları aynı oturumda art arda, doğrudan önceden ayrılmış
+        tampona okunur (blok başına seçim ve kimlik doğrulama yapılmaz).
+        Sektör trailer'ları ve üretici bloğu okunmaz.
+        
+        Args:
+            sectors: Okunacak sektör numaraları
+            key: Kimlik doğrulama anahtarı (varsayılan: FFFFFFFFFFFFh)
+            key_type: MIFARE_CMD_AUTH_A (varsayılan) veya MIFARE_CMD_AUTH_B
+            buffer: İsteğe bağlı yazılabilir tampon (en az sectors_data_size(sectors)
+                bayt); tekrarlanan okumalarda aynı tampon kullanılabilir
+            
+        Returns:
+            memoryview: Sektör sırasıyla okunan veri veya None (hata durumunda)
+        """
+        sectors = list(sectors)
+        size = sectors_data_size(sectors)
+        if buffer is None:
+            buffer = bytearray(size)
+        view = memoryview(buffer)
+        if view.readonly or view.nbytes < size:
+            raise ValueError(f"Tampon yazılabilir ve en az {size} bayt olmalı")
+        view = view.cast("B")[:size]
+        
+        if self.simulation_mode and self.pn532 is None:
+            # Simülasyon modunda boş veri döndür
+            self.logger.info(f"Simülasyon modunda {sectors} sektörleri okunuyor")
+            time.sleep(0.2)
+            view[:] = bytes(size)
+            return view
+        
+        if self.pn532 is None:
+            self.logger.error("NFC okuyucu başlatılmadı, veri okunamaz")
+            return None
+        
+        key_type = MIFARE_CMD_AUTH_A if key_type is None else key_type
+        
+        try:
+            # Kart okuma (tüm sektörler için tek seçim)
+            uid = self.pn532.read_passive_target(timeout=1.0)
+            if uid is None:
+                self.logger.warning("Kart okunamadı")
+                return None
+            
+            offset = 0
+            for sector in sectors:
+                blocks = sector_data_blocks(sector)
+                
+                # Sektör başına tek kimlik doğrulama
+                if not self.pn532.mifare_classic_authenticate_block(uid, blocks[0], key_type, key):
+                    self.logger.error(f"Sektör {sector} kimlik doğrulaması başarısız")
+                    return None
+                
+                # Bloklar art arda tampona okunur
+                for block in blocks:
+                    data = self.pn532.mifare_classic_read_block(block)
+                    if data is None or len(data) != BLOCK_SIZE:
+                        self.logger.warning(f"Blok {block} okunamadı")
+                        return None
+                    view[offset:offset + BLOCK_SIZE] = data
+                    offset += BLOCK_SIZE
+            
+            self.logger.info(f"{len(sectors)} sektör okundu ({size} bayt)")
+            return view
+        except Exception as e:
+            self.logger.error(f"Kart sektör okuma hatası: {e}")
+            return None
+
+    def read_sector(self, sector, key=DEFAULT_KEY, key_type=None, buffer=None):
+        """
+        Tek bir sektörün veri bloklarını okur (bkz. read_sectors).
+        
+        Returns:
+            memoryview: Okunan veri veya None (hata durumunda)
+        """
+        return self.read_sectors((sector,), key, key_type, buffer)
+
+    def write_sectors(self, sectors, data, key=DEFAULT_KEY, key_type=None):
+        """
+        Veriyi sırasıyla verilen sektörlerin veri bloklarına tek bir kart seçimiyle yazar.
+        
+        Kart bir kez seçilir, her sektör için bir kez kimlik doğrulanır ve
+        bloklar aynı oturumda art arda, verinin kopyası alınmadan yazılır.
+        Yalnızca verinin kapladığı bloklar yazılır; son blok sıfırla
+        doldurulur. Sektör trailer'larına ve üretici bloğuna yazılmaz.
+        
+        Args:
+            sectors: Yazılacak sektör numaraları
+            data: Yazılacak veri (bytes, bytearray veya memoryview)
+            key: Kimlik doğrulama anahtarı (varsayılan: FFFFFFFFFFFFh)
+            key_type: MIFARE_CMD_AUTH_A (varsayılan) veya MIFARE_CMD_AUTH_B
+            
+        Returns:
+            bool: Başarı durumu
+        """
+        sectors = list(sectors)
+        view = memoryview(data).cast("B")
+        capacity = sectors_data_size(sectors)
+        if view.nbytes > capacity:
+            self.logger.error(f"Veri ({view.nbytes} bayt) sektörlerin kapasitesini ({capacity} bayt) aşıyor")
+            return False
+        
+        if self.simulation_mode and self.pn532 is None:
+            # Simülasyon modunda başarılı olarak işaretle
+            self.logger.info(f"Simülasyon modunda {sectors} sektörlerine {view.nbytes} bayt yazılıyor")
+            time.sleep(0.3)
+            return True
+        
+        if self.pn532 is None:
+            self.logger.error("NFC okuyucu başlatılmadı, veri yazılamaz")
+            return False
+        
+        key_type = MIFARE_CMD_AUTH_A if key_type is None else key_type
+        
+        try:
+            # Kart okuma (tüm sektörler için tek seçim)
+            uid = self.pn532.read_passive_target(timeout=1.0)
+            if uid is None:
+                self.logger.warning("Kart okunamadı")
+                return False
+            
+            offset = 0
+            for sector in sectors:
+                if offset >= view.nbytes:
+                    break
+                blocks = sector_data_blocks(sector)
+                
+                # Sektör başına tek kimlik doğrulama
+                if not self.pn532.mifare_classic_authenticate_block(uid, blocks[0], key_type, key):
+                    self.logger.error(f"Sektör {sector} kimlik doğrulaması başarısız")
+                    return False
+                
+                for block in blocks:
+                    if offset >= view.nbytes:
+                        break
+                    chunk = view[offset:offset + BLOCK_SIZE]
+                    if chunk.nbytes < BLOCK_SIZE:
+                        # Son blok sıfırla doldurulur
+                        chunk = bytes(chunk) + b"\x00" * (BLOCK_SIZE - chunk.nbytes)
+                    if not self.pn532.mifare_classic_write_block(block, chunk):
+                        self.logger.error(f"Blok {block}'a yazma başarısız")
+                        return False
+                    offset += BLOCK_SIZE
+            
+            self.logger.info(f"{len(sectors)} sektöre {view.nbytes} bayt yazıldı")
+            return True
+        except Exception as e:
+            self.logger.error(f"Kart sektör yazma hatası: {e}")
+            return False
+
+    def write_sector(self, sector, data, key=DEFAULT_KEY, key_type=None):
+        """
+        Veriyi tek bir sektörün veri bloklarına yazar (bkz. write_sectors).
+        
+        Returns:
+            bool: Başarı durumu
+        """
+        return self.write_sectors((sector,), data, key, key_type)
+
     def _uid_to_hex(self, uid):
         """
         UID'yi okunabilir hex formatına dönüştür
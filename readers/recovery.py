@@ -0,0 +1,240 @@
+"""
+PN532 okuyucuları için kademeli kurtarma merdiveni.
+
+Okuma hatasında okuyucu hemen baştan başlatılmaz; en ucuz adımdan başlanarak
+kademeler sırayla denenir:
+  1. retry   - aynı okumayı kısa bir beklemeden sonra yeniden dene
+  2. sam     - yalnızca SAM yapılandırmasını yeniden gönder
+  3. channel - okuyucunun multiplexer kanalını sıfırlayıp yeniden seç
+  4. full    - okuyucuyu tamamen yeniden başlat
+Her kademenin deneme sayısı ve sınırlı üstel beklemesi vardır. Hatadan ilk
+başarılı okumaya kadar geçen süre, kurtaran kademe bazında histogramda tutulur
+(kademeler tükenip okuyucu baştan başlatıldıysa 'restart' altında).
+"""
+
+import time
+import logging
+
+# Kademe adları (ucuzdan pahalıya)
+STAGE_RETRY = "retry"
+STAGE_SAM = "sam"
+STAGE_CHANNEL = "channel"
+STAGE_FULL = "full"
+STAGES = (STAGE_RETRY, STAGE_SAM, STAGE_CHANNEL, STAGE_FULL)
+
+# Kademeler tükendikten sonra okuyucunun baştan başlatılmasıyla gelen kurtarma
+RESTART = "restart"
+
+# Varsayılan (deneme sayısı, ilk bekleme saniye) değerleri
+DEFAULT_STAGE_SETTINGS = {
+    STAGE_RETRY: (2, 0.02),
+    STAGE_SAM: (2, 0.05),
+    STAGE_CHANNEL: (1, 0.1),
+    STAGE_FULL: (2, 0.5),
+}
+
+# Kurtarma süresi histogramının üst sınırları (saniye)
+RECOVERY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class RecoveryHistogram:
+    """Sabit kovalı süre histogramı"""
+
+    def __init__(self, buckets=RECOVERY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Son kova: en büyük sınırın üstü
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, value):
+        """Bir süreyi histograma ekler"""
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.total += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        labels = [f"<={bound:g}s" for bound in self.buckets] + [f">{self.buckets[-1]:g}s"]
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 1),
+            "buckets": {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+class RecoveryStage:
+    """Kurtarma merdiveninin tek bir kademesi"""
+
+    def __init__(self, name, action, attempts=1, backoff=0.05, max_backoff=2.0):
+        """
+        Args:
+            name: Kademe adı
+            action: Argümansız çağrılacak kurtarma işlemi (None ise yalnızca beklenir)
+            attempts: Bu kademede yapılacak en fazla deneme
+            backoff: İlk denemeden önceki bekleme (saniye, her denemede iki katına çıkar)
+            max_backoff: Bekleme üst sınırı (saniye)
+        """
+        self.name = name
+        self.action = action
+        self.attempts = max(0, int(attempts))
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        # İstatistikler
+        self.runs = 0
+        self.failures = 0
+        self.recoveries = 0
+
+
+class RecoveryLadder:
+    """
+    Ardışık okuma hatalarında kademeleri sırayla uygulayan kurtarma merdiveni.
+    Okuyucu thread'ine özeldir (kilit kullanmaz).
+    """
+
+    def __init__(self, stages, name="nfc"):
+        """
+        Args:
+            stages: Ucuzdan pahalıya RecoveryStage listesi
+            name: Log mesajlarında kullanılacak ad
+        """
+        self.logger = logging.getLogger(__name__)
+        self.stages = [stage for stage in stages if stage.attempts > 0]
+        self.name = name
+
+        # Devam eden arıza durumu
+        self.incident_started = None
+        self.stage_index = 0
+        self.stage_attempts = 0
+        self.last_stage = None
+
+        # İstatistikler
+        self.incidents = 0
+        self.exhausted = 0
+        self.histograms = {stage.name: RecoveryHistogram() for stage in self.stages}
+        self.histograms[RESTART] = RecoveryHistogram()
+
+    def failure(self, error=None):
+        """
+        Bir okuma hatasını işler: sıradaki kademeyi bekleyip uygular.
+
+        Args:
+            error: Okuma hatası (log için)
+
+        Returns:
+            bool: Okumaya devam edilebilirse True, tüm kademeler tükendiyse False
+                (çağıran okuyucuyu baştan başlatmalıdır)
+        """
+        if self.incident_started is None:
+            self.incident_started = time.monotonic()
+            self.stage_index = 0
+            self.stage_attempts = 0
+            self.incidents += 1
+
+        # Denemesi biten kademeden sonrakine geç
+        while self.stage_index < len(self.stages) and \
+                self.stage_attempts >= self.stages[self.stage_index].attempts:
+            self.stage_index += 1
+            self.stage_attempts = 0
+
+        if self.stage_index >= len(self.stages):
+            self.exhausted += 1
+            elapsed = time.monotonic() - self.incident_started
+            self.logger.error(f"{self.name} kurtarma kademeleri {elapsed:.1f} sn içinde tükendi "
+                              f"(son hata: {error})")
+            # Arıza açık kalır; baştan başlatılan okuyucu ilk okumada 'restart' olarak kaydedilir
+            self.stage_index = 0
+            self.stage_attempts = 0
+            self.last_stage = RESTART
+            return False
+
+        stage = self.stages[self.stage_index]
+        delay = min(stage.max_backoff, stage.backoff * (2 ** self.stage_attempts))
+        self.stage_attempts += 1
+        stage.runs += 1
+        self.last_stage = stage.name
+        self.logger.warning(f"{self.name} okuma hatası, kurtarma kademesi '{stage.name}' "
+                            f"{self.stage_attempts}/{stage.attempts} ({delay * 1000:.0f} ms sonra): {error}")
+
+        if delay:
+            time.sleep(delay)
+        if stage.action is not None:
+            try:
+                stage.action()
+            except Exception as e:
+                # Kademe başarısız; bir sonraki hata sıradaki denemeyi tetikler
+                stage.failures += 1
+                self.logger.warning(f"{self.name} kurtarma kademesi '{stage.name}' başarısız: {str(e)}")
+        return True
+
+    def success(self):
+        """Başarılı bir okumayı işler; devam eden arıza varsa kurtarma süresini kaydeder"""
+        if self.incident_started is None:
+            return
+        elapsed = time.monotonic() - self.incident_started
+        self.incident_started = None
+        if self.last_stage is None:
+            return
+        for stage in self.stages:
+            if stage.name == self.last_stage:
+                stage.recoveries += 1
+        self.histograms[self.last_stage].record(elapsed)
+        self.logger.info(f"{self.name} okuyucu '{self.last_stage}' kademesiyle "
+                         f"{elapsed * 1000:.0f} ms içinde kurtarıldı")
+        self.last_stage = None
+
+    def get_stats(self):
+        """
+        Kurtarma istatistiklerini döndürür.
+
+        Returns:
+            dict: Arıza ve tükenme sayıları ile kademe bazında deneme, başarısızlık,
+                kurtarma sayıları ve kurtarma süresi histogramları
+        """
+        return {
+            "incidents": self.incidents,
+            "exhausted": self.exhausted,
+            "restart_time_to_recover": self.histograms[RESTART].to_dict(),
+            "stages": {
+                stage.name: {
+                    "runs": stage.runs,
+                    "failures": stage.failures,
+                    "recoveries": stage.recoveries,
+                    "time_to_recover": self.histograms[stage.name].to_dict()
+                }
+                for stage in self.stages
+            }
+        }
+
+
+def create_recovery_ladder(role, actions, settings=None):
+    """
+    Yapılandırmaya göre bir okuyucu için kurtarma merdiveni oluşturur.
+
+    Args:
+        role: Okuyucu rolü
+        actions: Kademe adı -> kurtarma işlemi sözlüğü
+        settings: 'nfc_recovery' yapılandırma bölümü
+
+    Returns:
+        RecoveryLadder: Okuyucunun kurtarma merdiveni
+    """
+    settings = settings or {}
+    max_backoff = float(settings.get('max_backoff', 2.0))
+    stages = []
+    for name in STAGES:
+        attempts, backoff = DEFAULT_STAGE_SETTINGS[name]
+        stage_settings = settings.get(name) or {}
+        stages.append(RecoveryStage(
+            name,
+            actions.get(name),
+            attempts=int(stage_settings.get('attempts', attempts)),
+            backoff=float(stage_settings.get('backoff', backoff)),
+            max_backoff=max_backoff
+        ))
+    return RecoveryLadder(stages, name=role)
@@ -0,0 +1,226 @@
+"""
+Yapılandırmadan okunan NFC okuyucu kaydı.
+
+Her okuyucu için I2C veri yolu, multiplexer adresi ve kanalı (kademeli
+bağlantıda üstteki multiplexer'lar dahil), yönü ile LED, buzzer, röle ve IRQ
+bağlantıları config.yaml'daki 'readers' listesinden okunur. Liste yoksa eski
+iki okuyuculu düzen (nfc_channels, led_pins, buzzer_pins) kullanılır.
+
+Örnek:
+    readers:
+      - name: inside
+        channel: 0
+        mux_address: 0x70   # isteğe bağlı, varsayılan multiplexer_address
+        bus: 1              # isteğe bağlı, I2C veri yolu numarası
+        upstream: []        # isteğe bağlı, kademeli bağlantı: [[0x70, 7]] = 0x70'in 7. kanalı arkasında
+        is_inside: true
+        lcd: false
+        led_pin: 18
+        buzzer_pin: 23
+        relay: {type: usb, id: "ABCDE_1"}   # isteğe bağlı, varsayılan 'relay' bölümü
+        irq_pin: null
+        card_presence: {reader_cooldown: 0.2}   # isteğe bağlı, 'card_presence' bölümünü ezer
+"""
+
+import logging
+import threading
+import yaml
+
+from readers.multiplexer import CHANNELS_PER_MUX, format_path
+
+# Eski düzen için varsayılan pinler (README'deki bağlantılar)
+LEGACY_LED_PINS = {"inside": 18, "outside": 12}
+LEGACY_BUZZER_PINS = {"inside": 23, "outside": 24}
+
+
+class ReaderSpec:
+    """Tek bir okuyucunun kimliği, konumu ve geri bildirim bağlantıları"""
+
+    def __init__(self, name, channel, mux_address, is_inside, lcd=False, led_pin=None,
+                 buzzer_pin=None, relay_type=None, relay_id=None, irq_pin=None, bus=1, upstream=(),
+                 card_presence=None):
+        self.name = name
+        self.channel = channel
+        self.mux_address = mux_address
+        self.bus = bus
+        self.upstream = tuple(upstream)
+        self.is_inside = is_inside
+        self.lcd = lcd
+        self.led_pin = led_pin
+        self.buzzer_pin = buzzer_pin
+        self.relay_type = relay_type
+        self.relay_id = relay_id
+        self.irq_pin = irq_pin
+        self.card_presence = card_presence or {}
+
+    @property
+    def path(self):
+        """Kök multiplexer'dan okuyucuya giden yol: ((multiplexer adresi, kanal), ...)"""
+        return self.upstream + ((self.mux_address, self.channel),)
+
+    @property
+    def route(self):
+        """Okuyucunun yönlendirme tablosundaki yeri: (veri yolu, yol)"""
+        return (self.bus, self.path)
+
+    def __repr__(self):
+        return (f"ReaderSpec({self.name!r}, i2c-{self.bus} {format_path(self.path)}, "
+                f"{'çıkış' if self.is_inside else 'giriş'})")
+
+
+def _legacy_readers(config, default_mux, relay_config):
+    """Eski iki okuyuculu yapılandırmayı ReaderSpec listesine çevirir"""
+    channels = config.get('nfc_channels') or {"inside": 0, "outside": 1}
+    led_pins = config.get('led_pins') or LEGACY_LED_PINS
+    buzzer_pins = config.get('buzzer_pins') or LEGACY_BUZZER_PINS
+    irq_pins = (config.get('nfc_auto_poll') or {}).get('irq_pins') or {}
+
+    return [
+        ReaderSpec(
+            name, channel, default_mux,
+            is_inside=(name == "inside"),
+            lcd=(name == "outside"),
+            led_pin=led_pins.get(name, LEGACY_LED_PINS.get(name)),
+            buzzer_pin=buzzer_pins.get(name, LEGACY_BUZZER_PINS.get(name)),
+            relay_type=relay_config.get('type', 'usb'),
+            relay_id=relay_config.get('id'),
+            irq_pin=irq_pins.get(name)
+        )
+        for name, channel in channels.items()
+    ]
+
+
+def build_registry(config):
+    """
+    Yapılandırmadan okuyucu listesini oluşturur ve doğrular.
+
+    Args:
+        config: config.yaml içeriği
+
+    Returns:
+        list: ReaderSpec listesi
+
+    Raises:
+        ValueError: Ad veya kanal çakışması, geçersiz kanal ya da tutarsız kademeli
+            bağlantı varsa
+    """
+    default_mux = int(config.get('multiplexer_address', 0x70))
+    relay_config = config.get('relay', {}) or {}
+    entries = config.get('readers')
+
+    if not entries:
+        readers = _legacy_readers(config, default_mux, relay_config)
+    else:
+        readers = []
+        for entry in entries:
+            relay = entry.get('relay') or {}
+            readers.append(ReaderSpec(
+                entry['name'],
+                int(entry['channel']),
+                int(entry.get('mux_address', default_mux)),
+                is_inside=bool(entry.get('is_inside', False)),
+                lcd=bool(entry.get('lcd', False)),
+                led_pin=entry.get('led_pin'),
+                buzzer_pin=entry.get('buzzer_pin'),
+                relay_type=relay.get('type', relay_config.get('type', 'usb')),
+                relay_id=relay.get('id', relay_config.get('id')),
+                irq_pin=entry.get('irq_pin'),
+                bus=int(entry.get('bus', 1)),
+                upstream=tuple((int(mux), int(channel)) for mux, channel in entry.get('upstream') or ()),
+                card_presence=entry.get('card_presence')
+            ))
+
+    # Doğrulama: benzersiz adlar, geçerli ve çakışmayan kanallar
+    names = set()
+    lcd_route = lcd_route_from_config(config)
+    used = {lcd_route: "lcd"}
+    upstream_of = {}  # (veri yolu, multiplexer adresi) -> önündeki yol
+    feeds = set()     # Arkasında multiplexer olan (veri yolu, yol) kademeleri
+    for spec in readers:
+        if spec.name in names:
+            raise ValueError(f"Okuyucu adı birden fazla kez tanımlı: {spec.name}")
+        names.add(spec.name)
+
+        for mux, channel in spec.path:
+            if not 0 <= channel < CHANNELS_PER_MUX:
+                raise ValueError(f"{spec.name} okuyucusu için geçersiz kanal: {channel}")
+        if spec.route in used:
+            raise ValueError(f"{spec.name} okuyucusu i2c-{spec.bus} {format_path(spec.path)} kanalını "
+                             f"{used[spec.route]} ile paylaşıyor")
+        used[spec.route] = spec.name
+
+        # Aynı adresli multiplexer bir veri yolunda tek bir yerde bulunabilir
+        for depth, (mux, _) in enumerate(spec.path):
+            upstream = spec.path[:depth]
+            known = upstream_of.setdefault((spec.bus, mux), upstream)
+            if known != upstream:
+                raise ValueError(f"{spec.name}: i2c-{spec.bus} 0x{mux:02x} multiplexer'ı farklı "
+                                 f"yollar üzerinde tanımlı ({format_path(known) or 'kök'} / "
+                                 f"{format_path(upstream) or 'kök'})")
+            if depth:
+                feeds.add((spec.bus, upstream))
+
+    # Arkasında multiplexer olan kanala ayrıca cihaz bağlanamaz
+    for route, name in used.items():
+        if route in feeds:
+            raise ValueError(f"{name}: i2c-{route[0]} {format_path(route[1])} kanalı kademeli "
+                             f"multiplexer için kullanılıyor")
+
+    return readers
+
+
+def lcd_route_from_config(config):
+    """
+    LCD'nin yönlendirme tablosundaki yerini döndürür.
+
+    Args:
+        config: config.yaml içeriği
+
+    Returns:
+        tuple: (veri yolu, ((multiplexer adresi, kanal),))
+    """
+    default_mux = int(config.get('multiplexer_address', 0x70))
+    lcd_mux = int(config.get('lcd_mux_address', default_mux))
+    return (int(config.get('lcd_bus', 1)), ((lcd_mux, int(config.get('lcd_channel', 2))),))
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_readers():
+    """
+    Yapılandırılmış okuyucuların listesini döndürür (ilk çağrıda config.yaml okunur).
+
+    Returns:
+        list: ReaderSpec listesi
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            logger = logging.getLogger(__name__)
+            try:
+                with open("config/config.yaml") as f:
+                    config = yaml.safe_load(f) or {}
+            except Exception as e:
+                logger.error(f"Config dosyası yüklenemedi: {str(e)}")
+                config = {}
+            _registry = build_registry(config)
+            logger.info(f"{len(_registry)} okuyucu yapılandırıldı: {_registry}")
+        return list(_registry)
+
+
+def get_reader(name):
+    """
+    Adı verilen okuyucunun tanımını döndürür.
+
+    Args:
+        name: Okuyucu adı (rol)
+
+    Returns:
+        ReaderSpec: Okuyucu tanımı veya bulunamazsa None
+    """
+    for spec in get_readers():
+        if spec.name == name:
+            return spec
+    return None
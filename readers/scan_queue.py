@@ -0,0 +1,272 @@
+"""
+Kart algılama ile karar/geri bildirim işlemlerini ayıran sınırlı iş kuyruğu.
+
+Okuyucu thread'i yalnızca UID algılar ve CardScanEvent'leri kuyruğa bırakır;
+her okuyucunun işçi thread'i kararı alır ve LED, buzzer, röle ve LCD geri
+bildirimlerini yürütür. Böylece okuyucu birkaç milisaniye içinde yoklamaya
+geri döner.
+
+Kuyruk dolduğu, süresi dolduğu veya kapanışta işlenmeden kalan olaylar
+sessizce atılmaz; on_drop ile (olay, neden) bildirilir ki denetim kaydına
+işlenmemiş olarak yazılabilsin.
+"""
+
+import time
+import threading
+import logging
+from collections import deque
+
+# Kuyruk doluyken uygulanacak politikalar
+DROP_OLDEST = "drop_oldest"  # En eski olay atılır, yeni olay eklenir
+DROP_NEWEST = "drop_newest"  # Yeni olay atılır
+BLOCK = "block"              # Yer açılana kadar block_timeout kadar beklenir, sonra yeni olay atılır
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+# İşlenmeden atılan olayların nedenleri (on_drop'a verilir)
+DROP_REASON_QUEUE_FULL = "queue_full"  # Kuyruk doluydu
+DROP_REASON_EXPIRED = "expired"        # Kuyrukta max_event_age'den uzun bekledi
+DROP_REASON_SHUTDOWN = "shutdown"      # İşçi durdurulurken kuyrukta kaldı
+
+
+class ScanQueue:
+    """
+    Sabit kapasiteli, yapılandırılabilir taşma politikalı olay kuyruğu (thread-safe).
+    """
+
+    def __init__(self, max_size=4, drop_policy=DROP_OLDEST, block_timeout=0.05, name="scan", on_drop=None):
+        """
+        Kuyruğu başlat.
+
+        Args:
+            max_size: Kuyrukta bekleyebilecek en fazla olay
+            drop_policy: Kuyruk doluyken politika (drop_oldest | drop_newest | block)
+            block_timeout: 'block' politikasında en fazla bekleme süresi (saniye)
+            name: Log mesajlarında kullanılacak ad
+            on_drop: on_drop(olay, neden) - kuyruk dolu olduğu için atılan olaylar
+                için çağrılır (kilit dışında)
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Geçersiz kuyruk politikası: {drop_policy}")
+
+        self.logger = logging.getLogger(__name__)
+        self.max_size = max(1, int(max_size))
+        self.drop_policy = drop_policy
+        self.block_timeout = block_timeout
+        self.name = name
+        self.on_drop = on_drop
+        self._items = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        # İstatistikler
+        self.enqueued = 0
+        self.dropped = 0
+        self.peak_depth = 0
+
+    def put(self, item):
+        """
+        Olayı kuyruğa ekler; hiçbir durumda block_timeout'tan uzun beklemez.
+
+        Args:
+            item: Kuyruğa eklenecek olay
+
+        Returns:
+            bool: Olay kuyruğa eklendiyse True, atıldıysa False
+        """
+        dropped = None
+        try:
+            with self._condition:
+                if len(self._items) >= self.max_size:
+                    if self.drop_policy == DROP_OLDEST:
+                        dropped = self._items.popleft()[1]
+                        self._drop(dropped, "en eski olay atıldı")
+                    elif self.drop_policy == DROP_NEWEST:
+                        dropped = item
+                        self._drop(item, "yeni olay atıldı")
+                        return False
+                    else:
+                        deadline = time.monotonic() + self.block_timeout
+                        while len(self._items) >= self.max_size and not self._closed:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._condition.wait(remaining)
+                        if len(self._items) >= self.max_size:
+                            dropped = item
+                            self._drop(item, "bekleme süresi doldu, yeni olay atıldı")
+                            return False
+
+                self._items.append((time.monotonic(), item))
+                self.enqueued += 1
+                self.peak_depth = max(self.peak_depth, len(self._items))
+                self._condition.notify_all()
+                return True
+        finally:
+            # Bildirim kilit dışında yapılır; okuyucu thread'i diğer put/get çağrılarını bekletmez
+            if dropped is not None:
+                self.notify_drop(dropped, DROP_REASON_QUEUE_FULL)
+
+    def _drop(self, item, reason):
+        """Atılan olayı sayar ve loglar (kilit tutulurken çağrılır)"""
+        self.dropped += 1
+        self.logger.warning(f"{self.name} kuyruğu dolu ({self.max_size}), {reason}: "
+                            f"{getattr(item, 'uid', item)}")
+
+    def notify_drop(self, item, reason):
+        """
+        İşlenmeden atılan olayı on_drop'a bildirir (hata fırlatmaz).
+
+        Args:
+            item: Atılan olay
+            reason: Atılma nedeni (DROP_REASON_*)
+        """
+        if self.on_drop is None:
+            return
+        try:
+            self.on_drop(item, reason)
+        except Exception as e:
+            self.logger.error(f"{self.name}: atılan olay bildirilemedi: {str(e)}")
+
+    def get(self, timeout=None):
+        """
+        Sıradaki olayı alır.
+
+        Args:
+            timeout: En fazla bekleme süresi (saniye, None ise süresiz)
+
+        Returns:
+            tuple: (kuyrukta bekleme süresi (saniye), olay) veya zaman aşımında/kapanışta None
+        """
+        with self._condition:
+            if not self._items and not self._closed:
+                self._condition.wait(timeout)
+            if not self._items:
+                return None
+            enqueued_at, item = self._items.popleft()
+            self._condition.notify_all()
+            return time.monotonic() - enqueued_at, item
+
+    def drain(self):
+        """
+        Kuyruktaki tüm olayları çıkarır.
+
+        Returns:
+            list: Kuyrukta kalan olaylar (eklenme sırasıyla)
+        """
+        with self._condition:
+            items = [item for _, item in self._items]
+            self._items.clear()
+            self._condition.notify_all()
+            return items
+
+    def close(self):
+        """Kuyruğu kapatır ve bekleyen thread'leri uyandırır"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
+
+    def get_stats(self):
+        """
+        Kuyruk istatistiklerini döndürür.
+
+        Returns:
+            dict: Anlık derinlik, eklenen, atılan olay sayıları ve en yüksek derinlik
+        """
+        with self._condition:
+            return {
+                "depth": len(self._items),
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "peak_depth": self.peak_depth
+            }
+
+
+class ScanWorker:
+    """
+    Kuyruktaki olayları sırayla işleyen işçi thread'i.
+    """
+
+    def __init__(self, scan_queue, handler, max_event_age=5.0, name="scan-worker"):
+        """
+        İşçiyi başlat.
+
+        Args:
+            scan_queue: Olayların alınacağı ScanQueue
+            handler: handler(olay) - karar ve geri bildirimi yürüten fonksiyon
+            max_event_age: Bu süreden uzun kuyrukta bekleyen olaylar işlenmeden atılır
+                (saniye, 0 ise sınır yok); kişi kapıdan ayrıldıktan sonra kapı açılmasın diye.
+                Atılan olaylar kuyruğun on_drop'una bildirilir
+            name: Thread adı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.queue = scan_queue
+        self.handler = handler
+        self.max_event_age = max_event_age
+        self.name = name
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        # İstatistikler
+        self.processed = 0
+        self.expired = 0
+        self.failed = 0
+        self.max_wait_ms = 0.0
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            entry = self.queue.get(timeout=0.5)
+            if entry is None:
+                continue
+
+            waited, event = entry
+            self.max_wait_ms = max(self.max_wait_ms, waited * 1000)
+            if self.max_event_age and waited > self.max_event_age:
+                self.expired += 1
+                self.logger.warning(f"{self.name}: {waited:.1f} sn bekleyen olay işlenmeden atıldı: "
+                                    f"{getattr(event, 'uid', event)}")
+                self.queue.notify_drop(event, DROP_REASON_EXPIRED)
+                continue
+
+            try:
+                self.handler(event)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"{self.name}: olay işleme hatası: {str(e)}")
+
+    def start(self):
+        """İşçi thread'ini başlatır"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=1.0):
+        """İşçi thread'ini durdurur; kuyrukta kalan olaylar on_drop'a bildirilir"""
+        self.stop_event.set()
+        self.queue.close()
+        if self.thread:
+            self.thread.join(timeout=timeout)
+        for event in self.queue.drain():
+            self.queue.notify_drop(event, DROP_REASON_SHUTDOWN)
+
+    def get_stats(self):
+        """
+        İşçi ve kuyruk istatistiklerini döndürür.
+
+        Returns:
+            dict: İşlenen, süresi dolan ve hatalı olay sayıları, en uzun bekleme ve kuyruk durumu
+        """
+        stats = self.queue.get_stats()
+        stats.update({
+            "processed": self.processed,
+            "expired": self.expired,
+            "failed": self.failed,
+            "max_wait_ms": round(self.max_wait_ms, 1)
+        })
+        return stats
@@ -0,0 +1,270 @@
+"""
+Kapı erişim kararlarını veren modül.
+API çağrısının önüne yerel karar katmanlarını (izin listesi, önbellek vb.) yerleştirir.
+"""
+
+import logging
+import yaml
+from utils.api_client import send_card, fetch_allowlist, fetch_allowlist_changes, fetch_revocations
+from utils.decision_cache import DecisionCache, CacheRefresher
+from utils.allowlist import AllowlistStore, AllowlistSync
+from utils.revocation_filter import RevocationFilter, RevocationSync
+from utils.simulation import is_simulation_mode
+from utils.singleflight import SingleFlight
+
+# Logger kurulumu
+logger = logging.getLogger(__name__)
+
+try:
+    with open("config/config.yaml") as f:
+        config = yaml.safe_load(f)
+except Exception as e:
+    logger.error(f"Config dosyası yüklenemedi: {str(e)}")
+    config = {}
+
+# Karar önbelleği
+cache_config = config.get('decision_cache', {}) or {}
+if cache_config.get('enabled', True):
+    decision_cache = DecisionCache(
+        max_entries=int(cache_config.get('max_entries', 512)),
+        grant_ttl=float(cache_config.get('grant_ttl', 60)),
+        deny_ttl=float(cache_config.get('deny_ttl', 10)),
+        stale_ttl=float(cache_config.get('stale_ttl', 3600))
+    )
+else:
+    decision_cache = None
+
+# API'ye ulaşılamadığında uygulanacak karar politikası:
+#   deny       - kapı açılmaz, API hatası bildirilir
+#   cached     - önbellekteki (süresi dolmuş olsa da) son karar kullanılır
+#   allow_exit - içeriden çıkışlara izin verilir, girişler reddedilir
+FALLBACK_POLICY = (config.get('api', {}) or {}).get('fallback_policy', 'deny')
+if FALLBACK_POLICY not in ('deny', 'cached', 'allow_exit'):
+    logger.error(f"Geçersiz yedek karar politikası: {FALLBACK_POLICY}, 'deny' kullanılıyor")
+    FALLBACK_POLICY = 'deny'
+
+# Erişim modu: "online" (her kart için API) veya "offline_first" (yerel izin listesi)
+ACCESS_MODE = config.get('access_mode', 'online')
+allowlist_config = config.get('allowlist', {}) or {}
+allowlist_store = None
+allowlist_sync = None
+
+if ACCESS_MODE == 'offline_first':
+    allowlist_store = AllowlistStore(allowlist_config.get('path', 'data/allowlist.bin'))
+    allowlist_store.load()
+elif ACCESS_MODE != 'online':
+    logger.error(f"Geçersiz erişim modu: {ACCESS_MODE}, 'online' kullanılıyor")
+    ACCESS_MODE = 'online'
+
+# İptal edilen kartlar için kompakt filtre (önbellek ve izin listesi kararlarından önce bakılır)
+revocation_config = config.get('revocation', {}) or {}
+revocation_filter = None
+revocation_sync = None
+
+if revocation_config.get('enabled', True):
+    revocation_filter = RevocationFilter(revocation_config.get('path', 'data/revocations.bin'))
+    revocation_filter.load()
+
+def start_allowlist_sync():
+    """
+    Çevrimdışı öncelikli modda izin listesinin periyodik senkronizasyonunu başlatır.
+
+    Returns:
+        bool: Senkronizasyon başlatıldıysa True; çevrimiçi modda veya simülasyonda
+            (bilerek başlatılmadıysa) None
+    """
+    global allowlist_sync
+
+    if allowlist_store is None:
+        return None
+
+    if is_simulation_mode():
+        logger.info("Simülasyon modunda izin listesi senkronizasyonu yapılmıyor")
+        return None
+
+    allowlist_sync = AllowlistSync(
+        allowlist_store,
+        fetch_allowlist,
+        fetch_allowlist_changes if allowlist_config.get('delta_sync', True) else None,
+        interval=float(allowlist_config.get('sync_interval', 300))
+    )
+    allowlist_sync.start()
+    return True
+
+def stop_allowlist_sync():
+    """İzin listesi senkronizasyonunu durdurur"""
+    if allowlist_sync is not None:
+        allowlist_sync.stop()
+
+def start_revocation_sync():
+    """
+    İptal filtresinin periyodik senkronizasyonunu başlatır.
+
+    Returns:
+        bool: Senkronizasyon başlatıldıysa True; filtre devre dışıysa veya
+            simülasyonda (bilerek başlatılmadıysa) None
+    """
+    global revocation_sync
+
+    if revocation_filter is None:
+        return None
+
+    if is_simulation_mode():
+        logger.info("Simülasyon modunda iptal filtresi senkronizasyonu yapılmıyor")
+        return None
+
+    revocation_sync = RevocationSync(
+        revocation_filter,
+        fetch_revocations,
+        interval=float(revocation_config.get('sync_interval', 60))
+    )
+    revocation_sync.start()
+    return True
+
+def stop_revocation_sync():
+    """İptal filtresi senkronizasyonunu durdurur"""
+    if revocation_sync is not None:
+        revocation_sync.stop()
+        logger.info(f"İptal filtresi istatistikleri: {revocation_filter.get_stats()}")
+
+# Aynı (UID, yön) için uçuştaki API isteklerini birleştirir
+card_lookups = SingleFlight()
+
+def _lookup_card(uid, is_inside):
+    """
+    Kartı API'ye sorar. Aynı kart ve yön için eşzamanlı sorgular tek bir
+    isteği paylaşır; her çağırana yanıtın ayrı bir kopyası döner.
+    """
+    (status, response), shared = card_lookups.do((uid, is_inside), send_card, uid, is_inside)
+    if shared:
+        logger.debug(f"Eşzamanlı kart sorgusu birleştirildi: {uid}")
+    return status, dict(response) if response is not None else None
+
+def is_door_opened(response):
+    """API yanıtında kapının açıldığı bilgisini döndürür"""
+    return bool(response and response.get('doorOpened'))
+
+def _notify_server(uid, is_inside):
+    """Önbellekten verilen kararı API'ye bildirir ve önbelleği tazeler"""
+    try:
+        status, response = _lookup_card(uid, is_inside)
+        if status == 200 and response is not None:
+            decision_cache.put(uid, is_inside, is_door_opened(response), response)
+        else:
+            logger.warning(f"Önbellekli karar API'ye bildirilemedi ({uid}): {status} {response}")
+    except Exception as e:
+        logger.error(f"Önbellekli karar bildirim hatası ({uid}): {str(e)}")
+
+# Önbellekten verilen kararların API'ye bildirimi (tek thread, sınırlı kuyruk)
+cache_refresher = None
+if decision_cache is not None:
+    cache_refresher = CacheRefresher(
+        _notify_server,
+        max_pending=int(cache_config.get('max_pending_refresh', 32))
+    )
+
+def stop_cache_refresher():
+    """Önbellek bildirim thread'ini durdurur"""
+    if cache_refresher is not None:
+        cache_refresher.stop()
+        logger.info(f"Karar önbelleği bildirim istatistikleri: {cache_refresher.get_stats()}")
+
+def _fallback_decision(uid, is_inside, status, response):
+    """
+    API karar veremediğinde yapılandırılmış yedek politikayı uygular.
+
+    Returns:
+        tuple: (HTTP durum kodu, yanıt sözlüğü)
+    """
+    opened = None
+    if FALLBACK_POLICY == 'cached' and decision_cache is not None:
+        cached = decision_cache.get(uid, is_inside, allow_stale=True)
+        if cached is not None:
+            opened = cached[0]
+    elif FALLBACK_POLICY == 'allow_exit':
+        opened = bool(is_inside)
+
+    if opened is None:
+        # deny politikası veya önbellekte kayıt yok - API hatası olduğu gibi döner
+        return status, response
+
+    logger.warning(f"API kullanılamıyor ({status}), yedek politika '{FALLBACK_POLICY}' uygulandı: "
+                   f"{uid} -> {'açık' if opened else 'kapalı'}")
+    return 200, {
+        "doorOpened": opened,
+        "source": "fallback",
+        "fallbackPolicy": FALLBACK_POLICY,
+        "apiStatus": status
+    }
+
+def get_door_decision(uid, is_inside):
+    """
+    Kart için kapı kararını verir.
+
+    Kart iptal filtresinde ise yerel karar katmanlarına bakılmadan hemen
+    reddedilir. Çevrimdışı öncelikli modda ve izin listesi yüklüyse karar yerel olarak
+    verilir; API'ye ayrıca bildirilmez, olay yanıttaki 'source' ile birlikte giden
+    kutusu üzerinden kaydedilir.
+    Önbellekte geçerli bir karar varsa kopyası hemen döndürülür ve API'ye tek
+    bir arka plan thread'inin sınırlı kuyruğu üzerinden bildirilir; yoksa karar API'den alınır ve önbelleğe yazılır.
+
+    Args:
+        uid: Kart UID'si (hex)
+        is_inside: İçeriden çıkış ise True
+
+    Returns:
+        tuple: (HTTP durum kodu, yanıt sözlüğü) - send_card ile aynı biçimde
+    """
+    if revocation_filter is not None and revocation_filter.is_revoked(uid):
+        logger.warning(f"İptal edilmiş kart reddedildi: {uid}")
+        if decision_cache is not None:
+            decision_cache.invalidate(uid)
+        # Ret, sunucuya kapı durumu isteği gönderilmeden giden kutusuna 'revocation' kaynağıyla yazılır
+        return 200, {
+            "doorOpened": False,
+            "source": "revocation",
+            "revocationVersion": revocation_filter.version
+        }
+
+    if allowlist_store is not None and allowlist_store.is_ready:
+        # Olay, yerel kararla birlikte giden kutusu üzerinden kaydedilir
+        opened = allowlist_store.is_allowed(uid, is_inside)
+        return 200, {
+            "doorOpened": opened,
+            "source": "allowlist",
+            "allowlistVersion": allowlist_store.version
+        }
+
+    if decision_cache is not None:
+        cached = decision_cache.get(uid, is_inside)
+        if cached is not None:
+            granted, response = cached
+            logger.debug(f"Önbellekten karar: {uid} -> {'açık' if granted else 'kapalı'}")
+            cache_refresher.submit(uid, is_inside)
+            return 200, dict(response, cached=True, source="cache")
+
+    status, response = _lookup_card(uid, is_inside)
+
+    if status == 200 and response is not None:
+        if decision_cache is not None:
+            decision_cache.put(uid, is_inside, is_door_opened(response), response)
+    elif status is None or status >= 500:
+        # Zaman aşımı, devre kesici açık veya sunucu hatası
+        return _fallback_decision(uid, is_inside, status, response)
+
+    return status, response
+
+def invalidate_card(uid, is_inside=None):
+    """
+    Bir kartın önbellekteki kararını geçersiz kılar (ör. yetki iptali sonrası).
+
+    Args:
+        uid: Kart UID'si (hex)
+        is_inside: Sadece bu yönü sil (None ise her iki yön)
+
+    Returns:
+        int: Silinen kayıt sayısı
+    """
+    if decision_cache is None:
+        return 0
+    return decision_cache.invalidate(uid, is_inside)
@@ -0,0 +1,342 @@
+"""
+Çevrimdışı öncelikli çalışma için yerel izin listesi (allowlist).
+Sunucudan ilk seferde tam bir anlık görüntü, sonrasında yalnızca değişiklikler
+(ETag / If-None-Match ve değişiklik imleci ile) indirilir. Liste diskte
+kompakt bir ikili indeks olarak saklanır ve başlangıçta belleğe yüklenir.
+"""
+
+import os
+import struct
+import time
+import threading
+import logging
+
+# İkili indeks dosya biçimi
+#   başlık : MAGIC (4 bayt) | biçim sürümü (u16) | sürüm, ETag, imleç (her biri u16 uzunluk + utf-8)
+#            | kayıt sayısı (u32)
+#   kayıt  : UID uzunluğu (u8) | UID baytları | yetki bayrakları (u8)
+# Biçim 1 dosyalarda başlıkta yalnızca sürüm bulunur (ETag ve imleç yok).
+MAGIC = b"SLAL"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sH")
+_STRING_LEN = struct.Struct("<H")
+_COUNT = struct.Struct("<I")
+
+# Yetki bayrakları
+ALLOW_ENTRY = 0x01  # Dışarıdan giriş (is_inside=False)
+ALLOW_EXIT = 0x02   # İçeriden çıkış (is_inside=True)
+
+
+def _direction_flag(is_inside):
+    """Yöne karşılık gelen yetki bayrağını döndürür"""
+    return ALLOW_EXIT if is_inside else ALLOW_ENTRY
+
+
+class AllowlistStore:
+    """
+    Kart UID'si -> yetki bayrakları eşlemesini tutan yerel izin listesi.
+    Karar sorguları sözlük üzerinden O(1) sürede yanıtlanır.
+    """
+
+    def __init__(self, path):
+        """
+        İzin listesini başlat.
+
+        Args:
+            path: İkili indeks dosyasının yolu
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.lock = threading.Lock()
+        self._entries = {}
+        self.version = None
+        self.etag = None      # Son yanıtın ETag değeri (If-None-Match için)
+        self.cursor = None    # Değişiklik akışındaki konum
+        self.loaded_at = None
+
+    @property
+    def is_ready(self):
+        """Geçerli bir anlık görüntü yüklüyse True"""
+        return self.version is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_allowed(self, uid, is_inside):
+        """
+        Kartın verilen yönde geçiş yetkisi olup olmadığını döndürür.
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: İçeriden çıkış ise True
+
+        Returns:
+            bool: Yetkiliyse True
+        """
+        return bool(self._entries.get(uid.lower(), 0) & _direction_flag(is_inside))
+
+    def replace(self, entries, version, etag=None, cursor=None):
+        """
+        Bellekteki listeyi yeni bir anlık görüntü ile değiştirir ve diske yazar.
+
+        Args:
+            entries: UID (hex) -> yetki bayrakları sözlüğü
+            version: Sunucunun verdiği anlık görüntü sürümü
+            etag: Anlık görüntü yanıtının ETag değeri
+            cursor: Sonraki değişiklik sorgusu için imleç
+        """
+        entries = {uid.lower(): flags for uid, flags in entries.items()}
+        self._commit(entries, str(version), etag, cursor)
+
+    def apply_changes(self, added, revoked, version, etag=None, cursor=None):
+        """
+        Artımlı değişiklikleri (eklenen ve iptal edilen kartlar) uygular ve diske yazar.
+
+        Args:
+            added: Eklenen/güncellenen kartlar için UID (hex) -> yetki bayrakları sözlüğü
+            revoked: Yetkisi iptal edilen UID (hex) listesi
+            version: Değişiklik sonrası sürüm
+            etag: Değişiklik yanıtının ETag değeri
+            cursor: Sonraki değişiklik sorgusu için imleç
+        """
+        entries = dict(self._entries)
+        for uid in revoked:
+            entries.pop(uid.lower(), None)
+        for uid, flags in added.items():
+            entries[uid.lower()] = flags
+        self._commit(entries, str(version), etag, cursor)
+
+    def _commit(self, entries, version, etag, cursor):
+        """Yeni listeyi diske yazar ve bellekteki referansı değiştirir"""
+        self._write(entries, version, etag, cursor)
+
+        # Sözlük referansı tek adımda değiştirilir; okuyucular kilitsiz sorgu yapabilir
+        with self.lock:
+            self._entries = entries
+            self.version = version
+            self.etag = etag
+            self.cursor = cursor
+            self.loaded_at = time.time()
+
+    def load(self):
+        """
+        Diskteki indeksi belleğe yükler.
+
+        Returns:
+            bool: Yükleme başarılıysa True
+        """
+        if not os.path.exists(self.path):
+            self.logger.info(f"İzin listesi dosyası bulunamadı: {self.path}")
+            return False
+
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+
+            magic, fmt = _HEADER.unpack_from(data, 0)
+            if magic != MAGIC or fmt not in (1, FORMAT_VERSION):
+                raise ValueError("Geçersiz izin listesi dosya biçimi")
+
+            offset = _HEADER.size
+            strings = []
+            for _ in range(3 if fmt == FORMAT_VERSION else 1):
+                (length,) = _STRING_LEN.unpack_from(data, offset)
+                offset += _STRING_LEN.size
+                strings.append(data[offset:offset + length].decode("utf-8") or None)
+                offset += length
+            version, etag, cursor = (strings + [None, None])[:3]
+
+            (count,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+
+            entries = {}
+            for _ in range(count):
+                uid_len = data[offset]
+                uid = data[offset + 1:offset + 1 + uid_len].hex()
+                entries[uid] = data[offset + 1 + uid_len]
+                offset += uid_len + 2
+
+            with self.lock:
+                self._entries = entries
+                self.version = version
+                self.etag = etag
+                self.cursor = cursor
+                self.loaded_at = os.path.getmtime(self.path)
+
+            self.logger.info(f"İzin listesi yüklendi: {count} kart (sürüm {version})")
+            return True
+        except Exception as e:
+            self.logger.error(f"İzin listesi yüklenemedi: {str(e)}")
+            return False
+
+    def _write(self, entries, version, etag, cursor):
+        """İndeksi geçici dosyaya yazıp atomik olarak yerine taşır"""
+        chunks = [_HEADER.pack(MAGIC, FORMAT_VERSION)]
+        for value in (version, etag, cursor):
+            encoded = (value or "").encode("utf-8")
+            chunks.append(_STRING_LEN.pack(len(encoded)) + encoded)
+        chunks.append(_COUNT.pack(len(entries)))
+        for uid, flags in entries.items():
+            uid_bytes = bytes.fromhex(uid)
+            chunks.append(bytes((len(uid_bytes),)) + uid_bytes + bytes((flags,)))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(chunks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def _parse_cards(cards):
+    """Sunucunun kart listesini UID (hex) -> yetki bayrakları sözlüğüne çevirir"""
+    entries = {}
+    for card in cards:
+        flags = 0
+        if card.get("allowEntry", True):
+            flags |= ALLOW_ENTRY
+        if card.get("allowExit", True):
+            flags |= ALLOW_EXIT
+        entries[card["cardUID"].lower()] = flags
+    return entries
+
+
+def parse_snapshot(data):
+    """
+    Sunucunun döndürdüğü tam anlık görüntüyü yetki bayrakları sözlüğüne çevirir.
+
+    Beklenen biçim:
+        {"version": "...", "cursor": "...",
+         "cards": [{"cardUID": "...", "allowEntry": true, "allowExit": true}]}
+
+    Returns:
+        tuple: (sürüm, UID -> yetki bayrakları sözlüğü, değişiklik imleci)
+    """
+    version = data.get("version", str(int(time.time())))
+    return version, _parse_cards(data.get("cards", [])), data.get("cursor")
+
+
+class AllowlistSync:
+    """
+    İzin listesini sunucudan periyodik olarak senkronize eden arka plan iş parçacığı.
+
+    Yerelde bir değişiklik imleci varsa yalnızca değişiklik akışı istenir;
+    imleç yoksa veya sunucu sıfırlama isterse tam anlık görüntü indirilir.
+    Her iki istek de If-None-Match ile koşullu yapılır.
+    """
+
+    def __init__(self, store, fetch_snapshot, fetch_changes=None, interval=300.0):
+        """
+        Senkronizasyonu başlat.
+
+        Args:
+            store: Güncellenecek AllowlistStore
+            fetch_snapshot: fetch_snapshot(etag) -> {"status", "data", "etag", "bytes"}
+            fetch_changes: fetch_changes(cursor, etag) -> {"status", "data", "etag", "bytes"}
+                (None ise her seferinde tam senkronizasyon yapılır)
+            interval: İki senkronizasyon arasındaki süre (saniye)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store = store
+        self.fetch_snapshot = fetch_snapshot
+        self.fetch_changes = fetch_changes
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_sync_time = None
+        self.last_sync_stats = None
+        self.failures = 0
+
+    def _sync_full(self, stats):
+        """Tam anlık görüntüyü koşullu olarak indirir ve uygular"""
+        result = self.fetch_snapshot(self.store.etag)
+        stats["bytes"] += result["bytes"]
+
+        if result["status"] == 304:
+            stats["mode"] = "full_not_modified"
+            return
+
+        version, entries, cursor = parse_snapshot(result["data"])
+        self.store.replace(entries, version, etag=result["etag"], cursor=cursor)
+        stats.update(mode="full", added=len(entries))
+
+    def _sync_delta(self, stats):
+        """
+        Son imleçten bu yana olan değişiklikleri indirir ve uygular.
+
+        Returns:
+            bool: Değişiklik akışı kullanılabildiyse True (False ise tam senkronizasyon gerekir)
+        """
+        result = self.fetch_changes(self.store.cursor, self.store.etag)
+        stats["bytes"] += result["bytes"]
+
+        if result["status"] == 304:
+            stats["mode"] = "delta_not_modified"
+            return True
+        if result["status"] == 410 or result["data"].get("resetRequired"):
+            self.logger.info("Değişiklik imleci geçersiz, tam senkronizasyon yapılacak")
+            return False
+
+        data = result["data"]
+        added = _parse_cards(data.get("added", []))
+        revoked = data.get("revoked", [])
+        if added or revoked or data.get("cursor") != self.store.cursor:
+            self.store.apply_changes(
+                added, revoked,
+                data.get("version", self.store.version),
+                etag=result["etag"],
+                cursor=data.get("cursor", self.store.cursor)
+            )
+        stats.update(mode="delta", added=len(added), revoked=len(revoked))
+        return True
+
+    def sync_once(self):
+        """
+        Tek bir senkronizasyon yapar (mümkünse artımlı).
+
+        Returns:
+            bool: Başarılıysa True
+        """
+        started = time.monotonic()
+        stats = {"mode": None, "bytes": 0, "added": 0, "revoked": 0}
+        try:
+            if not (self.fetch_changes and self.store.cursor and self._sync_delta(stats)):
+                self._sync_full(stats)
+
+            stats["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            stats["cards"] = len(self.store)
+            self.last_sync_stats = stats
+            self.last_sync_time = time.time()
+            self.failures = 0
+            self.logger.info(f"İzin listesi senkronize edildi: {stats['mode']}, +{stats['added']} / "
+                             f"-{stats['revoked']} kart, {stats['bytes']} bayt, {stats['duration_ms']} ms "
+                             f"(toplam {stats['cards']} kart, sürüm {self.store.version})")
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.logger.error(f"İzin listesi senkronizasyon hatası ({self.failures}. ardışık): {str(e)}")
+            return False
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.sync_once()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Periyodik senkronizasyonu başlatır"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.logger.info(f"İzin listesi senkronizasyonu başlatıldı ({self.interval} sn aralıkla)")
+
+    def stop(self):
+        """Periyodik senkronizasyonu durdurur"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
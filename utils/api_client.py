@@ -3,6 +3,18 @@ import yaml
 import time
 import random
 import os
+import logging
+import threading
+import hashlib
+import concurrent.futures
+from urllib.parse import urlsplit, urlunsplit
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from utils.exceptions import ApiResponseError, ApiConnectionError, ApiNotSentError
+from utils.resilience import CircuitBreaker, LatencyTracker
+
+# Logger kurulumu
+logger = logging.getLogger(__name__)
 
 # Simülasyon modu kontrolü
 SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'true').lower() in ('true', '1', 't', 'yes')
@@ -10,19 +22,362 @@ SIMULATION_MODE = os.environ.get('SIMULATION_MODE', 'true').lower() in ('true',
 with open("config/config.yaml") as f:
     config = yaml.safe_load(f)
 
-def send_card(uid, is_inside):
-    """Kart ID'sini API'ye gönderir ve kapı durumunu alır"""
+# HTTP bağlantı havuzu ayarları
+api_config = config.get('api', {}) or {}
+POOL_SIZE = int(api_config.get('pool_size', 4))  # Okuyucu thread sayısı kadar bağlantı yeterli
+WARMUP_TIMEOUT = float(api_config.get('warmup_timeout', 3.0))  # Saniye
+ALLOWLIST_PATH = api_config.get('allowlist_path', '/api/access-portals/allowlist')
+SYNC_TIMEOUT = float(api_config.get('sync_timeout', 30.0))  # Saniye
+REVOCATION_PATH = api_config.get('revocation_path', '/api/access-portals/revocations')
+EVENTS_PATH = api_config.get('events_path', '/api/access-portals/events')
+UPLOAD_TIMEOUT = float(api_config.get('upload_timeout', 10.0))  # Saniye
+
+# Kapı kararı istekleri için taşıma: "sync" (requests) veya "async" (aiohttp olay döngüsü)
+TRANSPORT = api_config.get('transport', 'sync')
+ASYNC_MAX_CONCURRENCY = int(api_config.get('async_max_concurrency', 8))
+
+# Kapı kararı gecikme bütçesi
+DECISION_DEADLINE = float(api_config.get('decision_deadline', 1.5))  # Tek karar için toplam süre (saniye)
+MIN_ATTEMPT_TIMEOUT = float(api_config.get('min_attempt_timeout', 0.2))  # Saniye
+MAX_ATTEMPT_TIMEOUT = float(api_config.get('max_attempt_timeout', 1.0))  # Saniye
+
+# Son gecikmelere göre uyarlanan deneme zaman aşımı
+latency_tracker = LatencyTracker(
+    percentile=float(api_config.get('timeout_percentile', 95)),
+    multiplier=float(api_config.get('timeout_multiplier', 2.0)),
+    min_timeout=MIN_ATTEMPT_TIMEOUT,
+    max_timeout=MAX_ATTEMPT_TIMEOUT
+)
+
+# Hata veren sunucuyu geçici olarak devre dışı bırakan devre kesici
+circuit_breaker = CircuitBreaker(
+    failure_threshold=int(api_config.get('breaker_failure_threshold', 5)),
+    recovery_timeout=float(api_config.get('breaker_recovery_timeout', 30)),
+    name="access-api"
+)
+
+# Sunucuda işlenmiş olsa bile tekrar gönderilmesi güvenli yöntemler
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+
+
+def _failed_before_send(error):
+    """Bağlantı hatası istek gönderilmeden (bağlantı kurulurken) mi oluştu"""
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class ApiClient:
+    """
+    Erişim API'si için uzun ömürlü, thread-safe HTTP istemcisi.
+
+    Tek bir requests.Session ve boyutlandırılmış bir bağlantı havuzu kullanır;
+    böylece her kart okumasında yeni TCP bağlantısı ve DNS sorgusu yapılmaz.
+    """
+
+    def __init__(self, api_url, pool_size=POOL_SIZE):
+        """
+        API istemcisini başlat.
+
+        Args:
+            api_url: Kapı durumu uç noktasının tam adresi
+            pool_size: Havuzda tutulacak en fazla bağlantı sayısı
+        """
+        self.api_url = api_url
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+
+        # İstatistikler
+        self.request_count = 0
+        self.dead_connections = 0
+
+        # Temizlenen havuzlardan kalan sayaçlar (yeniden kullanım hesabı için)
+        self._retired_requests = 0
+        self._retired_connections = 0
+
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=False)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    def _pools(self):
+        """Adaptörün açık bağlantı havuzlarını döndürür"""
+        manager = self.adapter.poolmanager
+        return [manager.pools[key] for key in list(manager.pools.keys())]
+
+    def _drop_pools(self):
+        """Ölü bağlantıları içeren havuzları kapatır (sayaçları korunarak)"""
+        with self.lock:
+            for pool in self._pools():
+                self._retired_requests += pool.num_requests
+                self._retired_connections += pool.num_connections
+            self.adapter.poolmanager.clear()
+
+    def warm_up(self):
+        """
+        Başlangıçta API sunucusuna bir bağlantı açarak havuzu ısıtır.
+
+        Returns:
+            bool: Bağlantı kurulabildiyse True
+        """
+        try:
+            self.session.head(self.api_url, timeout=WARMUP_TIMEOUT)
+            logger.info(f"API bağlantısı önceden açıldı: {urlsplit(self.api_url).netloc}")
+            return True
+        except requests.RequestException as e:
+            logger.warning(f"API bağlantısı önceden açılamadı: {str(e)}")
+            return False
+
+    def _request(self, method, url, deadline=None, **kwargs):
+        """
+        Paylaşılan oturum üzerinden istek gönderir. Bağlantı hatasında havuz
+        temizlenir; istek yalnızca tekrarı güvenliyse (bağlantı hiç kurulamadı,
+        yöntem idempotent veya Idempotency-Key başlığı var) bir kez yeni
+        bağlantı ile tekrarlanır. Aksi halde sunucu isteği işlemiş olabileceği
+        için hata çağırana iletilir.
+
+        Args:
+            deadline: İki denemenin birlikte aşmaması gereken an (time.monotonic);
+                verilirse tekrar yalnızca kalan süreyle, süre kalmadıysa hiç yapılmaz
+        """
+        with self.lock:
+            self.request_count += 1
+
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.Timeout:
+            # Bağlantı zaman aşımı tekrar edilmez (gecikme bütçesini ikiye katlar)
+            raise
+        except requests.ConnectionError as e:
+            with self.lock:
+                self.dead_connections += 1
+            self._drop_pools()
+
+            headers = kwargs.get("headers") or {}
+            if not (_failed_before_send(e) or method.upper() in IDEMPOTENT_METHODS
+                    or "Idempotency-Key" in headers):
+                logger.warning(f"API bağlantısı istek sırasında koptu, tekrar gönderilmiyor: {str(e)}")
+                raise
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < MIN_ATTEMPT_TIMEOUT:
+                    raise
+                timeout = kwargs.get("timeout")
+                kwargs["timeout"] = remaining if timeout is None else min(timeout, remaining)
+
+            logger.warning(f"API bağlantısı kopmuş, yeni bağlantı ile tekrar deneniyor: {str(e)}")
+            return self.session.request(method, url, **kwargs)
+
+    def post(self, payload, url=None, **kwargs):
+        """
+        Yükü API'ye gönderir.
+
+        Args:
+            payload: JSON olarak gönderilecek sözlük
+            url: İstek adresi (None ise kapı durumu uç noktası)
+
+        Returns:
+            requests.Response: API yanıtı
+        """
+        return self._request("POST", url or self.api_url, json=payload, **kwargs)
+
+    def get(self, url, **kwargs):
+        """
+        Aynı bağlantı havuzu üzerinden GET isteği gönderir.
+
+        Args:
+            url: İstek adresi (genellikle build_api_url ile üretilir)
+
+        Returns:
+            requests.Response: API yanıtı
+        """
+        return self._request("GET", url, **kwargs)
+
+    def get_stats(self):
+        """
+        Bağlantı havuzu istatistiklerini döndürür.
+
+        Returns:
+            dict: İstek, açılan bağlantı, yeniden kullanım ve ölü bağlantı sayıları
+        """
+        with self.lock:
+            requests_sent = self._retired_requests
+            connections = self._retired_connections
+            for pool in self._pools():
+                requests_sent += pool.num_requests
+                connections += pool.num_connections
+
+            return {
+                "requests": self.request_count,
+                "connections_opened": connections,
+                "connection_reuses": max(0, requests_sent - connections),
+                "dead_connections": self.dead_connections
+            }
+
+    def close(self):
+        """Oturumu ve havuzdaki bağlantıları kapatır"""
+        self.session.close()
+
+
+# Tüm okuyucu thread'lerinin paylaştığı istemci
+_client = None
+_client_lock = threading.Lock()
+
+def get_api_client():
+    """Paylaşılan API istemcisini döndürür (gerekirse oluşturur)"""
+    global _client
+
+    with _client_lock:
+        if _client is None:
+            _client = ApiClient(config['api_url'])
+        return _client
+
+# Asenkron taşıma seçildiyse tüm okuyucuların paylaştığı olay döngüsü istemcisi
+_async_client = None
+_async_unavailable = False  # aiohttp kurulu değil
+
+def get_async_api_client():
+    """
+    Paylaşılan asenkron API istemcisini döndürür (gerekirse başlatır).
+
+    Returns:
+        AsyncApiClient: İstemci veya asenkron taşıma kullanılmıyorsa None
+    """
+    global _async_client
+
+    global _async_unavailable
+
+    if TRANSPORT != 'async' or SIMULATION_MODE or _async_unavailable:
+        return None
+
+    with _client_lock:
+        if _async_client is None:
+            from utils import async_api_client
+            if async_api_client.aiohttp is None:
+                # aiohttp isteğe bağlıdır; kurulu değilse senkron istemciye dönülür
+                _async_unavailable = True
+                logger.warning("transport: async seçili ama aiohttp kurulu değil, senkron istemci kullanılıyor "
+                               "('pip install aiohttp')")
+                return None
+            client = async_api_client.AsyncApiClient(
+                config['api_url'],
+                config['controller_id'],
+                pool_size=POOL_SIZE,
+                max_concurrency=ASYNC_MAX_CONCURRENCY
+            )
+            client.start()
+            _async_client = client
+        return _async_client
+
+def stop_async_api_client():
+    """Asenkron API istemcisini durdurur"""
+    global _async_client
+
+    with _client_lock:
+        if _async_client is not None:
+            _async_client.stop()
+            _async_client = None
+
+def build_api_url(path):
+    """
+    api_url ile aynı sunucu üzerinde başka bir uç noktanın adresini üretir.
+
+    Args:
+        path: Uç nokta yolu (ör. "/api/access-portals/allowlist")
+
+    Returns:
+        str: Tam adres
+    """
+    parts = urlsplit(config['api_url'])
+    return urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+
+def warm_up_api_client():
+    """Başlangıçta API bağlantısını önceden açar (simülasyonda işlem yapılmaz)"""
+    if SIMULATION_MODE:
+        return True
+    if TRANSPORT == 'async':
+        try:
+            get_async_api_client()
+        except Exception as e:
+            logger.error(f"Asenkron API istemcisi başlatılamadı: {str(e)}")
+    return get_api_client().warm_up()
+
+def get_api_health():
+    """
+    İzleme için devre kesici durumunu ve API gecikme özetini döndürür.
+
+    Returns:
+        dict: Devre kesici ve gecikme istatistikleri
+    """
+    return {
+        "breaker": circuit_breaker.get_stats(),
+        "latency": latency_tracker.get_stats()
+    }
+
+def _post_decision(payload, timeout, deadline=None):
+    """
+    Kapı kararı için tek bir deneme yapar.
+
+    Args:
+        deadline: Kararın toplam süre sınırı (time.monotonic); bağlantı
+            yenilenerek yapılan iç tekrar da bu süreyi aşmaz
+
+    Returns:
+        tuple: (HTTP durum kodu, yanıt sözlüğü veya None)
+
+    Raises:
+        ApiNotSentError: Bağlantı kurulamadı (istek sunucuya ulaşmadı)
+        ApiConnectionError: Zaman aşımı veya istek sırasında bağlantı hatası
+            (sunucu isteği işlemiş olabilir)
+    """
+    async_client = get_async_api_client()
+    if async_client is not None:
+        try:
+            return async_client.submit_payload(payload, timeout).result(timeout + 0.5)
+        except concurrent.futures.TimeoutError:
+            raise ApiConnectionError(f"Asenkron istek {timeout:.2f} sn içinde tamamlanmadı")
+
+    try:
+        res = get_api_client().post(payload, timeout=timeout, deadline=deadline)
+    except requests.ConnectTimeout as e:
+        raise ApiNotSentError(str(e))
+    except requests.ConnectionError as e:
+        if _failed_before_send(e):
+            raise ApiNotSentError(str(e))
+        raise ApiConnectionError(str(e))
+    except requests.Timeout as e:
+        raise ApiConnectionError(str(e))
+
+    if res.status_code != 200:
+        return res.status_code, None
+    try:
+        return res.status_code, res.json()
+    except ValueError as e:
+        return 500, {"error": f"Geçersiz API yanıtı: {str(e)}"}
+
+def send_card(uid, is_inside, deadline=None):
+    """
+    Kart ID'sini API'ye gönderir ve kapı durumunu alır.
+
+    Args:
+        uid: Kart UID'si (hex)
+        is_inside: İçeriden çıkış ise True
+        deadline: Karar için toplam süre (saniye, None ise DECISION_DEADLINE)
+
+    Returns:
+        tuple: (HTTP durum kodu, yanıt sözlüğü veya None)
+    """
     payload = {
         "cardUID": uid,
         "isInside": is_inside,
         "controllerId": config['controller_id']
     }
-    
+
     if SIMULATION_MODE:
         # Simülasyon modunda, gerçek API'ye bağlanmak yerine rastgele yanıt üret
         print(f"[API] Simülasyon gönderimi: {payload}")
         time.sleep(0.5)  # API yanıt gecikmesini simüle et
-        
+
         # %70 olasılıkla kapıyı aç
         should_open = random.random() < 0.7
         response = {
@@ -31,10 +386,158 @@ def send_card(uid, is_inside):
             "message": "Bu bir simülasyon yanıtıdır"
         }
         return 200, response
-    else:
-        # Gerçek API isteği
+
+    # Gerçek API isteği (paylaşılan bağlantı havuzu üzerinden, toplam süre sınırı ile)
+    deadline_at = time.monotonic() + (DECISION_DEADLINE if deadline is None else deadline)
+    last_error = "Karar süresi doldu"
+
+    while True:
+        remaining = deadline_at - time.monotonic()
+        if remaining < MIN_ATTEMPT_TIMEOUT:
+            return 504, {"error": last_error}
+
+        if not circuit_breaker.allow_request():
+            return 503, {"error": "API devre kesicisi açık"}
+
+        timeout = min(latency_tracker.suggest_timeout(), remaining)
+        started = time.monotonic()
         try:
-            res = requests.post(config['api_url'], json=payload)
-            return res.status_code, res.json() if res.status_code == 200 else None
+            status, response = _post_decision(payload, timeout, deadline_at)
+        except ApiNotSentError as e:
+            # İstek sunucuya ulaşmadı; kalan süre içinde tekrar denemek güvenli
+            circuit_breaker.record_failure()
+            last_error = str(e)
+            logger.warning(f"API denemesi başarısız ({timeout:.2f} sn zaman aşımı): {last_error}")
+            continue
+        except ApiConnectionError as e:
+            # Okuma zaman aşımı veya istek sırasında kopma: sunucu kararı işlemiş
+            # olabilir, kapı durumu isteği tekrar gönderilmez
+            circuit_breaker.record_failure()
+            logger.warning(f"API isteği yanıtsız kaldı ({timeout:.2f} sn zaman aşımı), tekrar gönderilmiyor: {str(e)}")
+            return 504, {"error": str(e)}
         except Exception as e:
-            return 500, {"error": str(e)} 
\ No newline at end of file
+            circuit_breaker.record_failure()
+            return 500, {"error": str(e)}
+
+        if status >= 500:
+            # Sunucu hatası - devre kesiciye hata olarak say, tekrar deneme
+            circuit_breaker.record_failure()
+            return status, response
+
+        circuit_breaker.record_success()
+        latency_tracker.record(time.monotonic() - started)
+        return status, response
+
+def _conditional_get(url, params, etag=None, raw=False):
+    """
+    If-None-Match ile koşullu GET isteği yapar.
+
+    Args:
+        raw: True ise yanıt gövdesi JSON olarak çözülmeden bayt olarak döner
+
+    Returns:
+        dict: {"status", "data", "etag", "bytes"} - 304 yanıtında data None olur
+
+    Raises:
+        ApiResponseError: Sunucu 200/304/410 dışında yanıt verirse
+    """
+    headers = {"If-None-Match": etag} if etag else {}
+    res = get_api_client().get(url, params=params, headers=headers, timeout=SYNC_TIMEOUT)
+    if res.status_code not in (200, 304, 410):
+        raise ApiResponseError(f"Liste indirilemedi ({url}): HTTP {res.status_code}")
+
+    data = None
+    if res.status_code == 200:
+        data = res.content if raw else res.json()
+
+    return {
+        "status": res.status_code,
+        "data": data,
+        "etag": res.headers.get("ETag", etag),
+        "bytes": len(res.content)
+    }
+
+def fetch_allowlist(etag=None):
+    """
+    Bu kontrolcü için tam izin listesi anlık görüntüsünü indirir.
+
+    Args:
+        etag: Yerel anlık görüntünün ETag değeri (değişmediyse 304 döner)
+
+    Returns:
+        dict: {"status", "data", "etag", "bytes"}
+    """
+    return _conditional_get(
+        build_api_url(ALLOWLIST_PATH),
+        {"controllerId": config['controller_id']},
+        etag
+    )
+
+def fetch_allowlist_changes(cursor, etag=None):
+    """
+    İmleçten bu yana izin listesinde olan değişiklikleri (eklenen ve iptal
+    edilen kartlar) indirir.
+
+    Args:
+        cursor: Son senkronizasyonda alınan değişiklik imleci
+        etag: Son yanıtın ETag değeri
+
+    Returns:
+        dict: {"status", "data", "etag", "bytes"} - imleç geçersizse status 410
+    """
+    return _conditional_get(
+        build_api_url(ALLOWLIST_PATH + "/changes"),
+        {"controllerId": config['controller_id'], "cursor": cursor},
+        etag
+    )
+
+def fetch_revocations(etag=None):
+    """
+    İptal edilen kartların kompakt filtre blob'unu indirir.
+
+    Args:
+        etag: Yerel blob'un ETag değeri (değişmediyse 304 döner)
+
+    Returns:
+        dict: {"status", "data" (bayt), "etag", "bytes"}
+    """
+    return _conditional_get(
+        build_api_url(REVOCATION_PATH),
+        {"controllerId": config['controller_id']},
+        etag,
+        raw=True
+    )
+
+def upload_events(events, batch_id=None):
+    """
+    Kart okuma olaylarını tek bir toplu istekle API'ye gönderir.
+
+    Her olay kendi 'eventId' alanını taşır; isteğin Idempotency-Key başlığı
+    giden kutusunun grupla birlikte sakladığı kimliktir, böylece aynı grubun
+    tekrar denemeleri (içeriği sınır nedeniyle değişse bile) aynı anahtarla
+    gider ve sunucuda çift kayıt oluşturmaz.
+
+    Args:
+        events: Olay sözlükleri listesi
+        batch_id: Kalıcı grup kimliği (None ise olay kimliklerinden türetilir)
+
+    Raises:
+        ApiResponseError: Sunucu başarılı yanıt vermezse
+    """
+    idempotency_key = batch_id or hashlib.sha256(
+        ",".join(event['eventId'] for event in events).encode("ascii")
+    ).hexdigest()
+    payload = {"controllerId": config['controller_id'], "events": events}
+
+    if SIMULATION_MODE:
+        print(f"[API] Simülasyon olay yüklemesi: {len(events)} olay")
+        return
+
+    res = get_api_client().post(
+        payload,
+        url=build_api_url(EVENTS_PATH),
+        headers={"Idempotency-Key": idempotency_key},
+        timeout=UPLOAD_TIMEOUT
+    )
+    if not 200 <= res.status_code < 300:
+        raise ApiResponseError(f"Olaylar yüklenemedi: HTTP {res.status_code}")
@@ -0,0 +1,174 @@
+"""
+asyncio tabanlı erişim API istemcisi.
+Tüm okuyucuların istekleri tek bir olay döngüsünde, paylaşılan bir bağlantı
+havuzu üzerinden ve sınırlı eşzamanlılıkla çoklanır. Okuyucu thread'leri
+submit() ile istek bırakır ve bir Future alır.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import logging
+
+from utils.exceptions import ApiConnectionError, ApiNotSentError
+
+# aiohttp isteğe bağlıdır; yoksa senkron istemci kullanılmaya devam edilir
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncApiClient:
+    """
+    Ayrı bir thread'de çalışan olay döngüsü üzerinde aiohttp oturumu yöneten istemci.
+    """
+
+    def __init__(self, api_url, controller_id, pool_size=8, max_concurrency=8):
+        """
+        İstemciyi oluştur (start() çağrılana kadar bağlantı açılmaz).
+
+        Args:
+            api_url: Kapı durumu uç noktasının tam adresi
+            controller_id: Kontrolcü kimliği (payload'a eklenir)
+            pool_size: Paylaşılan bağlantı havuzu boyutu
+            max_concurrency: Aynı anda uçuşta olabilecek en fazla istek
+        """
+        if aiohttp is None:
+            raise ImportError("Asenkron API istemcisi için aiohttp modülü gerekli - 'pip install aiohttp'")
+
+        self.logger = logging.getLogger(__name__)
+        self.api_url = api_url
+        self.controller_id = controller_id
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+
+        self.loop = None
+        self.thread = None
+        self.session = None
+        self.semaphore = None
+        self._started = threading.Event()
+
+        # İstatistikler
+        self.submitted = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.lock = threading.Lock()
+
+    def start(self):
+        """Olay döngüsü thread'ini başlatır ve oturumu açar"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+        self._started.wait()
+
+        asyncio.run_coroutine_threadsafe(self._open(), self.loop).result()
+        self.logger.info(f"Asenkron API istemcisi başlatıldı (havuz: {self.pool_size}, "
+                         f"eşzamanlılık: {self.max_concurrency})")
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    async def _open(self):
+        connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _post(self, payload, timeout):
+        async with self.semaphore:
+            with self.lock:
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                async with self.session.post(
+                    self.api_url,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as res:
+                    if res.status != 200:
+                        return res.status, None
+                    try:
+                        return res.status, await res.json(content_type=None)
+                    except ValueError as e:
+                        return 500, {"error": f"Geçersiz API yanıtı: {str(e)}"}
+            except aiohttp.ClientConnectorError as e:
+                # Bağlantı kurulamadı, istek sunucuya ulaşmadı
+                raise ApiNotSentError(str(e) or type(e).__name__)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise ApiConnectionError(str(e) or type(e).__name__)
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+    def submit_payload(self, payload, timeout=None):
+        """
+        Hazır bir payload'u gönderir (thread-safe).
+
+        Args:
+            payload: JSON olarak gönderilecek sözlük
+            timeout: İstek zaman aşımı (saniye)
+
+        Returns:
+            concurrent.futures.Future: (HTTP durum kodu, yanıt) sonucunu taşıyan Future;
+            ağ hatalarında ApiConnectionError ile sonuçlanır
+        """
+        if self.loop is None or not self.loop.is_running():
+            future = concurrent.futures.Future()
+            future.set_exception(ApiConnectionError("Asenkron API istemcisi çalışmıyor"))
+            return future
+
+        with self.lock:
+            self.submitted += 1
+        return asyncio.run_coroutine_threadsafe(self._post(payload, timeout), self.loop)
+
+    def submit(self, uid, is_inside, timeout=None):
+        """
+        Kart ID'sini API'ye gönderir (thread-safe, beklemeden döner).
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: İçeriden çıkış ise True
+            timeout: İstek zaman aşımı (saniye)
+
+        Returns:
+            concurrent.futures.Future: (HTTP durum kodu, yanıt) sonucunu taşıyan Future
+        """
+        payload = {
+            "cardUID": uid,
+            "isInside": is_inside,
+            "controllerId": self.controller_id
+        }
+        return self.submit_payload(payload, timeout)
+
+    def get_stats(self):
+        """
+        İstemci istatistiklerini döndürür.
+
+        Returns:
+            dict: Gönderilen, şu an uçuşta olan ve en yüksek eşzamanlı istek sayısı
+        """
+        with self.lock:
+            return {
+                "submitted": self.submitted,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight
+            }
+
+    def stop(self):
+        """Oturumu kapatır ve olay döngüsünü durdurur"""
+        if self.loop is None or not self.loop.is_running():
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self.session.close(), self.loop).result(timeout=2.0)
+        except Exception as e:
+            self.logger.error(f"Asenkron API oturumu kapatma hatası: {str(e)}")
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2.0)
+        self.logger.info("Asenkron API istemcisi durduruldu")
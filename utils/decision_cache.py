@@ -0,0 +1,240 @@
+"""
+Kart yetkilendirme kararları için bellek içi önbellek.
+Aynı kart kısa süre içinde tekrar okunduğunda API'ye gidilmeden karar verilir.
+"""
+
+import time
+import threading
+import logging
+from collections import OrderedDict
+
+
+class DecisionCache:
+    """
+    (Kart UID, yön) anahtarlı, süreli (TTL) ve LRU tahliyeli karar önbelleği.
+    """
+
+    def __init__(self, max_entries=512, grant_ttl=60.0, deny_ttl=10.0, stale_ttl=0.0):
+        """
+        Önbelleği başlat.
+
+        Args:
+            max_entries: Önbellekte tutulacak en fazla kayıt sayısı
+            grant_ttl: Onaylanan (kapı açılan) kararların geçerlilik süresi (saniye)
+            deny_ttl: Reddedilen kararların geçerlilik süresi (saniye)
+            stale_ttl: Süresi dolan kararların API erişilemezken yedek olarak
+                kullanılabileceği ek süre (saniye)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self.grant_ttl = grant_ttl
+        self.deny_ttl = deny_ttl
+        self.stale_ttl = stale_ttl
+        self.lock = threading.Lock()
+        self._entries = OrderedDict()  # (uid, is_inside) -> (bitiş zamanı, izin, yanıt)
+
+        # İstatistikler
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, uid, is_inside, allow_stale=False):
+        """
+        Geçerli bir önbellek kaydını döndürür.
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: İçeriden çıkış ise True
+            allow_stale: Süresi dolmuş ama stale_ttl içindeki kayıtları da döndür
+
+        Returns:
+            tuple: (izin, yanıt) veya kayıt yoksa/süresi dolduysa None
+        """
+        key = (uid, is_inside)
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, granted, response = entry
+            if now >= expires_at + self.stale_ttl:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            if now >= expires_at and not allow_stale:
+                self.misses += 1
+                return None
+
+            # En son kullanılan olarak işaretle
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return granted, dict(response)
+
+    def put(self, uid, is_inside, granted, response):
+        """
+        Bir API kararını önbelleğe ekler.
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: İçeriden çıkış ise True
+            granted: Kapı açıldıysa True
+            response: API yanıtı (sözlük)
+        """
+        ttl = self.grant_ttl if granted else self.deny_ttl
+        if ttl <= 0:
+            return
+
+        key = (uid, is_inside)
+        with self.lock:
+            self._entries[key] = (time.monotonic() + ttl, granted, dict(response or {}))
+            self._entries.move_to_end(key)
+
+            # Kapasite aşıldıysa en az kullanılan kayıtları çıkar
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, uid, is_inside=None):
+        """
+        Bir kartın önbellek kaydını siler.
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: Sadece bu yönü sil (None ise her iki yön silinir)
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        directions = (True, False) if is_inside is None else (is_inside,)
+        removed = 0
+        with self.lock:
+            for direction in directions:
+                if self._entries.pop((uid, direction), None) is not None:
+                    removed += 1
+
+        if removed:
+            self.logger.info(f"Karar önbelleğinden silindi: {uid} ({removed} kayıt)")
+        return removed
+
+    def clear(self):
+        """Tüm önbelleği temizler"""
+        with self.lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Önbellek istatistiklerini döndürür.
+
+        Returns:
+            dict: Kayıt, isabet, ıskalama ve tahliye sayıları
+        """
+        with self.lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+class CacheRefresher:
+    """
+    Önbellekten verilen kararları API'ye bildiren sınırlı arka plan kuyruğu.
+    Tek bir thread sırayla çalışır; aynı (UID, yön) kuyrukta zaten bekliyorsa
+    birleştirilir, kuyruk doluysa yeni istek atılır.
+    """
+
+    def __init__(self, refresh, max_pending=32, name="cache-refresh"):
+        """
+        Args:
+            refresh: refresh(uid, is_inside) - kararı API'ye bildirip önbelleği tazeleyen fonksiyon
+            max_pending: Kuyrukta bekleyebilecek en fazla bildirim
+            name: Thread ve log adı
+        """
+        self.logger = logging.getLogger(__name__)
+        self.refresh = refresh
+        self.max_pending = max(1, int(max_pending))
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending = OrderedDict()  # (uid, is_inside) -> None, eklenme sırasıyla
+        self._running = True
+        self._thread = None
+
+        # İstatistikler
+        self.submitted = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.sent = 0
+
+    def submit(self, uid, is_inside):
+        """
+        Bildirimi kuyruğa bırakır ve hemen döner.
+
+        Args:
+            uid: Kart UID'si (hex)
+            is_inside: İçeriden çıkış ise True
+
+        Returns:
+            bool: Bildirim kuyrukta ise True, atıldıysa False
+        """
+        key = (uid, is_inside)
+        with self._cond:
+            if not self._running:
+                return False
+            if key in self._pending:
+                self.coalesced += 1
+                return True
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                self.logger.warning(f"{self.name} kuyruğu dolu ({self.max_pending}), bildirim atıldı: {uid}")
+                return False
+
+            self._pending[key] = None
+            self.submitted += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                (uid, is_inside), _ = self._pending.popitem(last=False)
+
+            try:
+                self.refresh(uid, is_inside)
+                self.sent += 1
+            except Exception as e:
+                self.logger.error(f"{self.name}: bildirim hatası ({uid}): {str(e)}")
+
+    def stop(self, timeout=2.0):
+        """Thread'i durdurur; bekleyen bildirimler atılır"""
+        with self._cond:
+            self._running = False
+            self._pending.clear()
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: Kuyruktaki, eklenen, birleştirilen, atılan ve gönderilen bildirim sayıları
+        """
+        with self._cond:
+            return {
+                "pending": len(self._pending),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "sent": self.sent
+            }
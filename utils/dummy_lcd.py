@@ -11,6 +11,7 @@ class CharLCD:
         self.cursor_pos = (0, 0)
         self.display = [' ' * cols for _ in range(rows)]
         self.backlight_state = True  # Arka ışık durumu
+        self.cgram = [None] * 8  # Kullanıcı tanımlı karakterler
         print(f"[DummyLCD] LCD ekran başlatıldı: {rows}x{cols}, {i2c_expander} @ 0x{address:02x}")
     
     def write_string(self, text):
@@ -44,6 +45,16 @@ class CharLCD:
         print("[DummyLCD] Ekran temizlendi")
         self._print_display()
     
+    def home(self):
+        self.cursor_pos = (0, 0)
+    
+    def create_char(self, location, bitmap):
+        """Kullanıcı tanımlı karakteri CGRAM yuvasına yükler"""
+        if not 0 <= location < 8:
+            raise ValueError(f"Geçersiz CGRAM yuvası: {location}")
+        self.cgram[location] = tuple(bitmap)
+        print(f"[DummyLCD] CGRAM yuvası {location} yüklendi")
+    
     def _print_display(self):
         if not self.backlight_state:
             print("[DummyLCD] Arka ışık kapalı, ekran içeriği görünmüyor")
@@ -52,7 +63,8 @@ class CharLCD:
         print("[DummyLCD] Ekran içeriği:")
         print("+" + "-" * self.cols + "+")
         for row in self.display:
-            print("|" + row + "|")
+            # CGRAM karakterleri konsolda '*' olarak gösterilir
+            print("|" + "".join("*" if ord(char) < 8 else char for char in row) + "|")
         print("+" + "-" * self.cols + "+")
     
     def close(self):
@@ -5,6 +5,18 @@ import time
 import random
 import threading
 
+# InAutoPoll komut kodu ve simüle edilen hedef tipi (MIFARE 106 kbps)
+_COMMAND_INAUTOPOLL = 0x60
+_TYPE_MIFARE = 0x10
+
+class SimulatedIRQ(threading.Event):
+    """
+    PN532 IRQ hattının simülasyonu - okuyucunun yanıtı hazır olduğunda set edilir.
+    gpiozero tabanlı gerçek IRQ ile aynı wait/clear/close arayüzünü sunar.
+    """
+    def close(self):
+        pass
+
 class DummyNFC:
     def __init__(self, i2c=None, debug=False):
         self.debug = debug
@@ -16,11 +28,21 @@ class DummyNFC:
             bytes([0x04, 0xE8, 0x12, 0xDC, 0x1A, 0x8F, 0x02]),
             bytes([0x04, 0xEE, 0xA5, 0x37, 0xCB, 0x12, 0x45])
         ]
+        
+        # InAutoPoll simülasyonu: kurulduğunda kart gelince IRQ tetiklenir
+        self.irq = SimulatedIRQ()
+        self._auto_poll = False
+        self._auto_poll_uid = None
+        self._lock = threading.Lock()
         print("[DummyNFC] NFC okuyucu simülatörü başlatıldı")
         
         # Simüle edilmiş kart okumalarını başlat
         threading.Thread(target=self._simulate_card_readings, daemon=True).start()
     
+    def SAM_configuration(self):
+        # Simülasyonda yapılandırılacak bir şey yok
+        return True
+    
     def _simulate_card_readings(self):
         while True:
             # Rastgele aralıklarla kart okuma simülasyonu
@@ -31,6 +53,7 @@ class DummyNFC:
                 self._uid = random.choice(self._simulated_cards)
                 self._last_read_time = time.time()
                 print(f"[DummyNFC] Simüle edilmiş kart okuması: {self._uid.hex()}")
+                self._fire_auto_poll(self._uid)
             else:
                 self._uid = None
     
@@ -45,4 +68,53 @@ class DummyNFC:
         # Eğer timeout süresi dolmamışsa ve okuma olasılığı düşükse
         # beklemeden None döndür (kart tespit edilmedi)
         time.sleep(timeout)
-        return None 
\ No newline at end of file
+        return None
+    
+    def _fire_auto_poll(self, uid):
+        # Otomatik yoklama kuruluysa sonucu hazırla ve IRQ'yu tetikle
+        with self._lock:
+            if self._auto_poll:
+                self._auto_poll = False
+                self._auto_poll_uid = uid
+                self.irq.set()
+    
+    def send_command(self, command, params=[], timeout=1):
+        # Simülasyonda yalnızca InAutoPoll durum değiştirir, diğer komutlar onaylanır
+        if command == _COMMAND_INAUTOPOLL:
+            with self._lock:
+                self.irq.clear()
+                self._auto_poll = True
+                self._auto_poll_uid = None
+            if self.debug:
+                print(f"[DummyNFC] InAutoPoll kuruldu: {list(params)}")
+            
+            # Kart zaten alandaysa gerçek okuyucu gibi hemen yanıt ver
+            if self._uid is not None and (time.time() - self._last_read_time) < 3:
+                self._fire_auto_poll(self._uid)
+        return True
+    
+    def process_response(self, command, response_length=0, timeout=1):
+        # Yanıt hazır değilse gerçek okuyucu gibi None döndür
+        if command != _COMMAND_INAUTOPOLL:
+            return bytes()
+        if not self.irq.wait(timeout):
+            return None
+        
+        with self._lock:
+            uid = self._auto_poll_uid
+            self._auto_poll_uid = None
+            self.irq.clear()
+        
+        if uid is None:
+            return bytes([0])
+        
+        # NbTg | Tip | Uzunluk | Tg | SENS_RES | SEL_RES | NFCID uzunluğu | NFCID
+        target = bytes([0x01, 0x00, 0x44, 0x08, len(uid)]) + uid
+        return bytes([0x01, _TYPE_MIFARE, len(target)]) + target
+    
+    def simulate_card(self, uid):
+        """Belirtilen kartın alana girdiğini simüle eder (test için)"""
+        self._uid = bytes(uid)
+        self._last_read_time = time.time()
+        print(f"[DummyNFC] Simüle edilmiş kart okuması: {self._uid.hex()}")
+        self._fire_auto_poll(self._uid)
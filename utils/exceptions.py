@@ -78,6 +78,11 @@ class ApiConnectionError(ApiError):
     pass
 
 
+class ApiNotSentError(ApiConnectionError):
+    """API isteği gönderilemedi (bağlantı kurulamadı); tekrar göndermek güvenlidir."""
+    pass
+
+
 class ApiResponseError(ApiError):
     """API yanıt hatası."""
     pass
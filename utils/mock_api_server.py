@@ -0,0 +1,444 @@
+"""
+Erişim kontrol API'si için yerel sahte (mock) HTTP sunucusu.
+
+Gerçek sunucu olmadan send_card'ın gerçek HTTP kod yolunu yük altında
+denemek için kullanılır. Kart bazında yanıtlar, gecikme dağılımları, hata
+oranları ve bağlantı sıfırlamaları bir profil dosyasından ayarlanır.
+
+Kullanım:
+    python -m utils.mock_api_server --port 8080 --profile config/mock_server.yaml
+"""
+
+import argparse
+import json
+import math
+import random
+import socket
+import struct
+import threading
+import time
+import logging
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+import yaml
+
+from utils.revocation_filter import build_revocation_blob
+
+# Logger kurulumu
+logger = logging.getLogger(__name__)
+
+DOOR_STATUS_PATH = "/api/access-portals/door-status"
+ALLOWLIST_PATH = "/api/access-portals/allowlist"
+EVENTS_PATH = "/api/access-portals/events"
+CHANGES_PATH = ALLOWLIST_PATH + "/changes"
+REVOCATIONS_PATH = "/api/access-portals/revocations"
+STATS_PATH = "/__stats"
+CARDS_ADMIN_PATH = "/__cards"  # Test sırasında kart ekleme/iptal etme
+
+DEFAULT_PROFILE = {
+    "latency": {"distribution": "fixed", "mean_ms": 20},
+    "error_rate": 0.0,      # HTTP 500 döndürme olasılığı
+    "reset_rate": 0.0,      # Bağlantıyı RST ile koparma olasılığı
+    "hang_rate": 0.0,       # Yanıt vermeden hang_ms kadar bekleme olasılığı
+    "hang_ms": 30000,
+    "grant_probability": 1.0,  # Profilde tanımlı olmayan kartlar için kapı açma olasılığı
+    "cards": {},
+    "revoked": []           # Başlangıçta iptal edilmiş kart UID'leri
+}
+
+
+class LatencyModel:
+    """
+    Profilde tanımlanan dağılımdan yanıt gecikmesi üretir.
+
+    Desteklenen dağılımlar: fixed, uniform, normal, lognormal
+    """
+
+    def __init__(self, spec, rng):
+        self.distribution = spec.get("distribution", "fixed")
+        self.mean = float(spec.get("mean_ms", 20)) / 1000.0
+        self.stddev = float(spec.get("stddev_ms", 0)) / 1000.0
+        self.min = float(spec.get("min_ms", 0)) / 1000.0
+        self.max = float(spec.get("max_ms", 60000)) / 1000.0
+        self.rng = rng
+
+    def sample(self):
+        """Saniye cinsinden bir gecikme değeri döndürür"""
+        if self.distribution == "uniform":
+            value = self.rng.uniform(self.min, self.max)
+        elif self.distribution == "normal":
+            value = self.rng.gauss(self.mean, self.stddev)
+        elif self.distribution == "lognormal":
+            # Ortalama ve sapmayı lognormal parametrelerine çevir
+            if self.mean <= 0:
+                value = 0.0
+            else:
+                variance = self.stddev ** 2
+                sigma2 = math.log(1 + variance / (self.mean ** 2))
+                mu = math.log(self.mean) - sigma2 / 2
+                value = self.rng.lognormvariate(mu, sigma2 ** 0.5)
+        else:
+            value = self.mean
+        return min(self.max, max(self.min, value))
+
+
+class MockAccessServer(ThreadingHTTPServer):
+    """
+    Profil ve istatistikleri tutan, her isteği ayrı thread'de işleyen sunucu.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, profile=None, seed=None):
+        """
+        Sunucuyu oluştur.
+
+        Args:
+            address: (host, port) çifti
+            profile: Profil sözlüğü (None ise varsayılan profil)
+            seed: Rastgelelik tohumu (tekrarlanabilir senaryolar için)
+        """
+        super().__init__(address, MockRequestHandler)
+        merged = dict(DEFAULT_PROFILE)
+        merged.update(profile or {})
+        self.profile = merged
+        self.cards = {uid.lower(): answer for uid, answer in (merged.get("cards") or {}).items()}
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.latency = LatencyModel(merged.get("latency") or {}, self.rng)
+
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "granted": 0, "denied": 0, "errors": 0,
+                      "resets": 0, "hangs": 0, "events": 0, "duplicate_batches": 0,
+                      "not_modified": 0}
+        self.seen_idempotency_keys = set()
+
+        # İzin listesi değişiklik akışı: (sıra no, UID, yanıt veya iptal için None)
+        self.cards_lock = threading.Lock()
+        self.change_seq = 0
+        self.changes = []
+        self.revoked = {uid.lower() for uid in merged.get("revoked") or []}
+
+    def update_cards(self, added=None, revoked=None):
+        """
+        Kart listesini değiştirir ve değişiklikleri akışa ekler.
+
+        Args:
+            added: UID -> yanıt sözlüğü
+            revoked: İptal edilecek UID listesi
+        """
+        with self.cards_lock:
+            for uid, answer in (added or {}).items():
+                self.change_seq += 1
+                self.cards[uid.lower()] = answer
+                self.revoked.discard(uid.lower())
+                self.changes.append((self.change_seq, uid.lower(), answer))
+            for uid in revoked or []:
+                self.change_seq += 1
+                self.cards.pop(uid.lower(), None)
+                self.revoked.add(uid.lower())
+                self.changes.append((self.change_seq, uid.lower(), None))
+
+    @property
+    def etag(self):
+        """İzin listesinin mevcut sürümünü temsil eden ETag"""
+        return f'"v{self.change_seq}"'
+
+    def count(self, name, amount=1):
+        """Bir istatistik sayacını artırır"""
+        with self.stats_lock:
+            self.stats[name] += amount
+
+    def roll(self, probability):
+        """Verilen olasılıkla True döndürür (thread-safe)"""
+        with self.rng_lock:
+            return self.rng.random() < probability
+
+    def sample_latency(self, override_ms=None):
+        """Yanıt gecikmesi (saniye); kart bazında sabit değer verilebilir"""
+        if override_ms is not None:
+            return float(override_ms) / 1000.0
+        with self.rng_lock:
+            return self.latency.sample()
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    """Sahte API uç noktalarını yanıtlayan istek işleyici"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive bağlantılar için
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s" % (self.address_string(), format % args))
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _reset_connection(self):
+        """Bağlantıyı RST paketi ile aniden keser"""
+        self.server.count("resets")
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        self.connection.close()
+        self.close_connection = True
+
+    def _inject_faults(self, answer=None):
+        """
+        Profildeki hata senaryolarını uygular.
+
+        Returns:
+            bool: İstek bir hata ile sonlandırıldıysa True
+        """
+        server = self.server
+        profile = server.profile
+
+        if server.roll(float(profile.get("reset_rate", 0))):
+            self._reset_connection()
+            return True
+
+        if server.roll(float(profile.get("hang_rate", 0))):
+            server.count("hangs")
+            time.sleep(float(profile.get("hang_ms", 30000)) / 1000.0)
+            self.close_connection = True
+            return True
+
+        time.sleep(server.sample_latency((answer or {}).get("latency_ms")))
+
+        if server.roll(float(profile.get("error_rate", 0))):
+            server.count("errors")
+            self._send_json(500, {"error": "Simüle edilmiş sunucu hatası"})
+            return True
+
+        return False
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        self.server.count("requests")
+
+        if path == STATS_PATH:
+            with self.server.stats_lock:
+                stats = dict(self.server.stats)
+            self._send_json(200, stats)
+            return
+
+        if path in (ALLOWLIST_PATH, CHANGES_PATH, REVOCATIONS_PATH):
+            if self._inject_faults():
+                return
+            if path == ALLOWLIST_PATH:
+                self._allowlist()
+            elif path == REVOCATIONS_PATH:
+                self._revocations()
+            else:
+                self._allowlist_changes(parse_qs(urlsplit(self.path).query))
+            return
+
+        self._send_json(404, {"error": f"Bilinmeyen uç nokta: {path}"})
+
+    @staticmethod
+    def _card_entry(uid, answer):
+        return {
+            "cardUID": uid,
+            "allowEntry": answer.get("allowEntry", answer.get("doorOpened", True)),
+            "allowExit": answer.get("allowExit", answer.get("doorOpened", True))
+        }
+
+    def _not_modified(self, etag):
+        """İstemcinin ETag değeri güncelse 304 döndürür"""
+        if self.headers.get("If-None-Match") != etag:
+            return False
+        self.server.count("not_modified")
+        self.send_response(304)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        return True
+
+    def _send_allowlist_json(self, data, etag):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _allowlist(self):
+        server = self.server
+        with server.cards_lock:
+            etag, seq = server.etag, server.change_seq
+            cards = [self._card_entry(uid, answer) for uid, answer in server.cards.items()]
+
+        if self._not_modified(etag):
+            return
+        self._send_allowlist_json({"version": str(seq), "cursor": str(seq), "cards": cards}, etag)
+
+    def _revocations(self):
+        server = self.server
+        with server.cards_lock:
+            etag, seq = server.etag, server.change_seq
+            revoked = sorted(server.revoked)
+
+        if self._not_modified(etag):
+            return
+
+        body = build_revocation_blob(revoked, version=str(seq))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _allowlist_changes(self, query):
+        server = self.server
+        try:
+            cursor = int(query.get("cursor", ["0"])[0])
+        except ValueError:
+            cursor = -1
+
+        with server.cards_lock:
+            etag, seq = server.etag, server.change_seq
+            # Her kart için yalnızca son değişiklik gönderilir
+            latest = {}
+            for change_seq, uid, answer in server.changes:
+                if change_seq > cursor:
+                    latest[uid] = answer
+
+        if cursor < 0 or cursor > seq:
+            self._send_json(410, {"error": "Geçersiz imleç", "resetRequired": True})
+            return
+        if self._not_modified(etag):
+            return
+
+        data = {
+            "version": str(seq),
+            "cursor": str(seq),
+            "added": [self._card_entry(uid, answer) for uid, answer in latest.items() if answer is not None],
+            "revoked": [uid for uid, answer in latest.items() if answer is None]
+        }
+        self._send_allowlist_json(data, etag)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        self.server.count("requests")
+
+        try:
+            payload = self._read_json()
+        except ValueError:
+            self._send_json(400, {"error": "Geçersiz JSON"})
+            return
+
+        if path == DOOR_STATUS_PATH:
+            self._door_status(payload)
+        elif path == CARDS_ADMIN_PATH:
+            self.server.update_cards(payload.get("add"), payload.get("revoke"))
+            self._send_json(200, {"version": str(self.server.change_seq)})
+        elif path == EVENTS_PATH:
+            self._events(payload)
+        else:
+            self._send_json(404, {"error": f"Bilinmeyen uç nokta: {path}"})
+
+    def _door_status(self, payload):
+        uid = str(payload.get("cardUID", "")).lower()
+        with self.server.cards_lock:
+            answer = self.server.cards.get(uid)
+            if uid in self.server.revoked:
+                answer = {"doorOpened": False, "message": "Kart iptal edilmiş"}
+
+        if self._inject_faults(answer):
+            return
+
+        if answer is None:
+            opened = self.server.roll(float(self.server.profile.get("grant_probability", 1.0)))
+            answer = {"doorOpened": opened}
+
+        status = int(answer.get("status", 200))
+        opened = bool(answer.get("doorOpened", False))
+        self.server.count("granted" if opened else "denied")
+
+        response = {
+            "doorOpened": opened,
+            "userName": answer.get("userName", "Mock Kullanıcı"),
+            "message": answer.get("message", "Mock sunucu yanıtı")
+        }
+        self._send_json(status, response)
+
+    def _events(self, payload):
+        if self._inject_faults():
+            return
+
+        key = self.headers.get("Idempotency-Key")
+        with self.server.stats_lock:
+            duplicate = key is not None and key in self.server.seen_idempotency_keys
+            if key is not None:
+                self.server.seen_idempotency_keys.add(key)
+
+        if duplicate:
+            self.server.count("duplicate_batches")
+        else:
+            self.server.count("events", len(payload.get("events", [])))
+        self._send_json(200, {"accepted": len(payload.get("events", []))})
+
+
+def load_profile(path):
+    """
+    YAML profil dosyasını yükler.
+
+    Args:
+        path: Profil dosyasının yolu
+
+    Returns:
+        dict: Profil sözlüğü
+    """
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+def start_mock_server(host="127.0.0.1", port=8080, profile=None, seed=None):
+    """
+    Sahte sunucuyu arka plan thread'inde başlatır (testler ve benchmark'lar için).
+
+    Returns:
+        MockAccessServer: Çalışan sunucu (durdurmak için shutdown())
+    """
+    server = MockAccessServer((host, port), profile=profile, seed=seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Mock API sunucusu başlatıldı: http://{host}:{server.server_port}")
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Erişim kontrol API'si için yerel mock sunucu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--profile", help="YAML profil dosyası (ör. config/mock_server.yaml)")
+    parser.add_argument("--seed", type=int, default=None, help="Rastgelelik tohumu")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    profile = load_profile(args.profile) if args.profile else None
+
+    server = MockAccessServer((args.host, args.port), profile=profile, seed=args.seed)
+    print(f"[MOCK API] http://{args.host}:{args.port}{DOOR_STATUS_PATH} dinleniyor (Ctrl+C ile çıkış)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"[MOCK API] İstatistikler: {server.stats}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+Kart okuma olayları için diskte kalıcı giden kutusu (outbox).
+Olaylar önce yerel SQLite (WAL) veritabanına eklenir, arka plandaki bir
+yükleyici ise bunları toplu halde API'ye gönderir.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+import logging
+import yaml
+
+# Logger kurulumu
+logger = logging.getLogger(__name__)
+
+try:
+    with open("config/config.yaml") as f:
+        config = yaml.safe_load(f)
+except Exception as e:
+    logger.error(f"Config dosyası yüklenemedi: {str(e)}")
+    config = {}
+
+outbox_config = config.get('outbox', {}) or {}
+
+
+class EventOutbox:
+    """
+    Sadece ekleme yapılan, çökmeye dayanıklı olay kuyruğu.
+    Satır ve bayt sınırı aşıldığında en eski olaylar silinir.
+    """
+
+    def __init__(self, path, max_rows=50000, max_bytes=10 * 1024 * 1024):
+        """
+        Giden kutusunu aç (gerekirse oluştur).
+
+        Args:
+            path: SQLite veritabanı dosyasının yolu
+            max_rows: Bekleyen en fazla olay sayısı
+            max_bytes: Bekleyen olayların toplam en fazla boyutu (bayt)
+        """
+        self.path = path
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.dropped = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " event_id TEXT NOT NULL UNIQUE,"
+            " payload TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " batch_id TEXT)"
+        )
+        # Önceki sürümlerde oluşturulan tablolara toplu gönderim kimliği sütununu ekle
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(events)")}
+        if "batch_id" not in columns:
+            self.db.execute("ALTER TABLE events ADD COLUMN batch_id TEXT")
+        self.db.execute("CREATE INDEX IF NOT EXISTS events_batch_id ON events (batch_id)")
+
+        self._rows, self._bytes = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM events"
+        ).fetchone()
+        if self._rows:
+            logger.info(f"Giden kutusunda bekleyen {self._rows} olay bulundu ({self._bytes} bayt)")
+
+    def __len__(self):
+        return self._rows
+
+    def append(self, event):
+        """
+        Bir olayı giden kutusuna ekler.
+
+        Args:
+            event: JSON'a çevrilebilir olay sözlüğü ('eventId' alanı zorunlu)
+
+        Returns:
+            bool: Olay eklendiyse True (aynı eventId daha önce eklendiyse False)
+        """
+        payload = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload.encode("utf-8"))
+
+        with self.lock:
+            cursor = self.db.execute(
+                "INSERT OR IGNORE INTO events (event_id, payload, size, created_at) VALUES (?, ?, ?, ?)",
+                (event['eventId'], payload, size, time.time())
+            )
+            if cursor.rowcount == 0:
+                return False
+
+            self._rows += 1
+            self._bytes += size
+            self._enforce_limits()
+            return True
+
+    def _enforce_limits(self):
+        """Satır veya bayt sınırı aşıldıysa en eski olayları siler (kilit alınmış olmalı)"""
+        while self._rows > self.max_rows or self._bytes > self.max_bytes:
+            excess = max(1, self._rows - self.max_rows)
+            rows = self.db.execute(
+                "SELECT id, size FROM events ORDER BY id LIMIT ?", (excess,)
+            ).fetchall()
+            if not rows:
+                break
+
+            self.db.execute("DELETE FROM events WHERE id <= ?", (rows[-1][0],))
+            self._rows -= len(rows)
+            self._bytes -= sum(size for _, size in rows)
+            self.dropped += len(rows)
+            logger.warning(f"Giden kutusu sınırı aşıldı, en eski {len(rows)} olay silindi")
+
+    def peek(self, limit):
+        """
+        Gönderilmeyi bekleyen en eski olayları döndürür (silmeden).
+
+        Args:
+            limit: En fazla olay sayısı
+
+        Returns:
+            list: (satır id, olay sözlüğü) listesi
+        """
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT id, payload FROM events ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def claim_batch(self, limit):
+        """
+        Gönderilecek sıradaki olay grubunu döndürür. Grup ilk kez
+        oluşturulurken satırlara kalıcı bir kimlik yazılır; gönderim başarısız
+        olursa aynı satırlar aynı kimlikle (Idempotency-Key) tekrar gönderilir.
+
+        Args:
+            limit: Yeni bir gruptaki en fazla olay sayısı
+
+        Returns:
+            tuple: (grup kimliği, [(satır id, olay sözlüğü), ...]) veya bekleyen olay yoksa (None, [])
+        """
+        with self.lock:
+            # Önce daha önce denenmiş (onaylanmamış) grup
+            row = self.db.execute(
+                "SELECT batch_id FROM events WHERE batch_id IS NOT NULL ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                batch_id = row[0]
+            else:
+                ids = [row_id for row_id, in self.db.execute(
+                    "SELECT id FROM events ORDER BY id LIMIT ?", (limit,)
+                )]
+                if not ids:
+                    return None, []
+                batch_id = uuid.uuid4().hex
+                placeholders = ",".join("?" * len(ids))
+                self.db.execute(f"UPDATE events SET batch_id = ? WHERE id IN ({placeholders})",
+                                [batch_id] + ids)
+
+            rows = self.db.execute(
+                "SELECT id, payload FROM events WHERE batch_id = ? ORDER BY id", (batch_id,)
+            ).fetchall()
+        return batch_id, [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def ack(self, row_ids):
+        """
+        Sunucuya başarıyla iletilen olayları siler.
+
+        Args:
+            row_ids: Silinecek satır id'leri
+        """
+        if not row_ids:
+            return
+
+        with self.lock:
+            placeholders = ",".join("?" * len(row_ids))
+            removed_rows, removed_bytes = self.db.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM events WHERE id IN ({placeholders})",
+                row_ids
+            ).fetchone()
+            self.db.execute(f"DELETE FROM events WHERE id IN ({placeholders})", row_ids)
+            self._rows -= removed_rows
+            self._bytes -= removed_bytes
+
+    def get_stats(self):
+        """
+        Giden kutusu istatistiklerini döndürür.
+
+        Returns:
+            dict: Bekleyen olay sayısı, toplam boyut ve sınır nedeniyle silinen olay sayısı
+        """
+        with self.lock:
+            return {"pending": self._rows, "bytes": self._bytes, "dropped": self.dropped}
+
+    def close(self):
+        """Veritabanı bağlantısını kapatır"""
+        with self.lock:
+            self.db.close()
+
+
+class OutboxUploader:
+    """
+    Giden kutusunu toplu halde API'ye boşaltan arka plan iş parçacığı.
+    Hata durumunda üstel geri çekilme (exponential backoff) uygular.
+    """
+
+    def __init__(self, outbox, upload_batch, batch_size=100, flush_interval=5.0,
+                 base_backoff=1.0, max_backoff=300.0):
+        """
+        Yükleyiciyi başlat.
+
+        Args:
+            outbox: Boşaltılacak EventOutbox
+            upload_batch: upload_batch(olaylar, grup kimliği) - olay grubunu gönderen
+                fonksiyon (hata durumunda istisna fırlatır)
+            batch_size: Tek istekte gönderilecek en fazla olay
+            flush_interval: Kuyruk boşken bekleme süresi (saniye)
+            base_backoff: İlk hata sonrası bekleme süresi (saniye)
+            max_backoff: En uzun bekleme süresi (saniye)
+        """
+        self.outbox = outbox
+        self.upload_batch = upload_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.stop_event = threading.Event()
+        self.wake_event = threading.Event()
+        self.thread = None
+        self.failures = 0
+        self.uploaded = 0
+
+    def wake(self):
+        """Beklemeyi keserek hemen bir gönderim denemesi yapılmasını sağlar"""
+        self.wake_event.set()
+
+    def _backoff_delay(self):
+        """Ardışık hata sayısına göre rastgele sapmalı bekleme süresi"""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** (self.failures - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    def flush_once(self):
+        """
+        Bir olay grubunu göndermeyi dener.
+
+        Returns:
+            int: Gönderilen olay sayısı
+        """
+        batch_id, batch = self.outbox.claim_batch(self.batch_size)
+        if not batch:
+            return 0
+
+        self.upload_batch([event for _, event in batch], batch_id)
+        self.outbox.ack([row_id for row_id, _ in batch])
+        self.uploaded += len(batch)
+        return len(batch)
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try:
+                sent = self.flush_once()
+                self.failures = 0
+                if sent == self.batch_size:
+                    continue  # Kuyrukta daha fazla olay olabilir
+                delay = self.flush_interval
+            except Exception as e:
+                self.failures += 1
+                delay = self._backoff_delay()
+                logger.warning(f"Olay yükleme hatası ({self.failures}. ardışık), {delay:.1f} sn sonra tekrar: {str(e)}")
+
+            self.wake_event.wait(delay)
+            self.wake_event.clear()
+
+    def start(self):
+        """Arka plan yüklemesini başlatır"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        logger.info("Giden kutusu yükleyicisi başlatıldı")
+
+    def stop(self):
+        """Arka plan yüklemesini durdurur"""
+        self.stop_event.set()
+        self.wake_event.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+
+# Uygulama genelinde kullanılan giden kutusu
+outbox = None
+uploader = None
+
+def start_outbox():
+    """
+    Giden kutusunu açar ve yükleyiciyi başlatır.
+
+    Returns:
+        bool: Başarılıysa True, açılamadıysa False; devre dışıysa None
+    """
+    global outbox, uploader
+
+    if not outbox_config.get('enabled', True):
+        logger.info("Olay giden kutusu devre dışı")
+        return None
+
+    from utils.api_client import upload_events
+
+    try:
+        outbox = EventOutbox(
+            outbox_config.get('path', 'data/outbox.db'),
+            max_rows=int(outbox_config.get('max_rows', 50000)),
+            max_bytes=int(outbox_config.get('max_bytes', 10 * 1024 * 1024))
+        )
+        uploader = OutboxUploader(
+            outbox,
+            upload_events,
+            batch_size=int(outbox_config.get('batch_size', 100)),
+            flush_interval=float(outbox_config.get('flush_interval', 5)),
+            max_backoff=float(outbox_config.get('max_backoff', 300))
+        )
+        uploader.start()
+        return True
+    except Exception as e:
+        logger.error(f"Olay giden kutusu başlatılamadı: {str(e)}")
+        outbox = None
+        uploader = None
+        return False
+
+def stop_outbox():
+    """Yükleyiciyi durdurur ve giden kutusunu kapatır"""
+    global outbox, uploader
+
+    if uploader is not None:
+        uploader.stop()
+        uploader = None
+    if outbox is not None:
+        logger.info(f"Giden kutusu kapatılıyor: {outbox.get_stats()}")
+        outbox.close()
+        outbox = None
+
+def record_event(event):
+    """
+    Bir olayı giden kutusuna yazar. Ağ beklemesi yapmaz.
+
+    Args:
+        event: Olay sözlüğü ('eventId' alanı zorunlu)
+
+    Returns:
+        bool: Olay kaydedildiyse True
+    """
+    if outbox is None:
+        return False
+
+    try:
+        return outbox.append(event)
+    except Exception as e:
+        logger.error(f"Olay giden kutusuna yazılamadı: {str(e)}")
+        return False
@@ -0,0 +1,197 @@
+"""
+API çağrıları için dayanıklılık yardımcıları: devre kesici (circuit breaker)
+ve son gecikmelere göre uyarlanan zaman aşımı hesaplayıcısı.
+"""
+
+import math
+import time
+import threading
+import logging
+from collections import deque
+
+# Devre kesici durumları
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Art arda hata veren bir sunucuya istek gönderilmesini geçici olarak durduran devre kesici.
+
+    Kapalı (closed) durumda istekler geçer; failure_threshold kadar ardışık
+    hatadan sonra devre açılır (open) ve recovery_timeout boyunca istekler
+    reddedilir. Ardından tek bir deneme isteğine izin verilir (half_open);
+    bu istek başarılı olursa devre kapanır, başarısız olursa yeniden açılır.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, name="api"):
+        """
+        Devre kesiciyi başlat.
+
+        Args:
+            failure_threshold: Devreyi açacak ardışık hata sayısı
+            recovery_timeout: Açık durumda bekleme süresi (saniye)
+            name: Loglarda kullanılacak ad
+        """
+        self.logger = logging.getLogger(__name__)
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.name = name
+        self.lock = threading.Lock()
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+        # İzleme sayaçları
+        self.trip_count = 0
+        self.rejected_count = 0
+        self.success_count = 0
+        self.failure_count = 0
+
+    def allow_request(self):
+        """
+        Bir isteğin gönderilip gönderilemeyeceğini döndürür.
+
+        Returns:
+            bool: İstek gönderilebilirse True
+        """
+        with self.lock:
+            if self.state == STATE_CLOSED:
+                return True
+
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self._set_state(STATE_HALF_OPEN)
+
+            if self.state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.rejected_count += 1
+            return False
+
+    def record_success(self):
+        """Başarılı bir isteği kaydeder"""
+        with self.lock:
+            self.success_count += 1
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            if self.state != STATE_CLOSED:
+                self._set_state(STATE_CLOSED)
+
+    def record_failure(self):
+        """Başarısız bir isteği kaydeder"""
+        with self.lock:
+            self.failure_count += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+
+            if self.state == STATE_HALF_OPEN or (
+                self.state == STATE_CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.trip_count += 1
+                self.opened_at = time.monotonic()
+                self._set_state(STATE_OPEN)
+
+    def _set_state(self, state):
+        """Durum değişikliğini uygular ve loglar (kilit alınmış olmalı)"""
+        if state == self.state:
+            return
+        self.logger.warning(f"Devre kesici '{self.name}': {self.state} -> {state}")
+        self.state = state
+
+    def get_stats(self):
+        """
+        Devre kesici durumunu ve sayaçlarını döndürür.
+
+        Returns:
+            dict: Durum, açılma sayısı, reddedilen/başarılı/başarısız istek sayıları
+        """
+        with self.lock:
+            return {
+                "state": self.state,
+                "trip_count": self.trip_count,
+                "consecutive_failures": self.consecutive_failures,
+                "rejected": self.rejected_count,
+                "successes": self.success_count,
+                "failures": self.failure_count
+            }
+
+
+class LatencyTracker:
+    """
+    Son isteklerin gecikmelerini tutar ve bunlara göre deneme başına
+    zaman aşımı önerir.
+    """
+
+    def __init__(self, window=100, percentile=95, multiplier=2.0,
+                 min_timeout=0.2, max_timeout=1.0, min_samples=10):
+        """
+        Gecikme izleyiciyi başlat.
+
+        Args:
+            window: Tutulacak son ölçüm sayısı
+            percentile: Zaman aşımına esas alınacak yüzdelik
+            multiplier: Yüzdelik değerin çarpanı
+            min_timeout: En kısa zaman aşımı (saniye)
+            max_timeout: En uzun zaman aşımı (saniye)
+            min_samples: Yeterli ölçüm yokken max_timeout kullanılır
+        """
+        self.samples = deque(maxlen=window)
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.lock = threading.Lock()
+
+    def record(self, latency):
+        """Başarılı bir isteğin süresini (saniye) kaydeder"""
+        with self.lock:
+            self.samples.append(latency)
+
+    def get_percentile(self, percentile):
+        """
+        Kayıtlı gecikmelerin verilen yüzdelik değerini döndürür.
+
+        Returns:
+            float: Gecikme (saniye) veya ölçüm yoksa None
+        """
+        with self.lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100.0 * len(ordered)) - 1))
+        return ordered[index]
+
+    def suggest_timeout(self):
+        """
+        Deneme başına önerilen zaman aşımını döndürür.
+
+        Returns:
+            float: Zaman aşımı (saniye)
+        """
+        if len(self.samples) < self.min_samples:
+            return self.max_timeout
+        value = self.get_percentile(self.percentile) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, value))
+
+    def get_stats(self):
+        """
+        Gecikme özetini döndürür.
+
+        Returns:
+            dict: Ölçüm sayısı, p50/p95/p99 (ms) ve önerilen zaman aşımı (ms)
+        """
+        def to_ms(value):
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "samples": len(self.samples),
+            "p50_ms": to_ms(self.get_percentile(50)),
+            "p95_ms": to_ms(self.get_percentile(95)),
+            "p99_ms": to_ms(self.get_percentile(99)),
+            "timeout_ms": to_ms(self.suggest_timeout())
+        }
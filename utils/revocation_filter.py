@@ -0,0 +1,352 @@
+"""
+Yetkisi iptal edilen kartlar için kompakt iptal filtresi.
+
+Sunucu iptal listesini tek bir ikili blob olarak gönderir: bir Bloom filtresi
+ve arkasında sıralı, sabit genişlikli UID kayıtları. Bloom bitleri bellekte
+tutulur; kesin kontrol için kullanılan UID listesi ise diskten mmap ile okunur
+ve yalnızca Bloom filtresi "olabilir" dediğinde ikili arama yapılır. Böylece
+iptal edilmemiş kartların büyük çoğunluğu birkaç bit okumasıyla elenir ve tam
+liste RAM'e yüklenmez.
+"""
+
+import os
+import mmap
+import math
+import struct
+import hashlib
+import bisect
+import time
+import threading
+import logging
+
+# Blob biçimi
+#   başlık : MAGIC (4 bayt) | biçim sürümü (u16) | hash sayısı (u8) | kayıt genişliği (u8)
+#            | bit sayısı (u32) | kayıt sayısı (u32) | sürüm (u16 uzunluk + utf-8)
+#   gövde  : Bloom bitleri (ceil(bit sayısı / 8) bayt) | sıralı kayıtlar (kayıt sayısı x genişlik)
+#   kayıt  : UID uzunluğu (u8) | UID baytları | sıfır dolgu
+# Bloom indeksleri: blake2b(UID baytları, 16 bayt) -> h1, h2 (u64, little-endian);
+#   i. indeks = (h1 + i * h2) mod bit sayısı
+MAGIC = b"SLRF"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHBBII")
+_STRING_LEN = struct.Struct("<H")
+_HASH_PAIR = struct.Struct("<QQ")
+DEFAULT_KEY_WIDTH = 11  # 10 baytlık (triple size) UID'ler + uzunluk baytı
+
+
+def _bloom_indexes(uid_bytes, hash_count, bit_count):
+    """UID için Bloom filtresi bit indekslerini döndürür (çift hash yöntemi)"""
+    h1, h2 = _HASH_PAIR.unpack(hashlib.blake2b(uid_bytes, digest_size=16).digest())
+    h2 |= 1  # Tüm indekslerin aynı bite düşmesini engelle
+    return [(h1 + i * h2) % bit_count for i in range(hash_count)]
+
+
+def _encode_key(uid_bytes, key_width):
+    """UID'yi sıralanabilir sabit genişlikli kayda çevirir"""
+    if len(uid_bytes) >= key_width:
+        raise ValueError(f"UID kayıt genişliğine sığmıyor: {uid_bytes.hex()}")
+    return bytes((len(uid_bytes),)) + uid_bytes + bytes(key_width - 1 - len(uid_bytes))
+
+
+def build_revocation_blob(uids, version, false_positive_rate=0.01, key_width=DEFAULT_KEY_WIDTH):
+    """
+    İptal edilen UID listesinden sunucunun göndereceği ikili blob'u üretir.
+    (Sunucu tarafı ve sahte sunucu için referans kodlayıcı.)
+
+    Args:
+        uids: İptal edilen UID (hex) listesi
+        version: İptal listesi sürümü
+        false_positive_rate: Hedeflenen Bloom yanlış pozitif oranı
+        key_width: Kesin kontrol kayıtlarının genişliği (bayt)
+
+    Returns:
+        bytes: İptal filtresi blob'u
+    """
+    keys = sorted({_encode_key(bytes.fromhex(uid), key_width) for uid in uids})
+    count = len(keys)
+
+    # Optimum Bloom boyutu: m = -n ln p / (ln 2)^2, k = m / n ln 2
+    bit_count = max(64, int(math.ceil(-max(count, 1) * math.log(false_positive_rate) / (math.log(2) ** 2))))
+    hash_count = min(16, max(1, int(round(bit_count / max(count, 1) * math.log(2)))))
+
+    bits = bytearray((bit_count + 7) // 8)
+    for key in keys:
+        for index in _bloom_indexes(key[1:1 + key[0]], hash_count, bit_count):
+            bits[index >> 3] |= 1 << (index & 7)
+
+    encoded_version = str(version).encode("utf-8")
+    return b"".join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, hash_count, key_width, bit_count, count),
+        _STRING_LEN.pack(len(encoded_version)) + encoded_version,
+        bytes(bits),
+        b"".join(keys)
+    ])
+
+
+def _parse_header(data):
+    """
+    Blob başlığını çözer ve boyutunu doğrular.
+
+    Returns:
+        tuple: (hash sayısı, kayıt genişliği, bit sayısı, kayıt sayısı, sürüm,
+                bitlerin başlangıcı, kayıtların başlangıcı)
+    """
+    magic, fmt, hash_count, key_width, bit_count, count = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC or fmt != FORMAT_VERSION:
+        raise ValueError("Geçersiz iptal filtresi biçimi")
+    if hash_count == 0 or key_width < 2 or bit_count == 0:
+        raise ValueError("Geçersiz iptal filtresi parametreleri")
+
+    offset = _HEADER.size
+    (length,) = _STRING_LEN.unpack_from(data, offset)
+    offset += _STRING_LEN.size
+    version = bytes(data[offset:offset + length]).decode("utf-8")
+    bits_offset = offset + length
+    keys_offset = bits_offset + (bit_count + 7) // 8
+
+    if len(data) != keys_offset + count * key_width:
+        raise ValueError("İptal filtresi boyutu başlıkla uyuşmuyor")
+    return hash_count, key_width, bit_count, count, version, bits_offset, keys_offset
+
+
+class _FixedWidthKeys:
+    """mmap üzerindeki sıralı kayıtları bisect için dizi gibi gösterir"""
+
+    def __init__(self, buffer, offset, width, count):
+        self.buffer = buffer
+        self.offset = offset
+        self.width = width
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        start = self.offset + index * self.width
+        return self.buffer[start:start + self.width]
+
+
+class RevocationFilter:
+    """
+    Bloom filtresi + diskteki sıralı liste ile kesin sonuç veren iptal kontrolü.
+    """
+
+    def __init__(self, path):
+        """
+        İptal filtresini başlat.
+
+        Args:
+            path: Blob'un saklandığı dosya yolu
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.lock = threading.Lock()
+        self._state = None  # (bitler, hash sayısı, bit sayısı, kayıtlar, mmap)
+        self.version = None
+        self.etag = None
+        self.count = 0
+        self.loaded_at = None
+
+        # İstatistikler
+        self.checks = 0
+        self.bloom_rejects = 0      # Bloom filtresinin tek başına elediği sorgular
+        self.false_positives = 0    # Bloom "olabilir" dedi, kesin kontrol reddetti
+        self.revoked_hits = 0
+
+    @property
+    def is_ready(self):
+        """Geçerli bir iptal listesi yüklüyse True"""
+        return self._state is not None
+
+    def is_revoked(self, uid):
+        """
+        Kartın yetkisinin iptal edilip edilmediğini döndürür.
+
+        Args:
+            uid: Kart UID'si (hex)
+
+        Returns:
+            bool: İptal edildiyse True (liste yüklü değilse False)
+        """
+        state = self._state
+        if state is None:
+            return False
+
+        bits, hash_count, bit_count, keys, _ = state
+        uid_bytes = bytes.fromhex(uid)
+        self.checks += 1
+
+        for index in _bloom_indexes(uid_bytes, hash_count, bit_count):
+            if not bits[index >> 3] & (1 << (index & 7)):
+                self.bloom_rejects += 1
+                return False
+
+        try:
+            key = _encode_key(uid_bytes, keys.width)
+        except ValueError:
+            self.false_positives += 1
+            return False
+
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            self.revoked_hits += 1
+            return True
+
+        self.false_positives += 1
+        return False
+
+    def replace(self, blob, etag=None):
+        """
+        Sunucudan gelen yeni blob'u doğrular, diske yazar ve yükler.
+
+        Args:
+            blob: İptal filtresi blob'u
+            etag: Yanıtın ETag değeri (If-None-Match için saklanır)
+
+        Raises:
+            ValueError: Blob geçersizse
+        """
+        _parse_header(blob)
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+        with open(self.path + ".etag", "w") as f:
+            f.write(etag or "")
+
+        self.load()
+
+    def load(self):
+        """
+        Diskteki blob'u açar: Bloom bitleri belleğe kopyalanır, kayıtlar mmap ile okunur.
+
+        Returns:
+            bool: Yükleme başarılıysa True
+        """
+        if not os.path.exists(self.path):
+            self.logger.info(f"İptal filtresi dosyası bulunamadı: {self.path}")
+            return False
+
+        try:
+            with open(self.path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            hash_count, key_width, bit_count, count, version, bits_offset, keys_offset = _parse_header(buffer)
+            bits = buffer[bits_offset:keys_offset]
+            keys = _FixedWidthKeys(buffer, keys_offset, key_width, count)
+
+            etag = None
+            if os.path.exists(self.path + ".etag"):
+                with open(self.path + ".etag") as f:
+                    etag = f.read().strip() or None
+
+            # Eski mmap açık bırakılır; o an sorgu yapan thread'ler onu kullanmaya devam
+            # edebilir, referansı kalmadığında kendiliğinden kapanır
+            with self.lock:
+                self._state = (bits, hash_count, bit_count, keys, buffer)
+                self.version = version
+                self.etag = etag
+                self.count = count
+                self.loaded_at = os.path.getmtime(self.path)
+
+            self.logger.info(f"İptal filtresi yüklendi: {count} kart, {len(bits)} bayt Bloom, "
+                             f"{hash_count} hash (sürüm {version})")
+            return True
+        except Exception as e:
+            self.logger.error(f"İptal filtresi yüklenemedi: {str(e)}")
+            return False
+
+    def get_stats(self):
+        """
+        Filtre istatistiklerini döndürür.
+
+        Returns:
+            dict: Sürüm, kart sayısı, sorgu ve yanlış pozitif sayıları
+        """
+        state = self._state
+        return {
+            "version": self.version,
+            "revoked_cards": self.count,
+            "bloom_bytes": len(state[0]) if state else 0,
+            "checks": self.checks,
+            "bloom_rejects": self.bloom_rejects,
+            "false_positives": self.false_positives,
+            "revoked_hits": self.revoked_hits
+        }
+
+
+class RevocationSync:
+    """
+    İptal filtresini sunucudan koşullu GET ile periyodik olarak güncelleyen
+    arka plan iş parçacığı.
+    """
+
+    def __init__(self, revocation_filter, fetch_blob, interval=60.0):
+        """
+        Senkronizasyonu başlat.
+
+        Args:
+            revocation_filter: Güncellenecek RevocationFilter
+            fetch_blob: fetch_blob(etag) -> {"status", "data", "etag", "bytes"}
+            interval: İki senkronizasyon arasındaki süre (saniye)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.filter = revocation_filter
+        self.fetch_blob = fetch_blob
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_sync_time = None
+        self.failures = 0
+
+    def sync_once(self):
+        """
+        Tek bir senkronizasyon yapar.
+
+        Returns:
+            bool: Başarılıysa True
+        """
+        started = time.monotonic()
+        try:
+            result = self.fetch_blob(self.filter.etag)
+            if result["status"] == 200:
+                self.filter.replace(result["data"], etag=result["etag"])
+
+            self.last_sync_time = time.time()
+            self.failures = 0
+            self.logger.info(f"İptal filtresi senkronize edildi: HTTP {result['status']}, "
+                             f"{result['bytes']} bayt, {(time.monotonic() - started) * 1000:.1f} ms "
+                             f"(toplam {self.filter.count} kart, sürüm {self.filter.version})")
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.logger.error(f"İptal filtresi senkronizasyon hatası ({self.failures}. ardışık): {str(e)}")
+            return False
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            self.sync_once()
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        """Periyodik senkronizasyonu başlatır"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.logger.info(f"İptal filtresi senkronizasyonu başlatıldı ({self.interval} sn aralıkla)")
+
+    def stop(self):
+        """Periyodik senkronizasyonu durdurur"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
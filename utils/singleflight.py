@@ -0,0 +1,88 @@
+"""
+Aynı anahtar için eşzamanlı yapılan çağrıları tek bir çağrıda birleştiren
+"singleflight" yardımcı sınıfı.
+"""
+
+import threading
+
+
+class _Call:
+    """Uçuştaki tek bir çağrının sonucunu bekleyenlerle paylaşır"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla gelen eşzamanlı çağrılardan yalnızca ilki gerçekten
+    çalıştırılır; diğerleri onun sonucunu (veya hatasını) paylaşır.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._calls = {}
+
+        # İstatistikler
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Anahtar için uçuşta bir çağrı varsa onun sonucunu bekler, yoksa
+        fonksiyonu çalıştırır.
+
+        Args:
+            key: Çağrıları birleştirmekte kullanılan anahtar
+            func: Çalıştırılacak fonksiyon
+
+        Returns:
+            tuple: (sonuç, paylaşıldı mı) - paylaşılan sonuçlarda ikinci değer True
+        """
+        with self.lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+
+        return call.result, shared
+
+    def get_stats(self):
+        """
+        Birleştirme istatistiklerini döndürür.
+
+        Returns:
+            dict: Gerçekten çalıştırılan ve birleştirilen çağrı sayıları
+        """
+        with self.lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls)
+            }
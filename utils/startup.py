@@ -0,0 +1,187 @@
+"""
+Açılışta birbirinden bağımsız cihazları paralel başlatan düzenleyici.
+
+LCD, LED'ler, buzzer'lar ve arka plan servisleri ayrı işlerde aynı anda
+başlatılırken okuyucu thread'leri de kendi kanallarını yoklamaya başlar.
+Her cihazın başlatma süresi kaydedilir; ilk okuyucu kart okumaya hazır
+olduğunda sistem hazır sayılır.
+"""
+
+import threading
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Cihaz durumları
+PENDING = "bekliyor"
+DONE = "hazır"
+FAILED = "hata"
+SKIPPED = "atlandı"  # Yapılandırma veya simülasyon nedeniyle başlatılmadı
+
+
+class _DeviceTiming:
+    """Tek bir cihazın başlatma zamanlaması"""
+
+    __slots__ = ("started", "finished", "status", "error")
+
+    def __init__(self, started):
+        self.started = started
+        self.finished = None
+        self.status = PENDING
+        self.error = None
+
+
+class StartupOrchestrator:
+    """
+    Başlatma işlerini paralel çalıştırır, cihaz bazında süreleri tutar ve
+    ilk hazır okuyucuyu bildirir.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Args:
+            max_workers: Aynı anda çalışacak en fazla başlatma işi
+        """
+        self.logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="startup")
+        self._lock = threading.Lock()
+        self._devices = OrderedDict()  # ad -> _DeviceTiming
+        self._futures = {}             # ad -> Future
+        self._started = time.monotonic()
+        self._ready = threading.Event()
+        self.first_ready = None        # Sistemi hazır yapan okuyucu
+        self.ready_after = None        # Açılıştan ilk hazır okuyucuya kadar geçen süre
+
+    def begin(self, name):
+        """Başka bir thread'de başlatılan cihazın zamanlamasını başlatır"""
+        with self._lock:
+            self._devices[name] = _DeviceTiming(time.monotonic())
+
+    def finish(self, name, ok=True, error=None, skipped=False):
+        """
+        Cihazın başlatılmasının bittiğini kaydeder.
+
+        Args:
+            name: Cihaz adı
+            ok: Başlatma başarılı mı
+            error: Başarısızlık nedeni (log için)
+            skipped: Cihaz bilerek başlatılmadı (devre dışı, simülasyon)
+
+        Returns:
+            float: Başlatma süresi (saniye)
+        """
+        now = time.monotonic()
+        with self._lock:
+            timing = self._devices.get(name)
+            if timing is None:
+                timing = self._devices[name] = _DeviceTiming(self._started)
+            if timing.finished is None:
+                timing.finished = now
+                timing.status = SKIPPED if skipped else DONE if ok else FAILED
+                timing.error = error
+            return timing.finished - timing.started
+
+    def submit(self, name, func, *args, optional=False, **kwargs):
+        """
+        Bir başlatma işini paralel çalıştırır.
+
+        İş False döndürür veya hata verirse cihaz başarısız sayılır; hata
+        yukarı taşınmaz (diğer cihazlar etkilenmez).
+
+        Args:
+            name: Cihaz adı
+            func: Başlatma fonksiyonu
+            optional: True ise None döndüren iş atlanmış sayılır (ör. devre
+                dışı bırakılan servisler)
+
+        Returns:
+            Future: İşin sonucu (hatada None)
+        """
+        self.begin(name)
+
+        def run():
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                elapsed = self.finish(name, ok=False, error=str(e))
+                self.logger.error(f"{name} başlatılamadı ({elapsed * 1000:.0f} ms): {str(e)}")
+                return None
+            self.finish(name, ok=result is not False, skipped=optional and result is None)
+            return result
+
+        future = self._executor.submit(run)
+        with self._lock:
+            self._futures[name] = future
+        return future
+
+    def ready(self, name):
+        """
+        Okuyucunun kart okumaya hazır olduğunu kaydeder; ilk hazır okuyucu
+        sistemi hazır duruma geçirir.
+
+        Args:
+            name: Cihaz adı
+        """
+        elapsed = self.finish(name)
+        with self._lock:
+            first = not self._ready.is_set()
+            if first:
+                self.first_ready = name
+                self.ready_after = time.monotonic() - self._started
+                self._ready.set()
+        if first:
+            self.logger.info(f"Sistem hazır: ilk kapı {name} ({self.ready_after * 1000:.0f} ms)")
+        else:
+            self.logger.info(f"{name} hazır ({elapsed * 1000:.0f} ms)")
+
+    def wait_ready(self, timeout=None):
+        """
+        İlk okuyucu hazır olana kadar bekler.
+
+        Returns:
+            bool: Zaman aşımından önce hazır olduysa True
+        """
+        return self._ready.wait(timeout)
+
+    def wait(self, names=None, timeout=None):
+        """
+        Verilen (None ise tüm) başlatma işlerinin bitmesini bekler.
+
+        Returns:
+            bool: Tüm işler zaman aşımından önce bittiyse True
+        """
+        with self._lock:
+            futures = [future for name, future in self._futures.items() if names is None or name in names]
+        _, not_done = wait(futures, timeout=timeout)
+        return not not_done
+
+    def get_timings(self):
+        """
+        Cihaz bazında başlatma sürelerini döndürür.
+
+        Returns:
+            dict: Cihaz adı -> {'status', 'ms', 'error'} (bekleyenlerde ms şimdiye kadar geçen süre)
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "status": timing.status,
+                    "ms": round(((timing.finished or now) - timing.started) * 1000, 1),
+                    "error": timing.error
+                }
+                for name, timing in self._devices.items()
+            }
+
+    def log_summary(self):
+        """Cihaz bazında başlatma sürelerini loglar"""
+        total = time.monotonic() - self._started
+        self.logger.info(f"Başlatma süreleri (toplam {total * 1000:.0f} ms):")
+        for name, timing in self.get_timings().items():
+            suffix = f" - {timing['error']}" if timing['error'] else ""
+            self.logger.info(f"  {name:<20} {timing['ms']:>8.0f} ms  {timing['status']}{suffix}")
+
+    def shutdown(self):
+        """Başlatma işçilerini kapatır (bitmemiş işler tamamlanır)"""
+        self._executor.shutdown(wait=False)